@@ -29,3 +29,22 @@ MAX_FARTHEST = 3 #the amount of furthest flights you want in your log
 MAX_CLOSEST = 3 #the amount of closest flights to your house you want in your log
 
 MAX_RECENT_FLIGHTS = 10
+DISPLAY_COMPOSITOR = False #True draws each frame into a memory framebuffer and pushes it to the panel in one transfer (needs numpy). Skips the swap when nothing changed
+MATRIX_BACKEND = "hardware" #"virtual" runs the display without the LED HAT (needs numpy), e.g. for profiling on a PC. PLANE_TRACKER_MATRIX=virtual does the same, PLANE_TRACKER_MATRIX_DUMP=<dir> saves each frame as a PNG
+FR24_BASE_URL = None #leave None for the real FlightRadar24. Set to "http://127.0.0.1:8024" to use scripts/fr24_standin.py for offline testing (PLANE_TRACKER_FR24_URL overrides)
+IMAGE_CACHE_MAX_BYTES = 262144 #memory budget (bytes) for cached logos and forecast icons; least recently used ones are dropped first. Lower it on a Pi Zero
+LOGO_PREFETCH_WORKERS = 2 #background threads that download missing airline logos for every flight in the zone
+LOGO_MISS_RETRY_BASE = 21600 #seconds before retrying an airline code FlightAware had no logo for; doubles on each further miss (up to LOGO_MISS_RETRY_MAX)
+WEB_SERVER = "threaded" #"threaded" serves the dashboard from a fixed thread pool with keep-alive and timeouts; "development" uses Flask's built-in server
+WEB_THREADS = 8 #worker threads for the dashboard; extra connections queue (WEB_MAX_PENDING) and are then turned away with a 503
+ZONE_TILE_SPAN = 0.25 #zones taller/wider than this many degrees are fetched as several tiles and merged (FR24 truncates big listings). 0.25 deg is ~17 x 12 miles at 45N: about the size where a tile over the busiest hubs, ground traffic included, still comes back complete, while the default ~10 mile ZONE_HOME stays a single request. Each extra tile is one more request under the rate limit, so only go lower if flights go missing
+ZONE_TILE_WORKERS = 4 #threads fetching the tiles of a large zone; they still share one rate limiter, so more workers mainly hide request latency
+ZONE_POLYGONS = [] #optional geofences, each a list of [lat, lon] points, e.g. [[41.90, -87.66], [41.90, -87.62], [41.86, -87.60], [41.86, -87.64]]; flights outside all of them are ignored and ZONE_HOME becomes their bounding box
+MOTION_MAX_SECONDS = 90 #between grabs the distance/direction on screen is dead-reckoned from heading and speed for at most this many seconds
+CPA_HORIZON = 120 #seconds ahead to predict each flight's closest approach to LOCATION_HOME; detail lookups go to the flights that will pass closest. 0 picks the nearest right now
+POLL_INTERVAL = 30 #seconds between grabs normally; stretched at night, with an empty sky or after FR24 throttling, shortened when busy or a flight is about to pass close by
+POLL_INTERVAL_MIN = 15 #never grab more often than this
+POLL_INTERVAL_MAX = 300 #never wait longer than this
+POLL_INTERVAL_SCREEN_OFF = 0 #0 stops grabbing while the screen is off; set e.g. 300 to keep the logs and web pages current then
+BREAKER_FAILURES = 3 #FR24 failures in a row (timeouts, connection errors, 5xx) before requests are paused and the screen shows API DOWN; a 429/403 pauses straight away
+BREAKER_RESET_BASE = 30 #seconds to pause FR24 requests after the first trip, doubling on each further trip up to BREAKER_RESET_MAX (900)
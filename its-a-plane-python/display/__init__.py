@@ -1,12 +1,18 @@
 import sys
 import os
 import json
+from contextlib import nullcontext
 from datetime import datetime
 
 from setup import frames
 from utilities.animator import Animator
-from utilities.overhead import Overhead
+from utilities.overhead import Overhead, LOCATION_DEFAULT
 from utilities import network_status
+from utilities import framebuffer
+from utilities import motion
+from utilities import poll_scheduler
+from utilities import sprites
+from display.layers import LayerManager
 
 from scenes.temperature import TemperatureScene
 from scenes.flightdetails import FlightDetailsScene
@@ -20,8 +26,8 @@ from scenes.daysforecast import DaysForecastScene
 from scenes.date import DateScene
 from scenes.networkstatus import NetworkStatusScene
 
-from rgbmatrix import graphics
-from rgbmatrix import RGBMatrix, RGBMatrixOptions
+from setup.matrix import graphics
+from setup.matrix import RGBMatrix, RGBMatrixOptions
 
 
 
@@ -82,6 +88,12 @@ except Exception:
     NIGHT_START_DT = datetime.strptime("22:00", "%H:%M")
     NIGHT_END_DT = datetime.strptime("06:00", "%H:%M")
 
+# Optional: draw into a NumPy framebuffer and push it with one SetImage per frame
+try:
+    from config import DISPLAY_COMPOSITOR
+except (ImportError, ModuleNotFoundError, NameError):
+    DISPLAY_COMPOSITOR = False
+
 
 def is_night_time():
     if not NIGHT_BRIGHTNESS:
@@ -126,7 +138,7 @@ class Display(
 
     Animator,
 ):
-    def __init__(self):
+    def __init__(self, overhead=None, poll=None):
         options = RGBMatrixOptions()
         options.hardware_mapping = "adafruit-hat-pwm" if HAT_PWM_ENABLED else "adafruit-hat"
         options.rows = 32
@@ -149,6 +161,25 @@ class Display(
 
         self.canvas = self.matrix.CreateFrameCanvas()
         self.canvas.Clear()
+        self._canvas_has_setimage = hasattr(self.canvas, "SetImage")
+
+        # Compositor mode: scenes draw into _framebuffer, present() pushes it in one transfer.
+        # _presented holds the last frame pushed so identical frames skip the swap.
+        self._framebuffer = None
+        self._presented = None
+        if DISPLAY_COMPOSITOR and framebuffer.AVAILABLE:
+            self._framebuffer = framebuffer.FrameBuffer()
+
+        # Direct mode: shadow copies of both CreateFrameCanvas buffers, [0] = current backbuffer.
+        # After a swap only the pixels where the new backbuffer differs from the frame just
+        # shown are replayed, so a swap no longer forces every scene to redraw.
+        self._shadows = None
+        if self._framebuffer is None and framebuffer.AVAILABLE:
+            self._shadows = [framebuffer.FrameBuffer(), framebuffer.FrameBuffer()]
+
+        # Retained-mode layers for scenes that opt in (see display/layers.py).
+        # Must exist before super().__init__() so scenes can register their layers.
+        self.layers = LayerManager() if framebuffer.AVAILABLE else None
 
         # Token increments only when we do a full backbuffer clear
         self._clear_token = 0
@@ -157,9 +188,15 @@ class Display(
         self._data_index = 0
         self._data = []
         self._data_all_looped = False
+        # Dead-reckoned positions for _data between grabs (see utilities/motion.py)
+        self._motion = motion.MotionModel(LOCATION_DEFAULT)
 
-        self.overhead = Overhead()
+        # overhead may be injected (fixtures, benchmarks); default polls FlightRadar24
+        self.overhead = overhead if overhead is not None else Overhead()
+        # How often to grab (see utilities/poll_scheduler.py); injected ones can skip the status file
+        self._poll = poll if poll is not None else poll_scheduler.PollScheduler()
         self.overhead.grab_data()
+        self._poll.polled()
 
         # Presentation bookkeeping
         self._dirty = True
@@ -178,17 +215,21 @@ class Display(
         self.enabled_tags = {"clock", "date", "temperature", "days_forecast"}
         self._requires_post_swap_redraw = True
         self._update_post_swap_requirement()
-        self._net_status = network_status.current_status()
+        self._net_probe = network_status.current_status()
+        self._net_status = self._effective_net_status()
         self._net_error_active = self._net_status != network_status.NetStatus.OK
 
         self.delay = frames.PERIOD
-
-        self._canvas_has_setimage = hasattr(self.canvas, "SetImage")
 
     # -----------------------------
     # Draw helpers (dirty only)
     # -----------------------------
     def _update_post_swap_requirement(self):
+        # The framebuffer outlives swaps, and shadows replay what a swap left stale.
+        if self._framebuffer is not None or self._shadows is not None:
+            self._requires_post_swap_redraw = False
+            return
+
         enabled = self.enabled_tags
         requires = False
         for _, keyframe in getattr(self, "keyframes", []):
@@ -206,8 +247,68 @@ class Display(
     def mark_dirty(self):
         self._dirty = True
 
-    def clear_canvas(self, reason: str = ""):
+    def _shadow(self):
+        return self._shadows[0] if self._shadows is not None else None
+
+    def _target(self):
+        """FrameBuffer receiving draws instead of the canvas: a layer being built, or the compositor."""
+        if self.layers is not None:
+            target = self.layers.target
+            if target is not None:
+                return target
+        return self._framebuffer
+
+    def layer(self, name, key):
+        """
+        Context manager for retained-mode scenes: draws inside go to the named
+        layer when layers are available, otherwise straight to the canvas.
+        """
+        if self.layers is None:
+            return nullcontext()
+        return self.layers.render(name, key)
+
+    def _blit_region(self, src, region):
+        """Copy a rectangle of a FrameBuffer to wherever frames are built (framebuffer or canvas)."""
+        self._dirty = True
+        if self._framebuffer is not None:
+            self._framebuffer.copy_region(src, region)
+            return
+
+        x0, y0, x1, y1 = region
+        x0, x1 = max(0, x0), min(src.width, x1)
+        y0, y1 = max(0, y0), min(src.height, y1)
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        shadow = self._shadow()
+        if shadow is not None:
+            shadow.copy_region(src, (x0, y0, x1, y1))
+
+        if self._canvas_has_setimage:
+            self.canvas.SetImage(src.region_image(x0, y0, x1, y1), x0, y0)
+            return
+        pix = src.pixels
+        for iy in range(y0, y1):
+            for ix in range(x0, x1):
+                r, g, b = pix[iy, ix]
+                self.canvas.SetPixel(ix, iy, int(r), int(g), int(b))
+
+    def _composite_layers(self):
+        if self.layers is None:
+            return
+        for layer in self.layers.pending(self._clear_token, self.enabled_tags):
+            self._blit_region(layer.buffer, layer.region)
+
+    def _clear_backbuffer(self):
+        if self._framebuffer is not None:
+            self._framebuffer.clear()
+            return
         self.canvas.Clear()
+        if self._shadows is not None:
+            self._shadows[0].clear()
+
+    def clear_canvas(self, reason: str = ""):
+        self._clear_backbuffer()
         self._clear_token += 1
         self._dirty = True
         self._redraw_all_this_frame = True
@@ -216,20 +317,53 @@ class Display(
         self._dirty = True
         # DO NOT set _redraw_all_this_frame here.
 
+        target = self._target()
+        if target is not None:
+            target.fill(x0, y0, x1, y1, colour)
+            return
+        shadow = self._shadow()
+        if shadow is not None:
+            shadow.fill(x0, y0, x1, y1, colour)
+
         y_end = y1 - 1
         if y_end < y0:
             return
         for x in range(x0, x1):
             graphics.DrawLine(self.canvas, x, y0, x, y_end, colour)
 
+    def draw_line(self, x0, y0, x1, y1, colour):
+        self._dirty = True
+        # DO NOT set _redraw_all_this_frame here.
+        target = self._target()
+        if target is not None:
+            target.line(x0, y0, x1, y1, colour)
+            return
+        shadow = self._shadow()
+        if shadow is not None:
+            shadow.line(x0, y0, x1, y1, colour)
+        graphics.DrawLine(self.canvas, x0, y0, x1, y1, colour)
+
     def draw_text(self, font, x, y, colour, text) -> int:
         self._dirty = True
         # DO NOT set _redraw_all_this_frame here.
+        target = self._target()
+        if target is not None:
+            return target.text(font, x, y, colour, text)
+        shadow = self._shadow()
+        if shadow is not None:
+            shadow.text(font, x, y, colour, text)
         return graphics.DrawText(self.canvas, font, x, y, colour, text)
 
     def set_pixel(self, x, y, r, g, b):
         self._dirty = True
         # DO NOT set _redraw_all_this_frame here.
+        target = self._target()
+        if target is not None:
+            target.set_pixel(x, y, int(r), int(g), int(b))
+            return
+        shadow = self._shadow()
+        if shadow is not None:
+            shadow.set_pixel(x, y, int(r), int(g), int(b))
         self.canvas.SetPixel(x, y, int(r), int(g), int(b))
 
     def set_image(self, pil_img, x=0, y=0):
@@ -238,17 +372,27 @@ class Display(
         self._dirty = True
         # DO NOT set _redraw_all_this_frame here.
 
+        target = self._target()
+        if target is not None:
+            target.blit(pil_img, x, y)
+            return
+
         if self._canvas_has_setimage:
+            shadow = self._shadow()
+            if shadow is not None:
+                shadow.blit(pil_img, x, y)
             self.canvas.SetImage(pil_img, x, y)
             return
 
-        img = pil_img.convert("RGB")
-        w, h = img.size
-        pix = img.load()
-        for iy in range(h):
-            for ix in range(w):
-                r, g, b = pix[ix, iy]
-                self.canvas.SetPixel(x + ix, y + iy, int(r), int(g), int(b))
+        # No SetImage: replay the cached non-black pixels only. Callers clear
+        # their region before drawing an image, so black pixels are no-ops.
+        sprite = sprites.sprite_for(pil_img)
+        shadow = self._shadow()
+        if shadow is not None:
+            shadow.blit(pil_img, x, y, skip_black=True)
+        set_pixel = self.canvas.SetPixel
+        for dx, dy, r, g, b in sprite.lit:
+            set_pixel(x + dx, y + dy, r, g, b)
 
     def _set_matrix_brightness(self, value: int):
         v = int(max(0, min(100, value)))
@@ -270,7 +414,7 @@ class Display(
         self._force_redraw_next_frame = False
         self._did_forced_redraw_this_frame = False
         if self._redraw_all_this_frame:
-            self.canvas.Clear()
+            self._clear_backbuffer()
             self._clear_token += 1
             self._dirty = True
             self._force_run_keyframes = True
@@ -283,6 +427,8 @@ class Display(
             there_is_data = len(self._data) > 0 or not self.overhead.data_is_empty
             new_data = self.overhead.data
             data_is_different = not flight_updated(self._data, new_data)
+            # Snap to the reported positions even when the flights on screen stay the same
+            self._motion.update(new_data)
 
             if data_is_different:
                 self._data = new_data
@@ -299,9 +445,20 @@ class Display(
     # -----------------------------
     # POLICY: tag gating + brightness + pause
     # -----------------------------
+    def _effective_net_status(self):
+        # Network fine but FR24 keeps failing (circuit breaker open, see utilities/fr24_breaker.py)
+        if self._net_probe == network_status.NetStatus.OK and getattr(self.overhead, "api_down", False):
+            return network_status.NetStatus.API_DOWN
+        return self._net_probe
+
     @Animator.KeyFrame.add(frames.PER_SECOND * 300, run_while_paused=True, order=0)
     def check_network_status(self, count):
-        self._net_status = network_status.current_status()
+        self._net_probe = network_status.current_status()
+        self._net_status = self._effective_net_status()
+
+    @Animator.KeyFrame.add(frames.PER_SECOND * 5, run_while_paused=True, order=0)
+    def check_api_status(self, count):
+        self._net_status = self._effective_net_status()
 
     @Animator.KeyFrame.add(1, run_while_paused=True, order=0)
     def policy(self, count):
@@ -384,10 +541,73 @@ class Display(
     # -----------------------------
     # PRESENT: the only SwapOnVSync
     # -----------------------------
+    def _push_framebuffer(self):
+        """
+        Compositor mode: write the whole framebuffer into the backbuffer and swap.
+        Returns False (no swap) when it is byte-identical to the last presented frame.
+        """
+        fb = self._framebuffer
+        if self._presented is not None and fb.same_as(self._presented):
+            return False
+
+        if self._canvas_has_setimage:
+            self.canvas.SetImage(fb.to_image(), 0, 0)
+        else:
+            pix = fb.pixels
+            for iy in range(fb.height):
+                for ix in range(fb.width):
+                    r, g, b = pix[iy, ix]
+                    self.canvas.SetPixel(ix, iy, int(r), int(g), int(b))
+
+        self.canvas = self.matrix.SwapOnVSync(self.canvas)
+
+        if self._presented is None:
+            self._presented = framebuffer.FrameBuffer(fb.width, fb.height)
+        self._presented.copy_from(fb)
+        return True
+
+    def _swap_canvas(self):
+        """
+        Direct mode swap. With shadows, bring the new backbuffer up to date with the frame
+        just presented by rewriting only the pixels that differ between the two buffers.
+        """
+        self.canvas = self.matrix.SwapOnVSync(self.canvas)
+        if self._shadows is None:
+            return
+
+        shown, back = self._shadows
+        self._shadows = [back, shown]
+
+        changed = shown.diff_mask(back)
+        if not changed.any():
+            return
+
+        if self._canvas_has_setimage:
+            ys, xs = changed.nonzero()
+            x0, x1 = int(xs.min()), int(xs.max()) + 1
+            y0, y1 = int(ys.min()), int(ys.max()) + 1
+            self.canvas.SetImage(shown.region_image(x0, y0, x1, y1), x0, y0)
+        else:
+            pix = shown.pixels
+            for iy, ix in zip(*changed.nonzero()):
+                r, g, b = pix[iy, ix]
+                self.canvas.SetPixel(int(ix), int(iy), int(r), int(g), int(b))
+
+        back.copy_from(shown)
+
     @Animator.KeyFrame.add(1, run_while_paused=True, order=2)
     def present(self, count):
+        if not self._effective_off:
+            self._composite_layers()
+
+        if self._framebuffer is not None:
+            if self._effective_off or self._dirty:
+                self._push_framebuffer()
+            self._dirty = False
+            return
+
         if self._effective_off:
-            self.canvas = self.matrix.SwapOnVSync(self.canvas)
+            self._swap_canvas()
             self._dirty = False
             if self._requires_post_swap_redraw and not self._did_forced_redraw_this_frame:
                 self._force_redraw_next_frame = True
@@ -402,19 +622,27 @@ class Display(
             self._dirty = False
             return
 
-        self.canvas = self.matrix.SwapOnVSync(self.canvas)
+        self._swap_canvas()
         self._dirty = False
 
         # Force a full redraw on the next frame after a swap.
         if self._requires_post_swap_redraw and not self._did_forced_redraw_this_frame:
             self._force_redraw_next_frame = True
 
-    @Animator.KeyFrame.add(frames.PER_SECOND * 30)
+    @Animator.KeyFrame.add(frames.PER_SECOND, run_while_paused=True)
     def grab_new_data(self, count):
-        if not (self.overhead.processing and self.overhead.new_data) and (
-            self._data_all_looped or len(self._data) <= 1
-        ):
+        # Checked every second; the scheduler decides whether a grab is due
+        self._poll.update(
+            getattr(self.overhead, "traffic", None),
+            screen_on=not self._effective_off,
+            night=is_night_time(),
+        )
+        if not self._poll.due() or self.overhead.processing:
+            return
+        # While the screen is off nothing cycles through _data, so don't wait for it to loop
+        if self._effective_off or self._data_all_looped or len(self._data) <= 1:
             self.overhead.grab_data()
+            self._poll.polled()
 
     def run(self):
         try:
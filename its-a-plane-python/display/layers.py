@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+
+from utilities import framebuffer
+
+
+class Layer(object):
+    """
+    Retained pixels for one scene's screen region (EXCLUSIVE x1/y1).
+
+    The layer is rebuilt only when the scene's render key changes; after a
+    full canvas clear it is simply composited again from its cached pixels.
+    """
+
+    def __init__(self, name, region, tag=None, z=1):
+        self.name = name
+        self.region = region
+        self.tag = tag
+        self.z = z
+        self.buffer = framebuffer.FrameBuffer()
+        self.key = None
+        self.built = False
+        self.dirty = False
+
+    def overlaps(self, other) -> bool:
+        ax0, ay0, ax1, ay1 = self.region
+        bx0, by0, bx1, by1 = other.region
+        return ax0 < bx1 and bx0 < ax1 and ay0 < by1 and by0 < ay1
+
+
+class LayerManager(object):
+    """
+    Registry of scene layers plus the bookkeeping to composite only what changed.
+
+    Scenes draw into a layer with:
+
+        with self.layer("journey", render_key):
+            ...normal draw_text / draw_square calls...
+
+    Display routes draw helpers to `target` while a layer is being rendered,
+    and calls composite() from present().
+    """
+
+    def __init__(self):
+        self._layers = {}
+        self._rendering = None
+        self._clear_token_seen = None
+
+    def add(self, name, region, tag=None, z=1) -> Layer:
+        layer = Layer(name, region, tag=tag, z=z)
+        self._layers[name] = layer
+        return layer
+
+    def get(self, name):
+        return self._layers.get(name)
+
+    @property
+    def target(self):
+        """FrameBuffer that draws should go to right now, or None."""
+        return self._rendering.buffer if self._rendering is not None else None
+
+    def needs_rebuild(self, name, key) -> bool:
+        layer = self._layers.get(name)
+        if layer is None:
+            return True
+        return (not layer.built) or layer.key != key
+
+    def invalidate(self, name=None):
+        """Force a rebuild of one layer (or every layer) on its next keyframe."""
+        layers = self._layers.values() if name is None else [self._layers.get(name)]
+        for layer in layers:
+            if layer is not None:
+                layer.built = False
+                layer.key = None
+
+    @contextmanager
+    def render(self, name, key):
+        layer = self._layers[name]
+        x0, y0, x1, y1 = layer.region
+        layer.buffer.clear_region(x0, y0, x1, y1)
+        self._rendering = layer
+        try:
+            yield layer
+        finally:
+            self._rendering = None
+            layer.key = key
+            layer.built = True
+            layer.dirty = True
+
+    def pending(self, clear_token, enabled_tags=None):
+        """
+        Layers to composite this frame, bottom-up.
+
+        Everything built is composited after a full clear (clear_token moved);
+        otherwise only dirty layers, plus any higher layer they overlap.
+        """
+        full = clear_token != self._clear_token_seen
+        self._clear_token_seen = clear_token
+
+        active = [
+            layer for layer in self._layers.values()
+            if layer.built and (enabled_tags is None or layer.tag is None or layer.tag in enabled_tags)
+        ]
+        active.sort(key=lambda layer: layer.z)
+
+        if full:
+            out = active
+        else:
+            out = []
+            for layer in active:
+                if layer.dirty or any(below.overlaps(layer) and below.z < layer.z for below in out):
+                    out.append(layer)
+
+        for layer in out:
+            layer.dirty = False
+        return out
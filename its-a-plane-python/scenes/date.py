@@ -2,7 +2,7 @@
 import logging
 from datetime import datetime
 
-from rgbmatrix import graphics
+from setup.matrix import graphics
 from utilities.animator import Animator
 from utilities.temperature import grab_forecast
 from setup import colours, fonts, frames
@@ -3,6 +3,7 @@ from datetime import datetime
 from PIL import Image
 
 from utilities.animator import Animator
+from utilities import image_cache
 from setup import colours, fonts, frames, screen
 from utilities.temperature import grab_forecast
 from config import NIGHT_START, NIGHT_END
@@ -41,8 +42,8 @@ class DaysForecastScene(object):
         self._cached_forecast = None
         self._last_forecast_attempt = None
 
-        # icon_name -> PIL.Image(RGB) or None
-        self._icon_cache = {}
+        # ("icon", icon_name) -> PIL.Image(RGB) or None, in the shared bounded cache
+        self._icon_cache = image_cache.shared()
 
         # Track Display-level full clears so we redraw after canvas.Clear()
         self._last_clear_token_seen = None
@@ -79,8 +80,10 @@ class DaysForecastScene(object):
             return None
 
         icon_name = str(icon_name).strip()
-        if icon_name in self._icon_cache:
-            return self._icon_cache[icon_name]
+        key = ("icon", icon_name)
+        hit, img = self._icon_cache.lookup(key)
+        if hit:
+            return img
 
         path = f"icons/{icon_name}.png"  # exactly like original
         try:
@@ -94,10 +97,10 @@ class DaysForecastScene(object):
             img.thumbnail((ICON_SIZE, ICON_SIZE), resample)
             img = img.convert("RGB")
 
-            self._icon_cache[icon_name] = img
+            self._icon_cache.put(key, img)
             return img
         except Exception:
-            self._icon_cache[icon_name] = None
+            self._icon_cache.put(key, None)
             return None
 
     @Animator.KeyFrame.add(0, tag="days_forecast")
@@ -6,9 +6,21 @@ from setup import colours, screen
 class FlightBackgroundScene(object):
     def __init__(self):
         super().__init__()
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            # Bottom layer: covers any pixel the other flight layers don't own.
+            layers.add("flight_bg", (0, 0, screen.WIDTH, screen.HEIGHT), tag="flight_bg", z=0)
 
     @Animator.KeyFrame.add(1, tag="flight_bg", order=0)
     def flight_background(self, count):
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            # Static: built once, re-composited by Display after every full clear.
+            if layers.needs_rebuild("flight_bg", "black"):
+                with self.layer("flight_bg", "black"):
+                    self.draw_square(0, 0, screen.WIDTH, screen.HEIGHT, colours.BLACK)
+            return
+
         # Full-screen black background for flight mode.
         self.draw_square(0, 0, screen.WIDTH, screen.HEIGHT, colours.BLACK)
         # Signal other flight scenes to redraw this frame.
@@ -1,6 +1,6 @@
 from utilities.animator import Animator
 from setup import colours, fonts, screen
-from rgbmatrix import graphics
+from setup.matrix import graphics
 
 FLIGHT_NO_DISTANCE_FROM_TOP = 23   # baseline
 FLIGHT_NO_TEXT_HEIGHT = 8
@@ -18,6 +18,7 @@ BAND_X0 = 0
 BAND_X1 = screen.WIDTH
 BAND_Y0 = FLIGHT_NO_DISTANCE_FROM_TOP - (FLIGHT_NO_TEXT_HEIGHT - 1)  # 23 - 7 = 16 ✅
 BAND_Y1 = FLIGHT_NO_DISTANCE_FROM_TOP + 1                             # 24 (exclusive) ✅
+BAND_LAYER = (BAND_X0, BAND_Y0, BAND_X1, BAND_Y1)
 
 # Use a known-good black for draw_square -> DrawLine
 BLACK = graphics.Color(0, 0, 0)
@@ -28,6 +29,10 @@ class FlightDetailsScene(object):
         super().__init__()
         self.flight_position = screen.WIDTH
 
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            layers.add("flight_details", BAND_LAYER, tag="flight_details")
+
     def _clear_band(self):
         self.draw_square(BAND_X0, BAND_Y0, BAND_X1, BAND_Y1, BLACK)
 
@@ -41,6 +46,10 @@ class FlightDetailsScene(object):
     @Animator.KeyFrame.add(0, tag="flight_details", order=2)
     def reset_flight_details(self):
         self.flight_position = screen.WIDTH
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            layers.invalidate("flight_details")
+            return
         self._clear_band()
 
     @Animator.KeyFrame.add(1, tag="flight_details", order=2)
@@ -49,8 +58,6 @@ class FlightDetailsScene(object):
         if not f:
             return
 
-        self._clear_band()
-
         callsign = f.get("callsign") or ""
         owner_icao = f.get("owner_icao") or ""
         airline = f.get("airline") or ""
@@ -65,9 +72,23 @@ class FlightDetailsScene(object):
                 flight_no = f"{airline} {flight_no}"
 
         data = getattr(self, "_data", [])
-        if not flight_no and len(data) <= 1:
+        pager = f"{getattr(self,'_data_index',0) + 1}/{len(data)}" if len(data) > 1 else ""
+
+        # The band scrolls every frame, so the layer key changes every frame too
+        with self.layer("flight_details", (self.flight_position, flight_no, pager)):
+            self._clear_band()
+            if not flight_no and len(data) <= 1:
+                return
+            total_len = self._draw_band(flight_no, pager)
+
+        self.flight_position -= 1
+
+        # Wrap without advancing _data_index (PlaneDetails will drive index)
+        if self.flight_position + max(total_len, 1) < 0:
+            self.flight_position = screen.WIDTH
             return
 
+    def _draw_band(self, flight_no, pager):
         total_len = 0
 
         if flight_no:
@@ -81,18 +102,13 @@ class FlightDetailsScene(object):
                 )
 
         # Pager is OK to show, but DO NOT use it to extend total_len unless you want it to affect wrap timing
-        if len(data) > 1:
+        if pager:
             self.draw_text(
                 DATA_INDEX_FONT,
                 DATA_INDEX_POSITION[0],
                 DATA_INDEX_POSITION[1],
                 DATA_INDEX_COLOUR,
-                f"{getattr(self,'_data_index',0) + 1}/{len(data)}",
+                pager,
             )
 
-        self.flight_position -= 1
-
-        # Wrap without advancing _data_index (PlaneDetails will drive index)
-        if self.flight_position + max(total_len, 1) < 0:
-            self.flight_position = screen.WIDTH
-            return
+        return total_len
@@ -1,8 +1,12 @@
 # scenes/flightlogo.py
 from PIL import Image
 import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 
 from utilities.animator import Animator
+from utilities import logo_atlas
+from utilities import image_cache
 from setup import colours
 
 LOGO_SIZE = 16
@@ -20,17 +24,48 @@ def _logo_path(icao: str) -> str:
     return f"logos/{icao}.png"
 
 
+def _resample():
+    try:
+        return Image.Resampling.LANCZOS  # Pillow 10+
+    except AttributeError:
+        return Image.ANTIALIAS          # Pillow <10
+
+
+def _load_logo_file(icao: str):
+    """Decode and shrink logos/<icao>.png to an RGB image; None if it's missing or unreadable."""
+    try:
+        with Image.open(_logo_path(icao)) as img:
+            img.thumbnail((LOGO_SIZE, LOGO_SIZE), _resample())
+            return img.convert("RGB")
+    except Exception:
+        return None
+
+
 class FlightLogoScene(object):
     def __init__(self):
         super().__init__()
-        self._last_icao_drawn = None
+        # (icao, id of the image shown) last drawn
+        self._last_logo_drawn = None
 
-        # icao -> PIL.Image(RGB) or None
-        self._logo_cache = {}
+        # ("logo", icao) -> PIL.Image(RGB) or None, in the shared bounded cache
+        self._logo_cache = image_cache.shared()
+
+        # Logos missing from the atlas are decoded on this thread, never the render thread
+        self._logo_loader = None
+        self._logo_pending = set()
+        self._logo_lock = Lock()
 
         # Track Display-level full clears (clear_canvas/clear_screen) so we redraw after canvas.Clear()
         self._last_clear_token_seen = None
 
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            layers.add(
+                "flight_logo",
+                (LOGO_CLEAR_X0, LOGO_CLEAR_Y0, LOGO_CLEAR_X1, LOGO_CLEAR_Y1),
+                tag="flight_logo",
+            )
+
     def _clear_logo_area(self):
         self.draw_square(
             LOGO_CLEAR_X0,
@@ -63,49 +98,83 @@ class FlightLogoScene(object):
         return False
 
     def _get_logo(self, icao: str):
-        """Load+resize once; return cached PIL RGB image or None."""
+        """Cached PIL RGB image for icao; None if there is no logo, or it is still being loaded."""
         if not icao or icao in ("", "N/A"):
             icao = DEFAULT_IMAGE
 
         icao = str(icao).strip()
 
-        if icao in self._logo_cache:
-            return self._logo_cache[icao]
-
-        path = _logo_path(icao)
-        fallback = _logo_path(DEFAULT_IMAGE)
-
-        try:
-            img = Image.open(path)
-        except FileNotFoundError:
-            try:
-                img = Image.open(fallback)
-            except Exception:
-                self._logo_cache[icao] = None
-                return None
-        except Exception:
-            self._logo_cache[icao] = None
-            return None
-
-        # Resize
+        key = ("logo", icao)
+        hit, img = self._logo_cache.lookup(key)
+        if hit:
+            return img
+
+        # Packed atlas (scripts/build_logo_atlas.py): already 16x16 RGB, no decode
+        atlas = logo_atlas.shared()
+        if atlas is not None and icao in atlas:
+            img = atlas.get(icao)
+            self._logo_cache.put(key, img)
+            return img
+
+        # Not packed yet (e.g. downloaded since the atlas was built): decode it in the
+        # background and let the caller show the default logo meanwhile
+        self._load_logo_later(icao)
+        return None
+
+    def _load_logo_later(self, icao: str):
+        with self._logo_lock:
+            if icao in self._logo_pending:
+                return
+            self._logo_pending.add(icao)
+            if self._logo_loader is None:
+                self._logo_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="logo-load")
+            loader = self._logo_loader
+        loader.submit(self._load_logo, icao)
+
+    def _load_logo(self, icao: str):
         try:
-            resample = Image.Resampling.LANCZOS  # Pillow 10+
-        except AttributeError:
-            resample = Image.ANTIALIAS          # Pillow <10
-
-        img.thumbnail((LOGO_SIZE, LOGO_SIZE), resample)
-        img = img.convert("RGB")
-
-        self._logo_cache[icao] = img
+            # None is a negative entry: it expires after IMAGE_CACHE_NEGATIVE_TTL, so a logo
+            # downloaded later is found without a restart
+            self._logo_cache.put(("logo", icao), _load_logo_file(icao))
+        finally:
+            with self._logo_lock:
+                self._logo_pending.discard(icao)
+
+    def _logo_or_default(self, icao: str):
+        """The airline's logo, else the default one (cached under its own key)."""
+        img = self._get_logo(icao)
+        if img is None and icao != DEFAULT_IMAGE:
+            img = self._get_logo(DEFAULT_IMAGE)
         return img
 
     @Animator.KeyFrame.add(0, tag="flight_logo")
     def reset_logo(self):
         # Called on reset_scene() (mode switch / clear_screen)
-        self._last_icao_drawn = None
+        self._last_logo_drawn = None
         self._last_clear_token_seen = getattr(self, "_clear_token", None)
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            layers.invalidate("flight_logo")
+            return
+        self._clear_logo_area()
+
+    def _draw_logo(self, img):
+        ## Clear our region and draw
         self._clear_logo_area()
 
+        if img is not None:
+            # Bottom-align inside the 16x16 logo box ("logo should be at the base")
+            y = LOGO_SIZE - img.size[1]
+            if y < 0:
+                y = 0
+
+            # (Optional) left align; you can center if you want:
+            x = 0
+            x = max(0, (LOGO_SIZE - img.size[0]) // 2)
+
+            # IMPORTANT: draw to backbuffer via Display helper
+            self.set_image(img, x, y)
+
     @Animator.KeyFrame.add(1, tag="flight_logo")
     def logo_details(self, count):
         ## Redraw if the display did a full clear this frame
@@ -120,27 +189,25 @@ class FlightLogoScene(object):
             icao = DEFAULT_IMAGE
         icao = str(icao).strip()
 
+        # Keyed on the image too: the default is replaced once the airline's logo turns up
+        img = self._logo_or_default(icao)
+        shown = (icao, id(img))
+
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            # Cached layer: only rebuilt when the airline (or its logo) changes
+            if layers.needs_rebuild("flight_logo", shown):
+                with self.layer("flight_logo", shown):
+                    self._draw_logo(img)
+            self._last_logo_drawn = shown
+            return
+
         force = bool(getattr(self, "_redraw_all_this_frame", False))
 
         ## Only redraw when needed:
-        if (icao == self._last_icao_drawn) and (not force) and (not cleared):
+        if (shown == self._last_logo_drawn) and (not force) and (not cleared):
             return
 
-        ## Clear our region and draw
-        self._clear_logo_area()
-
-        img = self._get_logo(icao)
-        if img is not None:
-            # Bottom-align inside the 16x16 logo box ("logo should be at the base")
-            y = LOGO_SIZE - img.size[1]
-            if y < 0:
-                y = 0
-
-            # (Optional) left align; you can center if you want:
-            x = 0
-            x = max(0, (LOGO_SIZE - img.size[0]) // 2)
-
-            # IMPORTANT: draw to backbuffer via Display helper
-            self.set_image(img, x, y)
+        self._draw_logo(img)
 
-        self._last_icao_drawn = icao
+        self._last_logo_drawn = shown
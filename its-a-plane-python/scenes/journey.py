@@ -1,7 +1,6 @@
 # scenes/journey.py
 from utilities.animator import Animator
-from setup import colours, fonts
-from rgbmatrix import graphics
+from setup import colours, fonts, screen
 from config import DISTANCE_UNITS
 
 try:
@@ -66,6 +65,14 @@ ARROW_CLEAR = (
     ARROW_POINT_POSITION[1] + (ARROW_HEIGHT // 2) + 1,
 )
 
+# Retained layer: bounding box of the three regions above, clipped to the panel
+JOURNEY_LAYER = (
+    min(JOURNEY_CLEAR[0], DIST_CLEAR[0], ARROW_CLEAR[0]),
+    min(JOURNEY_CLEAR[1], DIST_CLEAR[1], ARROW_CLEAR[1]),
+    min(screen.WIDTH, max(JOURNEY_CLEAR[2], DIST_CLEAR[2], ARROW_CLEAR[2])),
+    min(screen.HEIGHT, max(JOURNEY_CLEAR[3], DIST_CLEAR[3], ARROW_CLEAR[3])),
+)
+
 
 def _unit_label() -> str:
     u = str(DISTANCE_UNITS).lower()
@@ -127,6 +134,10 @@ class JourneyScene(object):
         self._last_render_key = None
         self._last_clear_token_seen = None
 
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            layers.add("journey", JOURNEY_LAYER, tag="journey")
+
     def _clear_all(self):
         self.draw_square(*JOURNEY_CLEAR, colours.BLACK)
         self.draw_square(*DIST_CLEAR, colours.BLACK)
@@ -157,42 +168,7 @@ class JourneyScene(object):
 
         return False
 
-    def _draw_line(self, x0, y0, x1, y1, colour):
-        # If you ever call raw graphics, mark dirty explicitly.
-        self.mark_dirty()
-        graphics.DrawLine(self.canvas, x0, y0, x1, y1, colour)
-
-    @Animator.KeyFrame.add(0, tag="journey")
-    def reset_journey(self):
-        self._last_render_key = None
-        self._last_clear_token_seen = getattr(self, "_clear_token", None)
-        self._clear_all()
-
-    @Animator.KeyFrame.add(1, tag="journey")
-    def journey(self, count):
-        f = self._current_flight()
-        if not f:
-            return
-
-        force = bool(getattr(self, "_redraw_all_this_frame", False))
-        force = force or self._sync_with_canvas_clear()
-
-        # Only redraw when relevant flight data changes
-        render_key = (
-            getattr(self, "_data_index", 0),
-            f.get("origin"),
-            f.get("destination"),
-            f.get("distance_origin"),
-            f.get("distance_destination"),
-            f.get("time_real_departure"),
-            f.get("time_scheduled_departure"),
-            f.get("time_estimated_arrival"),
-            f.get("time_scheduled_arrival"),
-        )
-        if (not force) and (render_key == self._last_render_key):
-            return
-        self._last_render_key = render_key
-
+    def _draw_journey(self, f):
         self._clear_all()
 
         origin = f.get("origin") or ""
@@ -280,7 +256,7 @@ class JourneyScene(object):
         # Unknown/zero distances: grey arrow
         if d_o <= 0 or d_d <= 0:
             for _ in range(ARROW_WIDTH):
-                self._draw_line(x, y1, x, y2, ARROW_COLOUR)
+                self.draw_line(x, y1, x, y2, ARROW_COLOUR)
                 x += 1
                 y1 += 1
                 y2 -= 1
@@ -305,13 +281,59 @@ class JourneyScene(object):
         dest_pixels = ARROW_WIDTH - origin_pixels
 
         for _ in range(origin_pixels):
-            self._draw_line(x, y1, x, y2, DISTANCE_ORIGIN_COLOUR)
+            self.draw_line(x, y1, x, y2, DISTANCE_ORIGIN_COLOUR)
             x += 1
             y1 += 1
             y2 -= 1
 
         for _ in range(dest_pixels):
-            self._draw_line(x, y1, x, y2, DISTANCE_DESTINATION_COLOUR)
+            self.draw_line(x, y1, x, y2, DISTANCE_DESTINATION_COLOUR)
             x += 1
             y1 += 1
             y2 -= 1
+
+    @Animator.KeyFrame.add(0, tag="journey")
+    def reset_journey(self):
+        self._last_render_key = None
+        self._last_clear_token_seen = getattr(self, "_clear_token", None)
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            layers.invalidate("journey")
+            return
+        self._clear_all()
+
+    @Animator.KeyFrame.add(1, tag="journey")
+    def journey(self, count):
+        f = self._current_flight()
+        if not f:
+            return
+
+        force = bool(getattr(self, "_redraw_all_this_frame", False))
+        force = force or self._sync_with_canvas_clear()
+
+        # Only redraw when relevant flight data changes
+        render_key = (
+            getattr(self, "_data_index", 0),
+            f.get("origin"),
+            f.get("destination"),
+            f.get("distance_origin"),
+            f.get("distance_destination"),
+            f.get("time_real_departure"),
+            f.get("time_scheduled_departure"),
+            f.get("time_estimated_arrival"),
+            f.get("time_scheduled_arrival"),
+        )
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            # Cached layer: only rebuilt when the key changes, never just because of a clear
+            if layers.needs_rebuild("journey", render_key):
+                with self.layer("journey", render_key):
+                    self._draw_journey(f)
+            self._last_render_key = render_key
+            return
+
+        if (not force) and (render_key == self._last_render_key):
+            return
+        self._last_render_key = render_key
+
+        self._draw_journey(f)
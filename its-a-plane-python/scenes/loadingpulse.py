@@ -12,7 +12,7 @@ class LoadingPulseScene(object):
         super().__init__()
 
     def _clear_pixel(self):
-        self.canvas.SetPixel(BLINKER_POSITION[0], BLINKER_POSITION[1], 0, 0, 0)
+        self.set_pixel(BLINKER_POSITION[0], BLINKER_POSITION[1], 0, 0, 0)
 
     @Animator.KeyFrame.add(0, tag="defaultPulse")
     def reset_loading_pulse(self):
@@ -39,7 +39,7 @@ class LoadingPulseScene(object):
         if brightness < 0 or brightness > 1:
             brightness = 0
 
-        self.canvas.SetPixel(
+        self.set_pixel(
             BLINKER_POSITION[0],
             BLINKER_POSITION[1],
             int(brightness * BLINKER_COLOUR.red),
@@ -1,7 +1,7 @@
 from utilities.animator import Animator
 from setup import colours, fonts, screen
 from config import DISTANCE_UNITS
-from rgbmatrix import graphics
+from setup.matrix import graphics
 
 PLANE_COLOUR = colours.LIGHT_MID_BLUE
 PLANE_DISTANCE_COLOUR = colours.LIGHT_PINK
@@ -15,6 +15,7 @@ PLANE_CLEAR_X0 = 0
 PLANE_CLEAR_X1 = screen.WIDTH
 PLANE_CLEAR_Y0 = PLANE_DISTANCE_FROM_TOP - (PLANE_TEXT_HEIGHT - 1)  # 31 - 7 = 24 ✅
 PLANE_CLEAR_Y1 = PLANE_DISTANCE_FROM_TOP + 1                        # 32 (exclusive) ✅
+PLANE_LAYER = (PLANE_CLEAR_X0, PLANE_CLEAR_Y0, PLANE_CLEAR_X1, PLANE_CLEAR_Y1)
 
 BLACK = graphics.Color(0, 0, 0)
 
@@ -28,6 +29,10 @@ class PlaneDetailsScene(object):
         self.plane_position = screen.WIDTH
         self._data_all_looped = False
 
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            layers.add("plane_details", PLANE_LAYER, tag="plane_details")
+
     def _clear_band(self):
         self.draw_square(PLANE_CLEAR_X0, PLANE_CLEAR_Y0, PLANE_CLEAR_X1, PLANE_CLEAR_Y1, BLACK)
 
@@ -41,6 +46,10 @@ class PlaneDetailsScene(object):
     @Animator.KeyFrame.add(0, tag="plane_details")
     def reset_plane_details(self):
         self.plane_position = screen.WIDTH
+        layers = getattr(self, "layers", None)
+        if layers is not None:
+            layers.invalidate("plane_details")
+            return
         self._clear_band()
 
     @Animator.KeyFrame.add(1, tag="plane_details")
@@ -53,6 +62,13 @@ class PlaneDetailsScene(object):
         distance = f.get("distance", None)
         direction = f.get("direction", "") or ""
 
+        # Between grabs, where the aircraft should be by now
+        model = getattr(self, "_motion", None)
+        estimate = model.estimate(f) if model is not None else None
+        if estimate is not None:
+            distance = estimate["distance"]
+            direction = estimate["direction"]
+
         units = _unit_label()
         plane_name_text = f"{plane_name} " if plane_name else ""
 
@@ -64,23 +80,24 @@ class PlaneDetailsScene(object):
         if direction:
             distance_text = f"{distance_text} {direction}"
 
+        # The band scrolls every frame, so the layer key changes every frame too
+        with self.layer("plane_details", (self.plane_position, plane_name_text, distance_text)):
+            self._clear_band()
 
-        self._clear_band()
-
-        w1 = self.draw_text(
-            PLANE_FONT,
-            self.plane_position,
-            PLANE_DISTANCE_FROM_TOP,
-            PLANE_COLOUR,
-            plane_name_text,
-        )
-        w2 = self.draw_text(
-            PLANE_FONT,
-            self.plane_position + w1,
-            PLANE_DISTANCE_FROM_TOP,
-            PLANE_DISTANCE_COLOUR,
-            distance_text,
-        )
+            w1 = self.draw_text(
+                PLANE_FONT,
+                self.plane_position,
+                PLANE_DISTANCE_FROM_TOP,
+                PLANE_COLOUR,
+                plane_name_text,
+            )
+            w2 = self.draw_text(
+                PLANE_FONT,
+                self.plane_position + w1,
+                PLANE_DISTANCE_FROM_TOP,
+                PLANE_DISTANCE_COLOUR,
+                distance_text,
+            )
         total = w1 + w2
 
         self.plane_position -= 1
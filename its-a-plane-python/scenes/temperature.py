@@ -1,6 +1,6 @@
 # scenes/temperature.py
 from datetime import datetime, timedelta
-from rgbmatrix import graphics
+from setup.matrix import graphics
 
 from utilities.animator import Animator
 from setup import colours, fonts, frames
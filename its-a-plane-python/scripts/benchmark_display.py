@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Frame-cost benchmark for the real Display class.
+
+Runs Display against the virtual matrix backend (no HAT needed) with flights
+loaded from fixtures/, for N seconds in each mode, and writes the numbers to
+a JSON file:
+
+    python3 scripts/benchmark_display.py --seconds 10 --out bench.json
+
+Network, weather and screen-state lookups are replaced with canned values so
+runs are repeatable and offline; everything else (scenes, Animator.step,
+present/swap) is the production code path.
+"""
+import argparse
+from array import array
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+# Must be set before setup.matrix is imported
+os.environ.setdefault("PLANE_TRACKER_MATRIX", "virtual")
+
+FIXTURES = {
+    "one": os.path.join(BASE_DIR, "fixtures", "fixture_flights_one.json"),
+    "two": os.path.join(BASE_DIR, "fixtures", "fixture_flights_two.json"),
+}
+MODES = ("default", "flight", "net")
+
+
+class FixtureOverhead:
+    """Overhead stand-in that serves a fixed list of flights once."""
+
+    def __init__(self, flights):
+        self._data = flights
+        self._new_data = True
+
+    def grab_data(self):
+        pass
+
+    @property
+    def new_data(self):
+        return self._new_data
+
+    @property
+    def processing(self):
+        return False
+
+    @property
+    def data(self):
+        self._new_data = False
+        return self._data
+
+    @property
+    def data_is_empty(self):
+        return len(self._data) == 0
+
+
+def _canned_forecast():
+    today = datetime.now().replace(hour=6, minute=0, second=0, microsecond=0)
+    days = []
+    for i, code in enumerate((10000, 10010, 11000)):
+        days.append({
+            "startTime": (today + timedelta(days=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "values": {
+                "weatherCodeFullDay": code,
+                "temperatureMin": 41 + i,
+                "temperatureMax": 63 - i,
+                "moonPhase": 3,
+                "sunriseTime": today.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "sunsetTime": (today + timedelta(hours=12)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            },
+        })
+    return days
+
+
+def _patch_environment(display_module, mode):
+    from utilities import network_status
+    import scenes.temperature
+    import scenes.daysforecast
+    import scenes.date
+
+    status = network_status.NetStatus.NO_NET if mode == "net" else network_status.NetStatus.OK
+    network_status.current_status = lambda: status
+
+    forecast = _canned_forecast()
+    scenes.temperature.grab_temperature_and_humidity = lambda *a, **k: (58.0, 45.0)
+    scenes.daysforecast.grab_forecast = lambda *a, **k: forecast
+    scenes.date.grab_forecast = lambda *a, **k: forecast
+
+    display_module.read_screen_state = lambda: "on"
+    display_module.read_mode_override = lambda: "flight" if mode == "flight" else "default"
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def run_mode(mode, flights, seconds, warmup_frames, trace_frames):
+    import display
+    from utilities import image_cache, poll_scheduler
+
+    _patch_environment(display, mode)
+    # No status file: a benchmark run must not touch the poll_status.json /api/poll serves
+    d = display.Display(
+        overhead=FixtureOverhead(flights),
+        poll=poll_scheduler.PollScheduler(status_file=None),
+    )
+    d.delay = 0
+
+    # Settle: load data, switch mode, first full draw
+    for _ in range(warmup_frames):
+        d.step()
+
+    swaps_start = getattr(d.matrix, "swaps", 0)
+    clears_start = d._clear_token
+    blocks_start = sys.getallocatedblocks()
+    # array, not list: no per-sample float objects skewing the allocation counts
+    times = array("d")
+
+    gc.collect()
+    started = time.perf_counter()
+    deadline = started + seconds
+    now = started
+    while now < deadline:
+        t0 = time.perf_counter()
+        d.step()
+        now = time.perf_counter()
+        times.append(now - t0)
+    elapsed = now - started
+
+    frames = len(times)
+    blocks_end = sys.getallocatedblocks()
+    swaps = getattr(d.matrix, "swaps", 0) - swaps_start
+    clears = d._clear_token - clears_start
+
+    # Separate short pass: tracemalloc slows frames down, so it is not timed
+    transient = []
+    tracemalloc.start()
+    for _ in range(trace_frames):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        d.step()
+        _, peak = tracemalloc.get_traced_memory()
+        transient.append(peak - base)
+    tracemalloc.stop()
+
+    times = sorted(times)
+    return {
+        "frames": frames,
+        "seconds": round(elapsed, 3),
+        "fps": round(frames / elapsed, 1) if elapsed else 0.0,
+        "frame_ms_mean": round(1000.0 * sum(times) / frames, 4) if frames else 0.0,
+        "frame_ms_p50": round(1000.0 * _percentile(times, 50), 4),
+        "frame_ms_p99": round(1000.0 * _percentile(times, 99), 4),
+        "frame_ms_max": round(1000.0 * times[-1], 4) if times else 0.0,
+        "swaps_per_sec": round(swaps / elapsed, 2) if elapsed else 0.0,
+        "full_clears_per_sec": round(clears / elapsed, 2) if elapsed else 0.0,
+        # Net growth in live allocator blocks (should stay ~0 in steady state)
+        "alloc_blocks_per_frame": round((blocks_end - blocks_start) / frames, 3) if frames else 0.0,
+        # Peak short-lived bytes allocated inside one frame
+        "alloc_bytes_per_frame": int(sum(transient) / len(transient)) if transient else 0,
+        "image_cache": image_cache.shared().stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Display frame cost on the virtual matrix.")
+    parser.add_argument("--seconds", type=float, default=5.0, help="timed run length per mode")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma list of default,flight,net")
+    parser.add_argument("--fixture", default="two", help="'one', 'two' or a path to a fixture JSON")
+    parser.add_argument("--warmup", type=int, default=50, help="untimed frames before measuring")
+    parser.add_argument("--trace-frames", type=int, default=200, help="frames sampled with tracemalloc")
+    parser.add_argument("--out", default="benchmark_display.json", help="where to write the JSON results")
+    args = parser.parse_args()
+
+    fixture_path = FIXTURES.get(args.fixture, args.fixture)
+    with open(fixture_path, "r", encoding="utf-8") as f:
+        flights = json.load(f)
+
+    from setup import matrix
+    import display
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "backend": matrix.BACKEND,
+        "compositor": bool(display.DISPLAY_COMPOSITOR),
+        "fixture": os.path.basename(fixture_path),
+        "flights": len(flights),
+        "modes": {},
+    }
+
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        if mode not in MODES:
+            parser.error(f"unknown mode {mode!r}")
+        stats = run_mode(mode, flights, args.seconds, args.warmup, args.trace_frames)
+        results["modes"][mode] = stats
+        print(
+            f"{mode:8s} {stats['fps']:>9.1f} fps  p50 {stats['frame_ms_p50']:.3f} ms  "
+            f"p99 {stats['frame_ms_p99']:.3f} ms  swaps/s {stats['swaps_per_sec']:.1f}  "
+            f"clears/s {stats['full_clears_per_sec']:.1f}"
+        )
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
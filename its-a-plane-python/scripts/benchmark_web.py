@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Concurrent-client benchmark for the web dashboard.
+
+Starts web/app.py in-process under each server (the pooled server from
+web/server.py and Flask's development server, as app.run() used to), points
+N keep-alive clients at a mix of pages, and writes the numbers to a JSON file:
+
+    python3 scripts/benchmark_web.py --clients 32 --seconds 10 --out bench_web.json
+
+/api/network shells out to ip/iw four times; here each of those commands is
+replaced with a fixed --command-ms sleep so the slow endpoint is repeatable.
+Everything else is the production request path.
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+SERVERS = ("threaded", "development")
+FAST_PATHS = ["/", "/closest/json", "/farthest/json", "/recent/list", "/screen"]
+SLOW_PATH = "/api/network"
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _patch_app(app_module, command_ms):
+    def slow_run(cmd):
+        time.sleep(command_ms / 1000.0)
+        return ""
+
+    app_module._run = slow_run
+    app_module.dns_ok = lambda domain="": slow_run(None) == ""
+
+
+def _start(kind, app):
+    if kind == "threaded":
+        from web import server
+        srv = server.make_server(app, "127.0.0.1", 0)
+    else:
+        from werkzeug.serving import make_server
+        srv = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    return srv, thread
+
+
+def _client(port, deadline, slow_share, seed, results):
+    rng = random.Random(seed)
+    conn = None
+    while time.perf_counter() < deadline:
+        path = SLOW_PATH if rng.random() < slow_share else rng.choice(FAST_PATHS)
+        t0 = time.perf_counter()
+        try:
+            if conn is None:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            resp.read()
+            status = resp.status
+            if resp.getheader("Connection", "").lower() == "close":
+                conn.close()
+                conn = None
+        except (OSError, http.client.HTTPException):
+            status = None
+            if conn is not None:
+                conn.close()
+            conn = None
+        elapsed = time.perf_counter() - t0
+        results.append((path == SLOW_PATH, status, elapsed))
+    if conn is not None:
+        conn.close()
+
+
+def run_server(kind, app, clients, seconds, slow_share):
+    srv, thread = _start(kind, app)
+    results = []
+    peak_threads = threading.active_count()
+    deadline = time.perf_counter() + seconds
+    workers = [
+        threading.Thread(target=_client, args=(srv.port, deadline, slow_share, i, results), daemon=True)
+        for i in range(clients)
+    ]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    while any(w.is_alive() for w in workers):
+        peak_threads = max(peak_threads, threading.active_count())
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+
+    srv.shutdown()
+    thread.join(timeout=5)
+    srv.server_close()
+
+    fast = sorted(t for slow, status, t in results if not slow and status == 200)
+    slow = sorted(t for slow, status, t in results if slow and status == 200)
+    ok = len(fast) + len(slow)
+    return {
+        "requests": len(results),
+        "requests_per_sec": ok / elapsed if elapsed else 0.0,
+        "fast_ms_p50": 1000 * _percentile(fast, 50),
+        "fast_ms_p99": 1000 * _percentile(fast, 99),
+        "slow_ms_p50": 1000 * _percentile(slow, 50),
+        "slow_ms_p99": 1000 * _percentile(slow, 99),
+        "busy_503": sum(1 for _, status, _ in results if status == 503),
+        "errors": sum(1 for _, status, _ in results if status not in (200, 503)),
+        # Benchmark client threads included; the development server adds one per connection
+        "peak_threads": peak_threads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the web dashboard with concurrent clients.")
+    parser.add_argument("--servers", default=",".join(SERVERS), help="comma list of threaded,development")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent keep-alive clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="run length per server")
+    parser.add_argument("--slow-share", type=float, default=0.1, help="fraction of requests to /api/network")
+    parser.add_argument("--command-ms", type=float, default=100.0, help="simulated cost of each ip/iw command")
+    parser.add_argument("--out", default="benchmark_web.json", help="where to write the JSON results")
+    args = parser.parse_args()
+
+    from web import app as app_module
+    from web import server
+    # One log line per request would dominate the timings
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    _patch_app(app_module, args.command_ms)
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "clients": args.clients,
+        "slow_share": args.slow_share,
+        "command_ms": args.command_ms,
+        "web_threads": server.WEB_THREADS,
+        "servers": {},
+    }
+
+    for kind in [s.strip() for s in args.servers.split(",") if s.strip()]:
+        if kind not in SERVERS:
+            parser.error(f"unknown server {kind!r}")
+        stats = run_server(kind, app_module.app, args.clients, args.seconds, args.slow_share)
+        results["servers"][kind] = stats
+        print(
+            f"{kind:12s} {stats['requests_per_sec']:>8.1f} req/s  "
+            f"fast p50 {stats['fast_ms_p50']:.1f} ms  p99 {stats['fast_ms_p99']:.1f} ms  "
+            f"slow p50 {stats['slow_ms_p50']:.0f} ms  503s {stats['busy_503']}  "
+            f"errors {stats['errors']}  threads {stats['peak_threads']}"
+        )
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Pack every 16x16 display logo into one atlas file the flight logo scene can
+memory-map (see utilities/logo_atlas.py).
+
+Sources, lowest priority first: logo/, logo2/ (as shipped in the repo) and
+the combined/downloaded logos/ folder, so freshly downloaded logos win.
+
+    python3 scripts/build_logo_atlas.py            # writes <logos>/logo_atlas.bin
+    python3 scripts/build_logo_atlas.py --out /tmp/atlas.bin
+
+Re-run it after adding logos; the display picks up a rebuilt atlas by itself.
+"""
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+from utilities import logo_atlas
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+LOGO_SIZE = 16
+LOGO_DIR_CANDIDATES = [
+    os.path.abspath(os.path.join(BASE_DIR, "..", "logos")),
+    os.path.expanduser(os.path.join("~", "logos")),
+]
+SOURCE_DIRS = [
+    os.path.abspath(os.path.join(BASE_DIR, "..", "logo")),
+    os.path.abspath(os.path.join(BASE_DIR, "..", "logo2")),
+    os.path.expanduser(os.path.join("~", "logo")),
+    os.path.expanduser(os.path.join("~", "logo2")),
+] + LOGO_DIR_CANDIDATES[::-1]
+
+
+def _select_logo_dir():
+    for base in LOGO_DIR_CANDIDATES:
+        if os.path.isdir(base):
+            return base
+    return LOGO_DIR_CANDIDATES[-1]
+
+
+def _resample():
+    try:
+        return Image.Resampling.LANCZOS  # Pillow 10+
+    except AttributeError:
+        return Image.ANTIALIAS          # Pillow <10
+
+
+def load_display_logo(path):
+    """Same pipeline FlightLogoScene uses for PNGs: thumbnail to 16x16, RGB."""
+    with Image.open(path) as img:
+        img.thumbnail((LOGO_SIZE, LOGO_SIZE), _resample())
+        return img.convert("RGB")
+
+
+def collect_logos(dirs):
+    logos = {}
+    seen = set()
+    for base in dirs:
+        real = os.path.realpath(base)
+        if real in seen or not os.path.isdir(base):
+            continue
+        seen.add(real)
+        for name in sorted(os.listdir(base)):
+            code, ext = os.path.splitext(name)
+            if ext.lower() != ".png" or "--" in code:
+                continue
+            try:
+                logos[code] = load_display_logo(os.path.join(base, name))
+            except Exception as e:
+                print(f"  skipped {name}: {e}")
+    return logos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the packed display logo atlas.")
+    parser.add_argument("--out", help=f"output file (default: <logos dir>/{logo_atlas.ATLAS_NAME})")
+    parser.add_argument("dirs", nargs="*", help="logo folders to pack, lowest priority first")
+    args = parser.parse_args()
+
+    if Image is None:
+        print("Pillow is required to build the atlas.")
+        return 1
+
+    out = args.out or os.path.join(_select_logo_dir(), logo_atlas.ATLAS_NAME)
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+
+    logos = collect_logos(args.dirs or SOURCE_DIRS)
+    count = logo_atlas.write_atlas(out, logos, tile_size=LOGO_SIZE)
+    print(f"Packed {count} logos into {out} ({os.path.getsize(out) // 1024} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
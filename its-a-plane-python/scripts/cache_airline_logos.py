@@ -1,12 +1,30 @@
 #!/usr/bin/env python3
-import io
+"""
+Download FlightAware logos for every airline in the close/farthest/recent
+logs and build their 16x16 display versions.
+
+Downloads run on a thread pool and are conditional: the ETag/Last-Modified
+of each logo is kept in <logos>/logo_manifest.json, so unchanged logos come
+back as 304 and are skipped. The 16x16 versions are built by
+utilities/logo_pipeline.py on a process pool, only for logos that changed.
+
+    python3 scripts/cache_airline_logos.py             # sync
+    python3 scripts/cache_airline_logos.py --force     # ignore the manifest
+"""
+import argparse
 import json
 import os
-from datetime import datetime
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.request import urlopen, Request
 from urllib.error import HTTPError, URLError
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+from utilities import logo_pipeline
+
 LOGO_DIR_CANDIDATES = [
     os.path.abspath(os.path.join(BASE_DIR, "..", "logos")),
     os.path.expanduser(os.path.join("~", "logos")),
@@ -24,12 +42,8 @@ PRIMARY_LOGO_URL = "https://cdn.flightradar.com/assets/airlines/logotypes/{}_{}.
 ALT_LOGO_URL = "https://www.flightradar.com/static/images/data/operators/{}_logo0.png"
 FLIGHTAWARE_LOGO_URL = "https://www.flightaware.com/images/airline_logos/180px/{}.png"
 OUTPUT_EXT = "png"
-DISPLAY_LOGO_SIZE = (16, 16)
-
-try:
-    from PIL import Image, ImageEnhance, ImageOps
-except Exception:
-    Image = None
+MANIFEST_NAME = "logo_manifest.json"
+DOWNLOAD_WORKERS = 8
 
 
 def _load_entries(path: str):
@@ -65,35 +79,57 @@ def _select_logo_dir():
     return LOGO_DIR_CANDIDATES[-1]
 
 
-def _fetch_logo(url: str):
-    try:
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=10) as resp:
-            return resp.read()
-    except (HTTPError, URLError):
-        return None
-
-
-def _write_display_logo(content: bytes, path: str):
-    if Image is None:
-        print("Pillow not available; skipping 16x16 logo.")
-        return
+def _load_manifest(path: str):
     try:
-        with Image.open(io.BytesIO(content)) as img:
-            img = img.convert("RGBA")
-            img = img.resize(DISPLAY_LOGO_SIZE, Image.LANCZOS)
-            background = Image.new("RGBA", DISPLAY_LOGO_SIZE, (255, 255, 255, 255))
-            background.paste(img, (0, 0), img)
-            flattened = background.convert("RGB")
-            flattened = ImageOps.autocontrast(flattened)
-            flattened = ImageEnhance.Contrast(flattened).enhance(1.4)
-            flattened = ImageEnhance.Color(flattened).enhance(1.2)
-            flattened.save(path, format="PNG")
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
     except Exception:
-        print(f"  display logo resize failed: {path}")
+        return {}
+
+
+def _write_manifest(path: str, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _fetch_logo(url: str, validators=None):
+    """
+    Conditional GET. Returns (status, content, validators):
+    200 with new content, 304 unchanged, None on a miss/error.
+    """
+    headers = {"User-Agent": "Mozilla/5.0"}
+    validators = validators or {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    try:
+        req = Request(url, headers=headers)
+        with urlopen(req, timeout=10) as resp:
+            content = resp.read()
+            fresh = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+            return (200, content, fresh) if content else (None, None, None)
+    except HTTPError as e:
+        if e.code == 304:
+            return 304, None, validators
+        return None, None, None
+    except (URLError, OSError):
+        return None, None, None
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Download airline logos seen in the flight logs.")
+    parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS, help="concurrent downloads")
+    parser.add_argument("--jobs", type=int, default=None, help="image processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="ignore stored validators and rebuild everything")
+    args = parser.parse_args()
+
     entries = []
     for path in DATA_FILES:
         entries.extend(_load_entries(path))
@@ -106,31 +142,70 @@ def main():
     logo_dir = _select_logo_dir()
     os.makedirs(logo_dir, exist_ok=True)
 
-    for icao, iata in codes:
-        flightaware = FLIGHTAWARE_LOGO_URL.format(icao)
-        web_filename = f"{icao}--web.{OUTPUT_EXT}"
-        web_path = os.path.join(logo_dir, web_filename)
-        display_path = os.path.join(logo_dir, f"{icao}.png")
-
-        if os.path.isfile(web_path):
-            print(f"{icao} {iata or '-'}")
-            print(f"  {flightaware} (overwrite)")
-
-        content = _fetch_logo(flightaware)
-        if not content:
-            print(f"{icao} {iata or '-'}")
-            print(f"  {flightaware} (miss)")
-            continue
-
-        try:
-            with open(web_path, "wb") as f:
-                f.write(content)
-            print(f"{icao} {iata or '-'}")
-            print(f"  {flightaware} -> {web_filename}")
-            _write_display_logo(content, display_path)
-        except Exception:
+    manifest_path = os.path.join(logo_dir, MANIFEST_NAME)
+    manifest = {} if args.force else _load_manifest(manifest_path)
+
+    started = time.perf_counter()
+    counts = {"new": 0, "unchanged": 0, "miss": 0, "failed": 0}
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as downloads:
+        pending = {}
+        for icao, iata in codes:
+            web_path = os.path.join(logo_dir, f"{icao}--web.{OUTPUT_EXT}")
+            # Only trust validators while the files they describe still exist
+            validators = manifest.get(icao) if os.path.isfile(web_path) else None
+            url = FLIGHTAWARE_LOGO_URL.format(icao)
+            pending[downloads.submit(_fetch_logo, url, validators)] = (icao, iata, url)
+
+        for future in as_completed(pending):
+            icao, iata, url = pending[future]
+            status, content, validators = future.result()
+            web_filename = f"{icao}--web.{OUTPUT_EXT}"
+            web_path = os.path.join(logo_dir, web_filename)
+
+            if status is None:
+                counts["miss"] += 1
+                print(f"{icao} {iata or '-'}")
+                print(f"  {url} (miss)")
+                continue
+
+            if status == 304:
+                counts["unchanged"] += 1
+                continue
+
+            try:
+                # temp file + rename: the web app's logo index notices the change
+                with open(web_path + ".tmp", "wb") as f:
+                    f.write(content)
+                os.replace(web_path + ".tmp", web_path)
+            except Exception:
+                counts["failed"] += 1
+                print(f"{icao} {iata or '-'}")
+                print(f"  {url} (write failed)")
+                continue
+
+            counts["new"] += 1
             print(f"{icao} {iata or '-'}")
-            print(f"  {flightaware} (write failed)")
+            print(f"  {url} -> {web_filename}")
+            manifest[icao] = {k: v for k, v in validators.items() if v}
+
+    _write_manifest(manifest_path, manifest)
+
+    # Every web logo on disk; the pipeline skips the ones whose display logo is current
+    jobs = [
+        (os.path.join(logo_dir, f"{icao}--web.{OUTPUT_EXT}"), os.path.join(logo_dir, f"{icao}.png"))
+        for icao, _ in codes
+    ]
+    built = logo_pipeline.build_display_logos(jobs, processes=args.jobs, force=args.force)
+    for error in built["errors"]:
+        print(f"  {error}")
+
+    print(
+        f"{len(codes)} airlines in {time.perf_counter() - started:.1f}s: "
+        f"{counts['new']} downloaded, {counts['unchanged']} unchanged, "
+        f"{counts['miss']} missing, {counts['failed']} failed; "
+        f"{built['built']} display logos built, {built['skipped']} up to date"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the two FlightRadar24 endpoints Overhead uses:
+
+    /zones/fcgi/feed.js?bounds=...      bounds listing (get_flights)
+    /clickhandler/?flight=<id>          flight details (get_flight_details)
+
+It serves synthetic flights that drift across whatever bounds are asked for,
+or recorded responses (--data), with optional latency and failure injection:
+
+    python3 scripts/fr24_standin.py --port 8024 --flights 40 \\
+        --latency lognormal:80,0.6 --rate-429 0.05 --rate-5xx 0.02 --drop 0.01
+
+Point the tracker at it with FR24_BASE_URL = "http://127.0.0.1:8024" in
+config.py (or PLANE_TRACKER_FR24_URL=... in the environment).
+
+--data takes a JSON file shaped like {"feed": {...feed.js body...},
+"details": {"<flight id>": {...clickhandler body...}}}.
+
+GET /_stats returns request/fault counters; GET /_reset clears them.
+"""
+import argparse
+import gzip
+import json
+import math
+import random
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+from urllib.parse import urlparse, parse_qs, unquote
+
+FEED_PATH = "/zones/fcgi/feed.js"
+DETAILS_PATH = "/clickhandler/"
+
+AIRPORTS = [
+    # iata, icao, name, lat, lon
+    ("ORD", "KORD", "Chicago O'Hare International Airport", 41.978603, -87.904842),
+    ("JFK", "KJFK", "New York John F. Kennedy International Airport", 40.639751, -73.778925),
+    ("LAX", "KLAX", "Los Angeles International Airport", 33.942536, -118.408075),
+    ("ATL", "KATL", "Atlanta Hartsfield-Jackson International Airport", 33.636719, -84.428067),
+    ("DFW", "KDFW", "Dallas Fort Worth International Airport", 32.896828, -97.037997),
+    ("DEN", "KDEN", "Denver International Airport", 39.861656, -104.673178),
+    ("SEA", "KSEA", "Seattle-Tacoma International Airport", 47.449, -122.309306),
+    ("BOS", "KBOS", "Boston Logan International Airport", 42.364347, -71.005181),
+    ("LHR", "EGLL", "London Heathrow Airport", 51.4706, -0.461941),
+    ("DXB", "OMDB", "Dubai International Airport", 25.252778, 55.364444),
+]
+
+AIRLINES = [
+    # iata, icao, name
+    ("AA", "AAL", "American Airlines"),
+    ("UA", "UAL", "United Airlines"),
+    ("DL", "DAL", "Delta Air Lines"),
+    ("WN", "SWA", "Southwest Airlines"),
+    ("BA", "BAW", "British Airways"),
+    ("EK", "UAE", "Emirates"),
+]
+
+AIRCRAFT = [
+    ("B738", "Boeing 737-8H4"),
+    ("A320", "Airbus A320-214"),
+    ("B77W", "Boeing 777-300ER"),
+    ("A388", "Airbus A380-861"),
+    ("E75L", "Embraer E175LR"),
+]
+
+
+# -----------------------------
+# Latency / fault models
+# -----------------------------
+def parse_latency(spec):
+    """
+    "0" | "fixed:MS" | "uniform:LO,HI" | "normal:MEAN,SD" | "lognormal:MEDIAN,SIGMA"
+    Returns a function giving a delay in seconds.
+    """
+    if not spec or spec == "0":
+        return lambda rng: 0.0
+
+    kind, _, args = spec.partition(":")
+    vals = [float(v) for v in args.split(",") if v.strip()] if args else []
+
+    if kind == "fixed" and len(vals) == 1:
+        return lambda rng: vals[0] / 1000.0
+    if kind == "uniform" and len(vals) == 2:
+        return lambda rng: rng.uniform(vals[0], vals[1]) / 1000.0
+    if kind == "normal" and len(vals) == 2:
+        return lambda rng: max(0.0, rng.gauss(vals[0], vals[1])) / 1000.0
+    if kind == "lognormal" and len(vals) == 2:
+        mu = math.log(max(vals[0], 0.001))
+        return lambda rng: rng.lognormvariate(mu, vals[1]) / 1000.0
+
+    raise ValueError(f"bad latency spec {spec!r}")
+
+
+# Codes a "5xx" outcome fails with (520 is what Cloudflare sends)
+SERVER_ERRORS = (500, 502, 503, 520)
+
+
+class Faults:
+    def __init__(self, latency="0", rate_429=0.0, rate_5xx=0.0, drop=0.0, seed=None):
+        self.latency = parse_latency(latency)
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.drop = drop
+        self._rng = random.Random(seed)
+        self._lock = Lock()
+
+    def roll(self):
+        """
+        Pick (delay_seconds, outcome, status) for one request: outcome is "ok", "429",
+        "5xx" or "drop", status the HTTP code to fail with (None for "ok" and "drop").
+        """
+        with self._lock:
+            delay = self.latency(self._rng)
+            r = self._rng.random()
+            if r < self.drop:
+                return delay, "drop", None
+            r -= self.drop
+            if r < self.rate_429:
+                return delay, "429", 429
+            r -= self.rate_429
+            if r < self.rate_5xx:
+                # Same seeded rng, so a --seed run picks the same codes too
+                return delay, "5xx", self._rng.choice(SERVER_ERRORS)
+        return delay, "ok", None
+
+
+# -----------------------------
+# Data sources
+# -----------------------------
+def _parse_bounds(raw):
+    """FR24 bounds are "tl_y,br_y,tl_x,br_x" (commas may arrive as %2C)."""
+    try:
+        tl_y, br_y, tl_x, br_x = (float(v) for v in unquote(raw).split(","))
+        return tl_y, br_y, tl_x, br_x
+    except Exception:
+        return None
+
+
+class SyntheticSky:
+    """
+    N deterministic flights that drift across the requested bounds over time,
+    so consecutive polls see moving aircraft, arrivals and departures.
+    """
+
+    def __init__(self, count=20, seed=1):
+        rng = random.Random(seed)
+        self.started = time.time()
+        self.flights = []
+        for i in range(count):
+            origin, dest = rng.sample(AIRPORTS, 2)
+            airline = rng.choice(AIRLINES)
+            model = rng.choice(AIRCRAFT)
+            number = rng.randint(10, 9999)
+            self.flights.append({
+                "id": f"{0x3a000000 + i * 7919:x}",
+                "icao24": f"{rng.randrange(0x1000000):06X}",
+                "fx": rng.random(),
+                "fy": rng.random(),
+                "heading": rng.randrange(360),
+                "altitude": rng.choice((3500, 8000, 12000, 24000, 31000, 35000, 39000)),
+                "speed": rng.randint(180, 520),
+                "vspeed": rng.choice((0, 0, 0, 640, -832, 1216)),
+                "origin": origin,
+                "destination": dest,
+                "airline": airline,
+                "model": model,
+                "number": f"{airline[0]}{number}",
+                "callsign": f"{airline[1]}{number}",
+                "registration": f"N{rng.randint(100, 999)}{rng.choice('ABCDEFGHJK')}{rng.choice('ABCDEFGHJK')}",
+                "departed": int(self.started) - rng.randint(1200, 18000),
+            })
+        self._last = {}
+
+    def _position(self, f, bounds, now):
+        tl_y, br_y, tl_x, br_x = bounds
+        # Move ~1% of the box per 10s along the heading, wrapping at the edges
+        t = (now - self.started) / 1000.0
+        rad = math.radians(f["heading"])
+        fx = (f["fx"] + math.sin(rad) * t * f["speed"] / 500.0) % 1.0
+        fy = (f["fy"] + math.cos(rad) * t * f["speed"] / 500.0) % 1.0
+        lat = br_y + (tl_y - br_y) * fy
+        lon = tl_x + (br_x - tl_x) * fx
+        return round(lat, 4), round(lon, 4)
+
+    def feed(self, bounds):
+        if bounds is None:
+            bounds = (41.904318, 41.851654, -87.647367, -87.573027)
+        now = time.time()
+        body = {"full_count": len(self.flights), "version": 4}
+        for f in self.flights:
+            lat, lon = self._position(f, bounds, now)
+            self._last[f["id"]] = (lat, lon, int(now))
+            body[f["id"]] = [
+                f["icao24"], lat, lon, f["heading"], f["altitude"], f["speed"], "",
+                "F-STANDIN", f["model"][0], f["registration"], int(now),
+                f["origin"][0], f["destination"][0], f["number"], 0, f["vspeed"],
+                f["callsign"], 0, f["airline"][1],
+            ]
+        body["stats"] = {"total": {"ads-b": len(self.flights)}}
+        return body
+
+    @staticmethod
+    def _airport(a):
+        iata, icao, name, lat, lon = a
+        return {
+            "name": name,
+            "code": {"iata": iata, "icao": icao},
+            "position": {"latitude": lat, "longitude": lon, "altitude": 0},
+        }
+
+    def details(self, flight_id):
+        f = next((x for x in self.flights if x["id"] == flight_id), None)
+        if f is None:
+            return None
+        lat, lon, ts = self._last.get(flight_id, (0.0, 0.0, int(time.time())))
+        trail = []
+        for k in range(8):
+            trail.append({
+                "lat": lat, "lng": lon, "ts": ts - k * 8,
+                "alt": max(0, f["altitude"] - int(f["vspeed"] / 60 * 8 * k)),
+                "spd": f["speed"], "hd": f["heading"],
+            })
+        dep = f["departed"]
+        block = 3 * 3600
+        return {
+            "identification": {"id": flight_id, "number": {"default": f["number"]}, "callsign": f["callsign"]},
+            "aircraft": {
+                "model": {"code": f["model"][0], "text": f["model"][1]},
+                "registration": f["registration"],
+                "images": {"large": [{
+                    "src": "http://127.0.0.1/standin.jpg",
+                    "copyright": "stand-in",
+                    "source": "fr24_standin",
+                }]},
+            },
+            "airline": {"name": f["airline"][2], "code": {"iata": f["airline"][0], "icao": f["airline"][1]}},
+            "owner": {"name": f["airline"][2], "code": {"iata": f["airline"][0], "icao": f["airline"][1]}},
+            "airport": {
+                "origin": self._airport(f["origin"]),
+                "destination": self._airport(f["destination"]),
+            },
+            "time": {
+                "scheduled": {"departure": dep - 300, "arrival": dep + block},
+                "real": {"departure": dep, "arrival": None},
+                "estimated": {"departure": None, "arrival": dep + block + 240},
+            },
+            "trail": trail,
+        }
+
+
+class RecordedSky:
+    """Serve fixed bodies from a JSON file: {"feed": {...}, "details": {id: {...}}}."""
+
+    def __init__(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        self._feed = raw.get("feed", {})
+        self._details = raw.get("details", {})
+
+    def feed(self, bounds):
+        return self._feed
+
+    def details(self, flight_id):
+        return self._details.get(flight_id)
+
+
+# -----------------------------
+# HTTP
+# -----------------------------
+class Stats:
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.counts = {"feed": 0, "details": 0, "other": 0, "ok": 0, "429": 0, "5xx": 0, "drop": 0, "404": 0}
+        self.started = time.time()
+
+    def add(self, *keys):
+        with self._lock:
+            for k in keys:
+                self.counts[k] = self.counts.get(k, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            out = dict(self.counts)
+        out["uptime_s"] = round(time.time() - self.started, 1)
+        return out
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = "fr24-standin/1.0"
+    sky = None
+    faults = None
+    stats = None
+    quiet = True
+
+    def log_message(self, fmt, *args):
+        if not self.quiet:
+            sys.stderr.write("%s - %s\n" % (self.address_string(), fmt % args))
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            payload = gzip.compress(payload, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query, keep_blank_values=True)
+
+        if url.path == "/_stats":
+            return self._send_json(200, self.stats.snapshot())
+        if url.path == "/_reset":
+            self.stats.reset()
+            return self._send_json(200, {"ok": True})
+
+        if url.path == FEED_PATH:
+            endpoint = "feed"
+        elif url.path == DETAILS_PATH:
+            endpoint = "details"
+        else:
+            self.stats.add("other", "404")
+            return self._send_json(404, {"error": "not found"})
+
+        delay, outcome, status = self.faults.roll()
+        if delay:
+            time.sleep(delay)
+        self.stats.add(endpoint, outcome)
+
+        if outcome == "drop":
+            # Hang up without a response, like a reset mid-request
+            self.close_connection = True
+            try:
+                self.connection.shutdown(2)
+            except OSError:
+                pass
+            return
+        if outcome == "429":
+            self.send_response(status)
+            self.send_header("Retry-After", "5")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if outcome == "5xx":
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if endpoint == "feed":
+            bounds = _parse_bounds((query.get("bounds") or [""])[0])
+            return self._send_json(200, self.sky.feed(bounds))
+
+        flight_id = (query.get("flight") or [""])[0]
+        body = self.sky.details(flight_id)
+        if body is None:
+            self.stats.add("404")
+            return self._send_json(404, {"error": "unknown flight"})
+        return self._send_json(200, body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local FlightRadar24 stand-in with latency and error injection.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8024)
+    parser.add_argument("--flights", type=int, default=20, help="synthetic flight count")
+    parser.add_argument("--seed", type=int, default=1, help="seed for synthetic data and fault rolls")
+    parser.add_argument("--data", help="serve recorded responses from this JSON file instead")
+    parser.add_argument("--latency", default="0", help="0 | fixed:MS | uniform:LO,HI | normal:MEAN,SD | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="fraction answered 500/502/503/520")
+    parser.add_argument("--drop", type=float, default=0.0, help="fraction of connections dropped")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    StandInHandler.sky = RecordedSky(args.data) if args.data else SyntheticSky(args.flights, args.seed)
+    StandInHandler.faults = Faults(args.latency, args.rate_429, args.rate_5xx, args.drop, args.seed)
+    StandInHandler.stats = Stats()
+    StandInHandler.quiet = not args.verbose
+
+    server = ThreadingHTTPServer((args.host, args.port), StandInHandler)
+    server.daemon_threads = True
+    print(f"FR24 stand-in on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded FR24 trace (see utilities/fr24_trace.py) through the real
+Overhead._grab path, e.g. to profile grabs or re-check the closest/farthest
+leaderboards against a busy evening:
+
+    python3 scripts/replay_fr24_trace.py traces/fr24-20250610-180000.jsonl.gz --speed 0
+
+--speed 0 runs one grab per recorded listing as fast as possible; --speed N
+plays the trace at N x real time with the usual 30s poll interval.
+
+Log files, maps, the FR24 breaker status and debug captures are written to
+--out-dir instead of the live ones, the live flags/ folder is ignored, and
+emails, map uploads and logo downloads are switched off.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+POLL_SECONDS = 30
+
+
+def _sandbox(overhead_module, out_dir):
+    from setup import email_alerts
+    from utilities import debug_capture, fr24_breaker, fr24_trace
+    from web import map_generator, upload_helper
+
+    os.makedirs(os.path.join(out_dir, "maps"), exist_ok=True)
+    overhead_module.LOG_FILE = os.path.join(out_dir, "close.txt")
+    overhead_module.LOG_FILE_FARTHEST = os.path.join(out_dir, "farthest.txt")
+    overhead_module.LOG_FILE_RECENT = os.path.join(out_dir, "recent_flights.json")
+    map_generator.MAPS_DIR = os.path.join(out_dir, "maps")
+
+    # The live tracker's fr24_status.json backs /api/fr24; the replay's breaker reports here
+    fr24_breaker.STATUS_FILE = os.path.join(out_dir, "fr24_status.json")
+
+    # Flags from the live flags/ folder (fixture mode, trace recording, debug capture and
+    # dump requests meant for the tracker) must not steer or be consumed by a replay
+    flags_dir = os.path.join(out_dir, "flags")
+    overhead_module.FIXTURE_FLAG_FILE = os.path.join(flags_dir, "force_fixture.on")
+    fr24_trace.TRACE_FLAG_FILE = os.path.join(flags_dir, "record_fr24_trace.on")
+    fr24_trace.TRACE_DIR = os.path.join(out_dir, "traces")
+    debug_capture.FLAGS_DIR = flags_dir
+    debug_capture.CAPTURE_FLAG_FILE = os.path.join(flags_dir, "debug_capture.on")
+    debug_capture.DUMP_REQUEST_FILE = os.path.join(flags_dir, "debug_capture_dump.request")
+    debug_capture.CAPTURE_DIR = os.path.join(out_dir, "debug")
+    debug_capture.CAPTURE_FILE = os.path.join(debug_capture.CAPTURE_DIR, "captures.jsonl.gz")
+
+    email_alerts.send_flight_summary = lambda *a, **k: None
+    upload_helper.upload_map_to_server = lambda path: path
+    overhead_module.Overhead._cache_airline_logo = lambda self, *a, **k: None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an FR24 trace through Overhead.")
+    parser.add_argument("trace", help="path to a fr24-*.jsonl.gz trace")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = as fast as possible, N = N x real time")
+    parser.add_argument("--out-dir", default="replay_output", help="where logs and maps are written")
+    args = parser.parse_args()
+
+    from utilities import fr24_breaker, overhead
+    from utilities.fr24_trace import ReplayAPI
+
+    _sandbox(overhead, args.out_dir)
+
+    api = ReplayAPI(args.trace, speed=args.speed)
+    delay = 0 if args.speed <= 0 else overhead.RATE_LIMIT_DELAY / args.speed
+    breaker = fr24_breaker.CircuitBreaker(status_file=fr24_breaker.STATUS_FILE)
+    o = overhead.Overhead(api=api, rate_limit_delay=delay, breaker=breaker)
+
+    grabs = 0
+    grab_times = []
+    started = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        o._grab()
+        grab_times.append(time.perf_counter() - t0)
+        grabs += 1
+        if api.finished:
+            break
+        if args.speed > 0:
+            time.sleep(max(0.0, POLL_SECONDS / args.speed - grab_times[-1]))
+    elapsed = time.perf_counter() - started
+
+    grab_times.sort()
+    print(f"{grabs} grabs in {elapsed:.2f}s "
+          f"(mean {1000 * sum(grab_times) / grabs:.1f} ms, max {1000 * grab_times[-1]:.1f} ms)")
+
+    for label, path in (("Closest", overhead.LOG_FILE), ("Farthest", overhead.LOG_FILE_FARTHEST)):
+        entries = overhead.safe_load_json(path)
+        print(f"\n{label}:")
+        for i, e in enumerate(entries, 1):
+            extra = f" {e.get('reason')} {e.get('farthest_value', 0):.0f}" if label == "Farthest" else ""
+            print(f"  {i}. {e.get('callsign')} {e.get('origin')}->{e.get('destination')} "
+                  f"{e.get('distance', 0):.2f}{extra}")
+
+    with open(os.path.join(args.out_dir, "replay_summary.json"), "w", encoding="utf-8") as f:
+        json.dump({"trace": args.trace, "speed": args.speed, "grabs": grabs, "seconds": round(elapsed, 3)}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
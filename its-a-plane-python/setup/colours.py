@@ -1,4 +1,4 @@
-from rgbmatrix import graphics
+from setup.matrix import graphics
 
 # Colour helpers from lightest to darkest
 
@@ -1,21 +1,25 @@
 import os
-from rgbmatrix import graphics
+from setup.matrix import graphics
 
 # Fonts
 DIR_PATH = os.path.dirname(os.path.realpath(__file__))
-extrasmall = graphics.Font()
-small = graphics.Font()
-regular = graphics.Font()
-regular_bold = graphics.Font()
-regularplus = graphics.Font()
-regularplus_bold = graphics.Font()
-large = graphics.Font()
-large_bold = graphics.Font()
-extrasmall.LoadFont(f"{DIR_PATH}/../fonts/4x6.bdf")
-small.LoadFont(f"{DIR_PATH}/../fonts/5x8.bdf")
-regular.LoadFont(f"{DIR_PATH}/../fonts/6x13.bdf")
-regular_bold.LoadFont(f"{DIR_PATH}/../fonts/6x13B.bdf")
-regularplus.LoadFont(f"{DIR_PATH}/../fonts/7x13.bdf")
-regularplus_bold.LoadFont(f"{DIR_PATH}/../fonts/7x13B.bdf")
-large.LoadFont(f"{DIR_PATH}/../fonts/8x13.bdf")
-large_bold.LoadFont(f"{DIR_PATH}/../fonts/8x13B.bdf")
+
+# id(font) -> BDF path, so software renderers (compositor) can rasterise the same glyphs
+FONT_FILES = {}
+
+
+def _load(path):
+    font = graphics.Font()
+    font.LoadFont(path)
+    FONT_FILES[id(font)] = path
+    return font
+
+
+extrasmall = _load(f"{DIR_PATH}/../fonts/4x6.bdf")
+small = _load(f"{DIR_PATH}/../fonts/5x8.bdf")
+regular = _load(f"{DIR_PATH}/../fonts/6x13.bdf")
+regular_bold = _load(f"{DIR_PATH}/../fonts/6x13B.bdf")
+regularplus = _load(f"{DIR_PATH}/../fonts/7x13.bdf")
+regularplus_bold = _load(f"{DIR_PATH}/../fonts/7x13B.bdf")
+large = _load(f"{DIR_PATH}/../fonts/8x13.bdf")
+large_bold = _load(f"{DIR_PATH}/../fonts/8x13B.bdf")
@@ -0,0 +1,17 @@
+import os
+
+# Which matrix driver to use: "hardware" (rgbmatrix, needs the HAT) or
+# "virtual" (virtualmatrix, NumPy only). PLANE_TRACKER_MATRIX overrides config.
+try:
+    from config import MATRIX_BACKEND
+except (ImportError, ModuleNotFoundError, NameError):
+    MATRIX_BACKEND = "hardware"
+
+BACKEND = (os.environ.get("PLANE_TRACKER_MATRIX") or MATRIX_BACKEND or "hardware").strip().lower()
+
+if BACKEND == "virtual":
+    from virtualmatrix import graphics
+    from virtualmatrix import RGBMatrix, RGBMatrixOptions
+else:
+    from rgbmatrix import graphics
+    from rgbmatrix import RGBMatrix, RGBMatrixOptions
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the tracker's modules the way its scripts do: from the project root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
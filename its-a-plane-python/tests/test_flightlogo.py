@@ -0,0 +1,133 @@
+"""FlightLogoScene logo lookup: background loading, negative cache entries and the default logo."""
+import os
+import threading
+
+os.environ.setdefault("PLANE_TRACKER_MATRIX", "virtual")
+
+import pytest
+from PIL import Image
+
+from scenes import flightlogo
+from utilities import image_cache, logo_atlas
+
+
+class Scene(flightlogo.FlightLogoScene):
+    """Just enough of Display to run the logo keyframe."""
+
+    def __init__(self, cache):
+        super().__init__()
+        self._logo_cache = cache
+        self._data = []
+        self._data_index = 0
+        self.drawn = []
+
+    def draw_square(self, *args):
+        pass
+
+    def set_image(self, img, x, y):
+        self.drawn.append(img)
+
+
+def loaded(scene):
+    """Wait for the background loads queued so far (the loader is a single FIFO thread)."""
+    if scene._logo_loader is not None:
+        scene._logo_loader.submit(lambda: None).result(timeout=5)
+
+
+def write_logo(name, colour):
+    Image.new("RGB", (32, 32), colour).save(os.path.join("logos", f"{name}.png"))
+
+
+@pytest.fixture(autouse=True)
+def logos_dir(tmp_path, monkeypatch):
+    # Logos are looked up relative to the working directory; no atlas here
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("logos")
+    monkeypatch.setattr(logo_atlas, "shared", lambda: None)
+    write_logo(flightlogo.DEFAULT_IMAGE, "white")
+
+
+def test_logo_is_decoded_off_the_calling_thread(monkeypatch):
+    threads = []
+    load = flightlogo._load_logo_file
+
+    def recording_load(icao):
+        threads.append(threading.current_thread())
+        return load(icao)
+
+    monkeypatch.setattr(flightlogo, "_load_logo_file", recording_load)
+    write_logo("XYZ", "red")
+    scene = Scene(image_cache.ImageCache())
+
+    assert scene._get_logo("XYZ") is None
+    loaded(scene)
+    img = scene._get_logo("XYZ")
+    assert img.size == (16, 16)
+    assert img.getpixel((0, 0)) == (255, 0, 0)
+    assert threads and threading.current_thread() not in threads
+
+
+def test_pending_logo_is_queued_once(monkeypatch):
+    gate = threading.Event()
+    calls = []
+
+    def slow_load(icao):
+        calls.append(icao)
+        gate.wait(5)
+        return None
+
+    monkeypatch.setattr(flightlogo, "_load_logo_file", slow_load)
+    scene = Scene(image_cache.ImageCache())
+    for _ in range(5):
+        assert scene._get_logo("XYZ") is None
+    gate.set()
+    loaded(scene)
+    assert calls == ["XYZ"]
+
+
+def test_missing_logo_is_a_negative_entry():
+    cache = image_cache.ImageCache()
+    scene = Scene(cache)
+    assert scene._get_logo("XYZ") is None
+    loaded(scene)
+    assert cache.lookup(("logo", "XYZ")) == (True, None)
+    assert cache.stats()["negative_entries"] == 1
+
+    scene._logo_or_default("XYZ")
+    loaded(scene)
+    default = scene._logo_or_default("XYZ")
+    assert default.getpixel((0, 0)) == (255, 255, 255)
+    assert cache.lookup(("logo", flightlogo.DEFAULT_IMAGE)) == (True, default)
+
+
+def test_logo_downloaded_later_is_found_once_the_negative_entry_expires():
+    cache = image_cache.ImageCache(negative_ttl=0)
+    scene = Scene(cache)
+    assert scene._get_logo("XYZ") is None
+    loaded(scene)
+
+    write_logo("XYZ", "red")
+    assert scene._get_logo("XYZ") is None
+    loaded(scene)
+    img = scene._get_logo("XYZ")
+    assert img.size == (16, 16)
+    assert img.getpixel((0, 0)) == (255, 0, 0)
+
+
+def test_scene_shows_the_default_until_the_logo_is_ready():
+    scene = Scene(image_cache.ImageCache(negative_ttl=0))
+    scene._data = [{"owner_icao": "XYZ"}]
+
+    # Nothing decoded yet: nothing to draw, and the frame doesn't wait
+    scene.logo_details(0)
+    assert scene.drawn == []
+    loaded(scene)
+    scene.logo_details(1)
+    scene.logo_details(2)
+    assert [img.getpixel((0, 0)) for img in scene.drawn] == [(255, 255, 255)]
+
+    write_logo("XYZ", "red")
+    scene.logo_details(3)
+    loaded(scene)
+    scene.logo_details(4)
+    assert scene.drawn[-1].getpixel((0, 0)) == (255, 0, 0)
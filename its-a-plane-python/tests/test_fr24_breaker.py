@@ -0,0 +1,172 @@
+import pytest
+import requests
+from requests.exceptions import ConnectionError, HTTPError, ReadTimeout
+
+from utilities import fr24_breaker as fb
+
+
+def http_error(status, headers=None):
+    response = requests.models.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return HTTPError(response=response)
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    # Open durations at their full (un-jittered) length so they can be asserted exactly
+    monkeypatch.setattr(fb, "_jitter", lambda delay: delay)
+
+
+def breaker(**kwargs):
+    kwargs.setdefault("failures", 3)
+    kwargs.setdefault("reset_base", 30)
+    kwargs.setdefault("reset_max", 900)
+    return fb.CircuitBreaker(status_file=None, **kwargs)
+
+
+def fail(b, error, now):
+    b.before_call(now=now)
+    return b.record_failure(error, now=now)
+
+
+@pytest.mark.parametrize("error, kind", [
+    (http_error(429), "throttled"),
+    (http_error(403), "forbidden"),
+    (http_error(502), "server"),
+    (http_error(404), "client"),
+    (ReadTimeout(), "timeout"),
+    (ConnectionError(), "connection"),
+    (ValueError("bad json"), "other"),
+    (fb.CircuitOpenError(0), "open"),
+])
+def test_classify(error, kind):
+    assert fb.classify(error) == kind
+
+
+def test_opens_after_consecutive_failures():
+    b = breaker()
+    fail(b, ConnectionError(), now=0)
+    fail(b, ReadTimeout(), now=1)
+    assert b.state == fb.CLOSED
+    fail(b, http_error(503), now=2)
+    assert b.state == fb.OPEN
+    assert b.open_until == 32
+
+    with pytest.raises(fb.CircuitOpenError):
+        b.before_call(now=10)
+    assert not b.allow(now=10)
+    assert b.status()["rejected"] == 1
+
+
+def test_success_resets_the_failure_count():
+    b = breaker()
+    fail(b, ConnectionError(), now=0)
+    fail(b, ConnectionError(), now=1)
+    b.before_call(now=2)
+    b.record_success(now=2)
+    fail(b, ConnectionError(), now=3)
+    fail(b, ConnectionError(), now=4)
+    assert b.state == fb.CLOSED
+
+
+@pytest.mark.parametrize("status", [429, 403])
+def test_single_throttle_opens_immediately(status):
+    b = breaker()
+    fail(b, http_error(status), now=100)
+    assert b.state == fb.OPEN
+    assert b.open_until == 130
+
+
+def test_retry_after_is_a_floor():
+    b = breaker()
+    fail(b, http_error(429, {"Retry-After": "120"}), now=0)
+    assert b.open_until == 120
+
+    # Shorter than the backoff: the backoff wins
+    b = breaker()
+    fail(b, http_error(429, {"Retry-After": "5"}), now=0)
+    assert b.open_until == 30
+
+
+def test_open_time_doubles_per_trip_up_to_max():
+    b = breaker(reset_base=30, reset_max=100)
+    now = 0
+    opened_for = []
+    for _ in range(4):
+        fail(b, http_error(429), now=now)  # closed -> open, or a failed half-open trial
+        opened_for.append(b.open_until - now)
+        now = b.open_until
+    assert opened_for == [30, 60, 100, 100]
+
+
+def test_half_open_lets_one_trial_through():
+    b = breaker()
+    fail(b, http_error(429), now=0)
+    assert b.allow(now=30)
+
+    b.before_call(now=30)
+    assert b.state == fb.HALF_OPEN
+    assert not b.allow(now=30)
+    with pytest.raises(fb.CircuitOpenError):
+        b.before_call(now=31)
+
+
+def test_half_open_success_closes_and_resets_backoff():
+    b = breaker()
+    fail(b, http_error(429), now=0)
+    b.before_call(now=30)
+    b.record_success(now=31)
+    assert b.state == fb.CLOSED
+    assert b.open_until is None
+
+    fail(b, http_error(429), now=40)
+    assert b.open_until == 70
+
+
+def test_half_open_failure_reopens_for_longer():
+    b = breaker()
+    fail(b, http_error(429), now=0)
+    fail(b, ReadTimeout(), now=30)
+    assert b.state == fb.OPEN
+    assert b.open_until == 90
+
+
+@pytest.mark.parametrize("error", [http_error(404), ValueError("bad json")])
+def test_client_and_parse_errors_do_not_count(error):
+    b = breaker(failures=1)
+    for now in range(10):
+        assert fail(b, error, now=now) in ("client", "other")
+    assert b.state == fb.CLOSED
+    assert b.status()["consecutive_failures"] == 0
+
+
+def test_answer_during_half_open_closes():
+    # A 404 means FR24 answered, which is all the trial needs to show
+    b = breaker()
+    fail(b, http_error(429), now=0)
+    fail(b, http_error(404), now=30)
+    assert b.state == fb.CLOSED
+
+
+def test_guarded_api_counts_through_the_breaker():
+    class API:
+        calls = 0
+
+        def get_bounds(self, zone):
+            return "bounds"
+
+        def get_flights(self, **kwargs):
+            API.calls += 1
+            raise ConnectionError()
+
+    b = breaker(failures=2)
+    api = fb.GuardedAPI(API(), b)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            api.get_flights(bounds=api.get_bounds({}))
+    with pytest.raises(fb.CircuitOpenError):
+        api.get_flights(bounds="bounds")
+    assert API.calls == 2
+    # Zone-level fetching isn't wrapped, so zone_tiles tiles through get_flights
+    assert getattr(api, "get_zone_flights", None) is None
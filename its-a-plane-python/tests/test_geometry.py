@@ -0,0 +1,169 @@
+"""The NumPy paths of utilities/geometry.py against its plain-Python fallback."""
+import glob
+import json
+import math
+import os
+import random
+
+import pytest
+
+from utilities import geometry
+
+np = pytest.importorskip("numpy")
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+HOME = (41.882724, -87.623350)
+CORRIDOR = [[41.95, -87.70], [41.95, -87.60], [41.85, -87.55], [41.80, -87.62], [41.85, -87.65]]
+SQUARE = [[41.70, -87.80], [41.70, -87.75], [41.75, -87.75], [41.75, -87.80], [41.70, -87.80]]
+
+
+class Flight:
+    def __init__(self, latitude, longitude, altitude, heading=0, ground_speed=0):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude = altitude
+        self.heading = heading
+        self.ground_speed = ground_speed
+
+
+def fixture_flights():
+    flights = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "fixture_flights_*.json"))):
+        with open(path, encoding="utf-8") as f:
+            for e in json.load(f):
+                flights.append(Flight(
+                    e["plane_latitude"], e["plane_longitude"], e.get("altitude") or 0,
+                    e.get("heading") or 0, e.get("ground_speed") or 0,
+                ))
+    rng = random.Random(44)
+    for _ in range(300):
+        flights.append(Flight(
+            HOME[0] + rng.uniform(-0.5, 0.5),
+            HOME[1] + rng.uniform(-0.5, 0.5),
+            rng.choice([0, 1500, 2000, 35000, rng.uniform(0, 45000)]),
+            rng.uniform(0, 360),
+            rng.choice([0, rng.uniform(100, 500)]),
+        ))
+    # Same distance twice, to check nearest_k's tie-break
+    flights.append(Flight(HOME[0] + 0.01, HOME[1], 5000))
+    flights.append(Flight(HOME[0] + 0.01, HOME[1], 5000))
+    return flights
+
+
+@pytest.fixture
+def flights():
+    return fixture_flights()
+
+
+@pytest.fixture
+def both(monkeypatch):
+    """Run fn with NumPy and again with the fallback; returns (vectorised, fallback)."""
+    def run(fn):
+        vectorised = fn()
+        with monkeypatch.context() as m:
+            m.setattr(geometry, "np", None)
+            fallback = fn()
+        return vectorised, fallback
+    return run
+
+
+def close(a, b):
+    return np.allclose(np.asarray(a, dtype=float), np.asarray(b, dtype=float), rtol=1e-9, atol=1e-9)
+
+
+def columns(flights):
+    return geometry.flight_positions(flights)
+
+
+@pytest.mark.parametrize("metric", [False, True])
+def test_haversine(flights, both, metric):
+    v, f = both(lambda: geometry.haversine(*columns(flights)[:2], HOME[0], HOME[1], metric=metric))
+    assert close(v, f)
+
+
+def test_haversine_known_distance():
+    # One degree of latitude is R * pi / 180
+    assert math.isclose(float(geometry.haversine(41.0, -87.6, 42.0, -87.6)),
+                        geometry.EARTH_RADIUS_M * math.pi / 180, rel_tol=1e-12)
+
+
+@pytest.mark.parametrize("metric", [False, True])
+def test_slant_range(flights, both, metric):
+    def run():
+        lat, lon, alt = columns(flights)
+        return geometry.slant_range(geometry.haversine(lat, lon, HOME[0], HOME[1], metric=metric), alt, metric=metric)
+    v, f = both(run)
+    assert close(v, f)
+
+
+@pytest.mark.parametrize("metric, expected", [(False, 5.0), (True, 5.0 * geometry.KM_PER_MILE)])
+def test_slant_range_known_distance(both, metric, expected):
+    # 3 miles out at 4 miles up is 5 miles away
+    v, f = both(lambda: geometry.slant_range([3.0 * (geometry.KM_PER_MILE if metric else 1.0)],
+                                             [4 * geometry.FEET_PER_MILE], metric=metric))
+    assert close(v, [expected]) and close(f, [expected])
+
+
+def test_bearing_and_cardinal(flights, both):
+    def run():
+        lat, lon, _ = columns(flights)
+        bearing = geometry.initial_bearing(HOME[0], HOME[1], lat, lon)
+        return list(bearing), [str(c) for c in geometry.cardinal(bearing)]
+    (vb, vc), (fb, fc) = both(run)
+    assert close(vb, fb)
+    assert vc == fc
+
+
+def test_cardinal_boundaries(both):
+    degrees = [0.0, 22.4, 22.5, 67.5, 180.0, 337.4, 337.5, 359.9]
+    v, f = both(lambda: [str(c) for c in geometry.cardinal(degrees)])
+    assert v == f == ["N", "N", "NE", "E", "S", "NW", "N", "N"]
+
+
+def test_in_range(flights, both):
+    v, f = both(lambda: list(geometry.in_range(columns(flights)[2], 2000, 100000)))
+    assert v == f
+    assert all(2000 < flights[i].altitude < 100000 for i in v)
+
+
+@pytest.mark.parametrize("polygons", [[CORRIDOR], [CORRIDOR, SQUARE]])
+def test_points_in_polygons(flights, both, polygons):
+    v, f = both(lambda: list(geometry.in_polygons(*columns(flights)[:2], polygons)))
+    assert v == f
+    assert 0 < len(v) < len(flights)
+
+
+def test_nearest_k(flights, both):
+    def run():
+        lat, lon, _ = columns(flights)
+        distances = geometry.haversine(lat, lon, HOME[0], HOME[1])
+        return geometry.nearest_k(distances, 5), list(distances)
+    (v, distances), (f, _) = both(run)
+    assert v == f
+    # Nearest first, ties in listing order, same as a stable sort
+    assert v == sorted(range(len(distances)), key=distances.__getitem__)[:5]
+
+
+def test_nearest_k_short_listing(both):
+    v, f = both(lambda: geometry.nearest_k([3.0, 1.0], 5))
+    assert v == f == [1, 0]
+
+
+def test_closest_approach(flights, both):
+    def run():
+        lat, lon, _ = columns(flights)
+        heading, speed = geometry.flight_velocities(flights)
+        return geometry.closest_approach(lat, lon, heading, speed, HOME[0], HOME[1], 120)
+    (vd, vt), (fd, ft) = both(run)
+    assert close(vd, fd)
+    assert close(vt, ft)
+
+
+def test_destination(flights, both):
+    def run():
+        lat, lon, _ = columns(flights)
+        heading, speed = geometry.flight_velocities(flights)
+        return geometry.destination(lat, lon, heading, [s / 60 for s in speed])
+    (vlat, vlon), (flat, flon) = both(run)
+    assert close(vlat, flat)
+    assert close(vlon, flon)
@@ -0,0 +1,80 @@
+import pytest
+
+from utilities import poll_scheduler as ps
+
+NOW = 10_000.0
+BUSY = ps.POLL_BUSY_FLIGHTS
+NEAR = ps.POLL_APPROACH_DISTANCE
+
+
+def scheduler(**kwargs):
+    kwargs.setdefault("interval", 30)
+    kwargs.setdefault("floor", 15)
+    kwargs.setdefault("ceiling", 300)
+    kwargs.setdefault("screen_off_interval", 0)
+    s = ps.PollScheduler(status_file=None, **kwargs)
+    s.polled(now=NOW)
+    return s
+
+
+@pytest.mark.parametrize("traffic, state, interval, reasons", [
+    ({}, {}, 30, ["default"]),
+    ({"flights": 3}, {}, 30, ["default"]),
+    ({"flights": 0}, {}, 60, ["empty sky x2"]),
+    ({"flights": BUSY}, {}, 15, [f"{BUSY} flights x0.5"]),
+    ({"flights": 3}, {"night": True}, 60, ["night x2"]),
+    ({"flights": 0}, {"night": True}, 120, ["night x2", "empty sky x2"]),
+    ({"flights": 3, "throttled_at": NOW - 60}, {}, 120, ["throttled x4"]),
+    # Throttling long enough ago no longer counts
+    ({"flights": 3, "throttled_at": NOW - ps.POLL_THROTTLE_WINDOW - 1}, {}, 30, ["default"]),
+    # A close pass in 20 s pulls the next grab in; a far one doesn't
+    ({"flights": 3, "time": NOW, "approaches": [(NEAR / 2, 20.0)]}, {}, 20, ["approach in 20s"]),
+    ({"flights": 3, "time": NOW, "approaches": [(NEAR * 2, 20.0)]}, {}, 30, ["default"]),
+    # Circuit breaker open for another 90 s
+    ({"flights": 3, "retry_at": NOW + 90}, {}, 90, ["FR24 circuit open"]),
+    # Clamped: never below the floor, never above the ceiling
+    ({"flights": BUSY, "time": NOW, "approaches": [(0.0, 2.0)]}, {}, 15, [f"{BUSY} flights x0.5", "approach in 2s"]),
+    ({"flights": 0, "throttled_at": NOW}, {"night": True}, 300, ["throttled x4", "night x2", "empty sky x2"]),
+    ({"flights": 3, "retry_at": NOW + 3600}, {}, 300, ["FR24 circuit open"]),
+])
+def test_interval(traffic, state, interval, reasons):
+    s = scheduler()
+    assert s.update(traffic, now=NOW + 1, **state) == interval
+    assert s.reasons == reasons
+
+
+def test_screen_off_stops_polling():
+    s = scheduler()
+    assert s.update({"flights": BUSY}, screen_on=False, now=NOW + 1) is None
+    assert not s.due(now=NOW + 10_000)
+
+    # Back on: due again once the interval has passed
+    s.update({"flights": 3}, screen_on=True, now=NOW + 10_000)
+    assert s.due(now=NOW + 10_000)
+
+
+@pytest.mark.parametrize("screen_off_interval, interval", [(120, 120), (5, 15), (1000, 300)])
+def test_screen_off_polling_is_opt_in_and_clamped(screen_off_interval, interval):
+    s = scheduler(screen_off_interval=screen_off_interval)
+    assert s.update({}, screen_on=False, now=NOW + 1) == interval
+    assert s.reasons == ["screen off"]
+
+
+def test_screen_off_default_is_no_polling():
+    try:
+        import config
+        configured = hasattr(config, "POLL_INTERVAL_SCREEN_OFF")
+    except ImportError:
+        configured = False
+    if configured:
+        pytest.skip("POLL_INTERVAL_SCREEN_OFF set in config.py")
+    assert ps.POLL_INTERVAL_SCREEN_OFF == 0
+
+
+def test_due():
+    s = scheduler()
+    s.update({"flights": 3}, now=NOW)
+    assert not s.due(now=NOW + 29)
+    assert s.due(now=NOW + 30)
+    s.polled(now=NOW + 30)
+    assert not s.due(now=NOW + 31)
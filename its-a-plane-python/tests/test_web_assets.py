@@ -0,0 +1,60 @@
+"""Cache headers for versioned /logos/ URLs."""
+import os
+
+import pytest
+
+from web import app as web_app
+from web import static_cache
+from web.logo_index import LogoIndex
+
+
+@pytest.fixture
+def logos(tmp_path, monkeypatch):
+    monkeypatch.setattr(web_app, "logo_index", LogoIndex([str(tmp_path)], check_seconds=3600))
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    return web_app.app.test_client()
+
+
+def write(path, content, mtime_ns):
+    with open(path, "wb") as f:
+        f.write(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_versioned_logo_is_immutable(logos, client):
+    write(logos / "ABC--web.png", b"first", 1_000_000_000_000_000_000)
+    url = web_app.airline_logo_url({"owner_icao": "ABC"})
+    assert url.startswith("/logos/ABC--web.png?v=")
+
+    resp = client.get(url)
+    assert resp.data == b"first"
+    assert resp.headers["Cache-Control"] == web_app.IMMUTABLE_CACHE
+
+
+def test_logo_overwritten_in_place_is_not_immutable_under_its_old_version(logos, client):
+    path = logos / "ABC--web.png"
+    write(path, b"first", 1_000_000_000_000_000_000)
+    old_url = web_app.airline_logo_url({"owner_icao": "ABC"})
+    dir_mtime = os.stat(logos).st_mtime_ns
+
+    # Same name, new bytes; the directory (and so the index) doesn't change
+    write(path, b"second", 1_000_000_005_000_000_000)
+    assert os.stat(logos).st_mtime_ns == dir_mtime
+    assert web_app.airline_logo_url({"owner_icao": "ABC"}) == old_url
+
+    resp = client.get(old_url)
+    assert resp.data == b"second"
+    assert resp.headers["Cache-Control"] == "no-cache"
+
+    resp = client.get(f"/logos/ABC--web.png?v={static_cache.asset_version(str(path))}")
+    assert resp.headers["Cache-Control"] == web_app.IMMUTABLE_CACHE
+
+
+def test_unversioned_logo_revalidates(logos, client):
+    write(logos / "ABC--web.png", b"first", 1_000_000_000_000_000_000)
+    resp = client.get("/logos/ABC--web.png")
+    assert resp.headers["Cache-Control"] == "no-cache"
@@ -0,0 +1,148 @@
+"""Splitting a tracking zone into tiles and merging the tile listings."""
+import pytest
+
+from utilities import zone_tiles
+
+ZONE = {"tl_y": 42.5, "tl_x": -88.5, "br_y": 41.2, "br_x": -86.9}
+
+
+class Flight:
+    def __init__(self, id, time=None):
+        self.id = id
+        self.time = time
+
+
+class FakeAPI:
+    """get_flights keyed by tile; tiles listed in failing raise instead."""
+
+    def __init__(self, listings=None, failing=()):
+        self.listings = listings or {}
+        self.failing = set(failing)
+        self.requested = []
+
+    def get_bounds(self, zone):
+        return (zone["tl_y"], zone["tl_x"], zone["br_y"], zone["br_x"])
+
+    def get_flights(self, bounds):
+        self.requested.append(bounds)
+        if bounds in self.failing:
+            raise ConnectionError(f"tile {bounds} failed")
+        return list(self.listings.get(bounds, []))
+
+
+def area(tile):
+    return (tile["tl_y"] - tile["br_y"]) * (tile["br_x"] - tile["tl_x"])
+
+
+@pytest.mark.parametrize("span, count", [(1.0, 4), (0.5, 12), (0.25, 42), (2.0, 1)])
+def test_split_zone_covers_without_overlap(span, count):
+    tiles = zone_tiles.split_zone(ZONE, span)
+    assert len(tiles) == count
+    for t in tiles:
+        assert t["tl_y"] - t["br_y"] <= span + 1e-9
+        assert t["br_x"] - t["tl_x"] <= span + 1e-9
+        assert ZONE["br_y"] - 1e-9 <= t["br_y"] < t["tl_y"] <= ZONE["tl_y"] + 1e-9
+        assert ZONE["tl_x"] - 1e-9 <= t["tl_x"] < t["br_x"] <= ZONE["br_x"] + 1e-9
+    # Tiles inside the zone whose areas add up to the zone's can't overlap or leave gaps
+    assert sum(area(t) for t in tiles) == pytest.approx(area(ZONE))
+    for i, a in enumerate(tiles):
+        for b in tiles[i + 1:]:
+            overlap_y = min(a["tl_y"], b["tl_y"]) - max(a["br_y"], b["br_y"])
+            overlap_x = min(a["br_x"], b["br_x"]) - max(a["tl_x"], b["tl_x"])
+            assert overlap_y <= 1e-9 or overlap_x <= 1e-9
+
+
+def test_split_zone_edges_are_exact():
+    tiles = zone_tiles.split_zone(ZONE, 0.5)
+    assert max(t["tl_y"] for t in tiles) == ZONE["tl_y"]
+    assert min(t["br_y"] for t in tiles) == ZONE["br_y"]
+    assert min(t["tl_x"] for t in tiles) == ZONE["tl_x"]
+    assert max(t["br_x"] for t in tiles) == ZONE["br_x"]
+
+
+@pytest.mark.parametrize("span", [0, None, -1])
+def test_split_zone_without_span_is_one_tile(span):
+    assert zone_tiles.split_zone(ZONE, span) == [ZONE]
+
+
+def test_merge_flights_keeps_newest_position():
+    old, new = Flight("a", 100), Flight("a", 130)
+    older = Flight("a", 90)
+    b = Flight("b", 120)
+    no_time = Flight("c")
+    timed = Flight("c", 5)
+    merged = zone_tiles.merge_flights([[old, b, no_time], [new, timed], [older]])
+    by_id = {f.id: f for f in merged}
+    assert len(merged) == 3
+    assert by_id["a"] is new
+    assert by_id["b"] is b
+    assert by_id["c"] is timed
+
+
+def test_merge_flights_tie_keeps_first():
+    first, second = Flight("a", 100), Flight("a", 100)
+    assert zone_tiles.merge_flights([[first], [second]]) == [first]
+
+
+def test_fetch_tiles_merges_listings():
+    api = FakeAPI()
+    tiles = [api.get_bounds(t) for t in zone_tiles.split_zone(ZONE, 1.0)]
+    api.listings = {
+        tiles[0]: [Flight("a", 100), Flight("b", 100)],
+        # "b" sits on the edge between two tiles
+        tiles[1]: [Flight("b", 105), Flight("c", 100)],
+        tiles[3]: [Flight("d", 100)],
+    }
+    flights = zone_tiles.fetch_tiles(api, ZONE, span=1.0, workers=2)
+    assert sorted(api.requested) == sorted(tiles)
+    assert sorted((f.id, f.time) for f in flights) == [("a", 100), ("b", 105), ("c", 100), ("d", 100)]
+
+
+def test_fetch_tiles_uses_the_rest_when_one_tile_fails(capsys):
+    api = FakeAPI()
+    tiles = [api.get_bounds(t) for t in zone_tiles.split_zone(ZONE, 1.0)]
+    api.listings = {tiles[0]: [Flight("a", 1)], tiles[1]: [Flight("b", 1)], tiles[2]: [Flight("c", 1)]}
+    api.failing = {tiles[2]}
+    flights = zone_tiles.fetch_tiles(api, ZONE, span=1.0)
+    assert sorted(f.id for f in flights) == ["a", "b"]
+    assert "1 of 4 failed" in capsys.readouterr().out
+
+
+def test_fetch_tiles_raises_when_every_tile_fails():
+    api = FakeAPI()
+    api.failing = {api.get_bounds(t) for t in zone_tiles.split_zone(ZONE, 1.0)}
+    with pytest.raises(ConnectionError):
+        zone_tiles.fetch_tiles(api, ZONE, span=1.0)
+
+
+def test_fetch_tiles_single_tile_is_one_request():
+    api = FakeAPI()
+    bounds = api.get_bounds(ZONE)
+    api.listings = {bounds: [Flight("a", 1)]}
+    flights = zone_tiles.fetch_tiles(api, ZONE, span=5.0)
+    assert api.requested == [bounds]
+    assert [f.id for f in flights] == ["a"]
+
+
+def test_get_zone_flights_defers_to_api():
+    calls = []
+
+    class ZoneAPI(FakeAPI):
+        def get_zone_flights(self, zone, limiter=None):
+            calls.append((zone, limiter))
+            return ["recorded"]
+
+    limiter = zone_tiles.RateLimiter(0)
+    api = ZoneAPI()
+    assert zone_tiles.get_zone_flights(api, ZONE, limiter) == ["recorded"]
+    assert calls == [(ZONE, limiter)]
+    assert api.requested == []
+
+
+def test_default_span_tiles_a_metro_zone_but_not_the_home_box():
+    # ~10 miles corner to corner, like the example ZONE_HOME
+    home = {"tl_y": 41.93, "tl_x": -87.70, "br_y": 41.83, "br_x": -87.57}
+    # ~40 x 35 miles around a metro area
+    metro = {"tl_y": 42.15, "tl_x": -88.05, "br_y": 41.60, "br_x": -87.35}
+    assert len(zone_tiles.split_zone(home)) == 1
+    assert len(zone_tiles.split_zone(metro)) > 1
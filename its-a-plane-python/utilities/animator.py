@@ -91,46 +91,50 @@ class Animator(object):
     def reset_on_enable_tags_change(self):
         self._pending_reset = True
 
+    def step(self):
+        """Run one frame's worth of keyframes (play() calls this in a loop)."""
+        snapshot = None if self.enabled_tags is None else tuple(sorted(self.enabled_tags))
+        if snapshot != self._last_enabled_tags_snapshot:
+            self._last_enabled_tags_snapshot = snapshot
+            self._pending_reset = True
+
+        if self._pending_reset:
+            self.reset_scene()
+            self._pending_reset = False
+            for _, kf in self.keyframes:
+                kf.properties["count"] = 0
+
+        for _, keyframe in self.keyframes:
+            props = keyframe.properties
+
+            if not self._tag_allowed(props):
+                continue
+
+            if self._paused and not props.get("run_while_paused", False):
+                continue
+
+            if props["divisor"] == 0:
+                continue
+
+            d = props["divisor"]
+            o = props["offset"]
+            force_run = bool(getattr(self, "_force_run_keyframes", False))
+
+            should_run = d and ((self.frame - o) % d == 0)
+            if should_run or force_run:
+                if keyframe(props["count"]):
+                    props["count"] = 0
+                else:
+                    if should_run:
+                        props["count"] += 1
+
+        self.frame += 1
+        if getattr(self, "_force_run_keyframes", False):
+            self._force_run_keyframes = False
+
     def play(self):
         while True:
-            snapshot = None if self.enabled_tags is None else tuple(sorted(self.enabled_tags))
-            if snapshot != self._last_enabled_tags_snapshot:
-                self._last_enabled_tags_snapshot = snapshot
-                self._pending_reset = True
-
-            if self._pending_reset:
-                self.reset_scene()
-                self._pending_reset = False
-                for _, kf in self.keyframes:
-                    kf.properties["count"] = 0
-
-            for _, keyframe in self.keyframes:
-                props = keyframe.properties
-
-                if not self._tag_allowed(props):
-                    continue
-
-                if self._paused and not props.get("run_while_paused", False):
-                    continue
-
-                if props["divisor"] == 0:
-                    continue
-
-                d = props["divisor"]
-                o = props["offset"]
-                force_run = bool(getattr(self, "_force_run_keyframes", False))
-
-                should_run = d and ((self.frame - o) % d == 0)
-                if should_run or force_run:
-                    if keyframe(props["count"]):
-                        props["count"] = 0
-                    else:
-                        if should_run:
-                            props["count"] += 1
-
-            self.frame += 1
-            if getattr(self, "_force_run_keyframes", False):
-                self._force_run_keyframes = False
+            self.step()
             sleep(self._delay)
 
     @property
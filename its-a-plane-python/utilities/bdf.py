@@ -0,0 +1,119 @@
+import os
+from threading import Lock
+
+# Codepoint drawn when a glyph is missing (same fallback rgbmatrix uses)
+REPLACEMENT_CODEPOINT = 0xFFFD
+
+
+class Glyph(object):
+    """
+    One rasterised BDF glyph.
+
+    points holds the (dx, dy) offsets of every lit pixel, relative to the
+    pen position (x, baseline_y) that graphics.DrawText is called with.
+    """
+
+    __slots__ = ("dwidth", "points", "xs", "ys")
+
+    def __init__(self, dwidth, points):
+        self.dwidth = dwidth
+        self.points = points
+        # Filled lazily by renderers that want array form (numpy)
+        self.xs = None
+        self.ys = None
+
+
+class BdfFont(object):
+    """
+    Minimal BDF reader matching the rgbmatrix glyph placement:
+    a glyph's top row sits at baseline_y - height - y_offset.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.height = 0
+        self.baseline = 0
+        self.glyphs = {}
+        self._load(path)
+
+    def _load(self, path):
+        glyph_cp = None
+        dwidth = 0
+        bbx = (0, 0, 0, 0)
+        rows = None
+
+        with open(path, "r", encoding="latin-1") as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                key = parts[0]
+
+                if rows is not None:
+                    if key == "ENDCHAR":
+                        if glyph_cp is not None:
+                            self.glyphs[glyph_cp] = self._make_glyph(dwidth, bbx, rows)
+                        rows = None
+                        glyph_cp = None
+                    else:
+                        rows.append(parts[0])
+                    continue
+
+                if key == "FONTBOUNDINGBOX" and len(parts) >= 5:
+                    h = int(parts[2])
+                    y_off = int(parts[4])
+                    self.height = h
+                    self.baseline = h + y_off
+                elif key == "ENCODING":
+                    cp = int(parts[1])
+                    glyph_cp = cp if cp >= 0 else None
+                elif key == "DWIDTH":
+                    dwidth = int(parts[1])
+                elif key == "BBX" and len(parts) >= 5:
+                    bbx = tuple(int(v) for v in parts[1:5])
+                elif key == "BITMAP":
+                    rows = []
+
+    @staticmethod
+    def _make_glyph(dwidth, bbx, rows):
+        w, h, x_off, y_off = bbx
+        top = -h - y_off
+        points = []
+        for ry, row in enumerate(rows[:h]):
+            try:
+                bits = int(row, 16)
+            except ValueError:
+                continue
+            nbits = len(row) * 4
+            for bx in range(w):
+                if bits & (1 << (nbits - 1 - bx)):
+                    dx = bx + x_off
+                    # rgbmatrix never draws past the advance width
+                    if 0 <= dx < dwidth:
+                        points.append((dx, top + ry))
+        return Glyph(dwidth, tuple(points))
+
+    def glyph(self, codepoint):
+        g = self.glyphs.get(codepoint)
+        if g is None:
+            g = self.glyphs.get(REPLACEMENT_CODEPOINT)
+        return g
+
+    def character_width(self, codepoint):
+        g = self.glyph(codepoint)
+        return g.dwidth if g is not None else 0
+
+
+_fonts = {}
+_fonts_lock = Lock()
+
+
+def load(path):
+    """Parse a BDF file once per process and return the shared BdfFont."""
+    key = os.path.realpath(path)
+    with _fonts_lock:
+        font = _fonts.get(key)
+        if font is None:
+            font = BdfFont(key)
+            _fonts[key] = font
+        return font
@@ -0,0 +1,147 @@
+"""
+Debug capture of raw FR24 flight-details responses.
+
+The last DEBUG_CAPTURE_SIZE captures are always kept in memory (references
+only, nothing is serialized). They are written to disk only:
+
+- while flags/debug_capture.on exists: every capture is appended as it arrives
+- on demand: the web UI drops flags/debug_capture_dump.request and the next
+  grab appends whatever is in memory
+
+The file is gzip JSON lines at debug/captures.jsonl.gz, rotated to
+captures.jsonl.gz.1 .. .N once it passes DEBUG_CAPTURE_MAX_BYTES.
+"""
+import gzip
+import json
+import os
+import time
+from collections import deque
+from threading import Lock
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+FLAGS_DIR = os.path.join(BASE_DIR, "flags")
+CAPTURE_FLAG_FILE = os.path.join(FLAGS_DIR, "debug_capture.on")
+DUMP_REQUEST_FILE = os.path.join(FLAGS_DIR, "debug_capture_dump.request")
+CAPTURE_DIR = os.path.join(BASE_DIR, "debug")
+CAPTURE_FILE = os.path.join(CAPTURE_DIR, "captures.jsonl.gz")
+
+# Optional config values
+try:
+    from config import DEBUG_CAPTURE_SIZE
+except (ImportError, ModuleNotFoundError, NameError):
+    DEBUG_CAPTURE_SIZE = 20
+
+try:
+    from config import DEBUG_CAPTURE_MAX_BYTES
+except (ImportError, ModuleNotFoundError, NameError):
+    DEBUG_CAPTURE_MAX_BYTES = 512 * 1024
+
+try:
+    from config import DEBUG_CAPTURE_BACKUPS
+except (ImportError, ModuleNotFoundError, NameError):
+    DEBUG_CAPTURE_BACKUPS = 3
+
+
+def capture_enabled() -> bool:
+    return os.path.exists(CAPTURE_FLAG_FILE)
+
+
+def dump_requested() -> bool:
+    return os.path.exists(DUMP_REQUEST_FILE)
+
+
+def request_dump():
+    """Ask the tracker process to write its in-memory captures (used by the web app)."""
+    os.makedirs(FLAGS_DIR, exist_ok=True)
+    with open(DUMP_REQUEST_FILE, "w", encoding="utf-8") as f:
+        f.write(str(int(time.time())))
+
+
+def capture_files():
+    """Existing capture files, newest first: [{"name", "size", "modified"}]."""
+    out = []
+    names = [os.path.basename(CAPTURE_FILE)]
+    names += [f"{os.path.basename(CAPTURE_FILE)}.{i}" for i in range(1, DEBUG_CAPTURE_BACKUPS + 1)]
+    for name in names:
+        path = os.path.join(CAPTURE_DIR, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        out.append({"name": name, "size": st.st_size, "modified": int(st.st_mtime)})
+    return out
+
+
+class DebugCaptureStore:
+    def __init__(self, size=DEBUG_CAPTURE_SIZE, path=None,
+                 max_bytes=DEBUG_CAPTURE_MAX_BYTES, backups=DEBUG_CAPTURE_BACKUPS):
+        self.path = path or CAPTURE_FILE
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._ring = deque(maxlen=max(1, int(size)))
+        self._lock = Lock()
+        self._seq = 0
+        self._persisted_seq = 0
+
+    def add(self, kind, payload, **meta):
+        """Keep a capture in memory; also write it out if the capture flag is on."""
+        record = {"seq": 0, "t": round(time.time(), 3), "kind": kind}
+        record.update(meta)
+        record["payload"] = payload
+        with self._lock:
+            self._seq += 1
+            record["seq"] = self._seq
+            self._ring.append(record)
+        if capture_enabled():
+            self.persist()
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._ring)
+
+    def service(self):
+        """Handle a pending dump request from the web UI. Call once per grab."""
+        if not dump_requested():
+            return None
+        try:
+            os.remove(DUMP_REQUEST_FILE)
+        except OSError:
+            pass
+        return self.persist()
+
+    def persist(self):
+        """Append every in-memory capture not yet on disk. Returns the file path, or None."""
+        with self._lock:
+            pending = [r for r in self._ring if r["seq"] > self._persisted_seq]
+            if not pending:
+                return None
+            self._persisted_seq = pending[-1]["seq"]
+
+        try:
+            data = "".join(json.dumps(r, separators=(",", ":"), default=str) + "\n" for r in pending)
+            blob = gzip.compress(data.encode("utf-8"), compresslevel=6)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._rotate_if_needed(len(blob))
+            # Concatenated gzip members read back as one stream
+            with open(self.path, "ab") as f:
+                f.write(blob)
+            return self.path
+        except Exception as e:
+            print("Failed to write debug capture:", e)
+            return None
+
+    def _rotate_if_needed(self, incoming):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
@@ -0,0 +1,310 @@
+"""
+Circuit breaker and retry backoff for the FlightRadar24 client.
+
+Every FR24 request Overhead makes goes through GuardedAPI, which asks a
+CircuitBreaker first:
+
+- closed: requests go through. BREAKER_FAILURES failures in a row (timeouts,
+  connection errors, 5xx), or a single 429/403, open the circuit.
+- open: requests fail at once with CircuitOpenError, without touching the
+  network, for BREAKER_RESET_BASE seconds doubling on each trip up to
+  BREAKER_RESET_MAX (jittered, and at least the server's Retry-After).
+- half_open: once that passes, one trial request is let through. Success
+  closes the circuit, failure opens it again for longer.
+
+Other 4xx (a flight that has gone away) and parse errors mean FR24 answered,
+so they don't count against it.
+
+Counters and state go to fr24_status.json on every state change and after
+each grab, for the web app's /api/fr24. The display shows API DOWN while
+the circuit isn't closed.
+"""
+import json
+import os
+import random
+import socket
+import time
+from threading import Lock
+
+from FlightRadar24.errors import CloudflareError
+from requests.exceptions import ConnectionError, RequestException, Timeout
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+STATUS_FILE = os.path.join(BASE_DIR, "fr24_status.json")
+
+# Optional config values
+try:
+    from config import BREAKER_FAILURES
+except (ImportError, ModuleNotFoundError, NameError):
+    BREAKER_FAILURES = 3
+
+try:
+    from config import BREAKER_RESET_BASE
+except (ImportError, ModuleNotFoundError, NameError):
+    BREAKER_RESET_BASE = 30
+
+try:
+    from config import BREAKER_RESET_MAX
+except (ImportError, ModuleNotFoundError, NameError):
+    BREAKER_RESET_MAX = 900
+
+# Backoff between retries of one detail lookup
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_MAX = 8.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Failures that say FR24 (or the way to it) is in trouble
+TRIPPING = ("throttled", "forbidden", "server", "timeout", "connection")
+# Worth trying again after a backoff
+RETRYABLE = ("server", "timeout", "connection")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while the circuit is open."""
+
+    def __init__(self, retry_at):
+        super().__init__(f"FR24 circuit open for another {max(0.0, retry_at - time.time()):.0f}s")
+        self.retry_at = retry_at
+
+
+# Everything a grab should treat as "FR24 is unavailable right now"
+UNAVAILABLE_ERRORS = (RequestException, NewConnectionError, MaxRetryError, CloudflareError, CircuitOpenError)
+
+
+def classify(error):
+    """throttled, forbidden, server, client, timeout, connection, open or other."""
+    if isinstance(error, CircuitOpenError):
+        return "open"
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status == 429:
+        return "throttled"
+    if status in (401, 402, 403):
+        return "forbidden"
+    if isinstance(error, CloudflareError) or (status is not None and status >= 500):
+        return "server"
+    if status is not None and status >= 400:
+        return "client"
+    if isinstance(error, (Timeout, socket.timeout, TimeoutError)):
+        return "timeout"
+    if isinstance(error, (ConnectionError, NewConnectionError, MaxRetryError, ConnectionRefusedError)):
+        return "connection"
+    return "other"
+
+
+def retryable(error):
+    return classify(error) in RETRYABLE
+
+
+def throttled(error):
+    """FR24 telling us to slow down (429, or 403 for too many requests)."""
+    return classify(error) in ("throttled", "forbidden")
+
+
+def _jitter(delay):
+    # "Equal jitter": half fixed, half random, so retries spread out but never collapse to 0
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def backoff(attempt, base=RETRY_BACKOFF_BASE, cap=RETRY_BACKOFF_MAX):
+    """Jittered exponential delay before retry number attempt (0-based)."""
+    return _jitter(min(cap, base * 2 ** attempt))
+
+
+def _retry_after(error):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failures=BREAKER_FAILURES,
+        reset_base=BREAKER_RESET_BASE,
+        reset_max=BREAKER_RESET_MAX,
+        status_file=STATUS_FILE,
+    ):
+        self.failure_threshold = max(1, int(failures))
+        self.reset_base = float(reset_base)
+        self.reset_max = max(float(reset_max), self.reset_base)
+        self.status_file = status_file
+
+        self.state = CLOSED
+        self.open_until = None
+        self.changed_at = time.time()
+        self.last_error = None
+        self.counters = {
+            "calls": 0,
+            "successes": 0,
+            "rejected": 0,
+            "trips": 0,
+            "failures": {},
+        }
+        self._consecutive = 0
+        # Trips since the circuit was last closed; sets the open duration
+        self._trips = 0
+        self._trial = False
+        self._lock = Lock()
+
+    @property
+    def down(self):
+        return self.state != CLOSED
+
+    def allow(self, now=None):
+        """Would a request be let through now? (Doesn't use up the half-open trial.)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                return now >= self.open_until
+            return not self._trial
+
+    def before_call(self, now=None):
+        """Claim the right to make a request; raises CircuitOpenError if not allowed."""
+        now = time.time() if now is None else now
+        changed = False
+        with self._lock:
+            if self.state == OPEN and now >= self.open_until:
+                self._set_state(HALF_OPEN, now)
+                changed = True
+            if self.state == OPEN or (self.state == HALF_OPEN and self._trial):
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(self.open_until or now)
+            if self.state == HALF_OPEN:
+                self._trial = True
+            self.counters["calls"] += 1
+        if changed:
+            self.write_status()
+
+    def record_success(self, now=None):
+        with self._lock:
+            self.counters["successes"] += 1
+            changed = self._recovered(time.time() if now is None else now)
+        if changed:
+            self.write_status()
+
+    def record_failure(self, error, now=None):
+        """Count a failed request; returns its classification."""
+        now = time.time() if now is None else now
+        kind = classify(error)
+        changed = False
+        with self._lock:
+            failures = self.counters["failures"]
+            failures[kind] = failures.get(kind, 0) + 1
+            self.last_error = {"kind": kind, "error": str(error)[:200], "time": now}
+            if kind not in TRIPPING:
+                # FR24 answered, so it's up
+                changed = self._recovered(now)
+            else:
+                self._consecutive += 1
+                if (
+                    self.state == HALF_OPEN
+                    or kind in ("throttled", "forbidden")
+                    or self._consecutive >= self.failure_threshold
+                ):
+                    self._open(now, _retry_after(error))
+                    changed = True
+        if changed:
+            self.write_status()
+        return kind
+
+    def _recovered(self, now):
+        self._consecutive = 0
+        self._trial = False
+        if self.state == CLOSED:
+            return False
+        self._trips = 0
+        self.open_until = None
+        self._set_state(CLOSED, now)
+        return True
+
+    def _open(self, now, retry_after=None):
+        self._trips += 1
+        self.counters["trips"] += 1
+        delay = _jitter(min(self.reset_max, self.reset_base * 2 ** (self._trips - 1)))
+        if retry_after:
+            delay = max(delay, retry_after)
+        self.open_until = now + delay
+        self._consecutive = 0
+        self._trial = False
+        self._set_state(OPEN, now)
+
+    def _set_state(self, state, now):
+        if state != self.state:
+            print(f"FR24 circuit {self.state} -> {state}")
+        self.state = state
+        self.changed_at = now
+
+    def status(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "open_until": self.open_until,
+                "changed_at": self.changed_at,
+                "consecutive_failures": self._consecutive,
+                "last_error": self.last_error,
+                "calls": self.counters["calls"],
+                "successes": self.counters["successes"],
+                "rejected": self.counters["rejected"],
+                "trips": self.counters["trips"],
+                "failures": dict(self.counters["failures"]),
+                "updated": time.time(),
+            }
+
+    def write_status(self):
+        if not self.status_file:
+            return
+        tmp = self.status_file + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.status(), f, indent=2)
+            os.replace(tmp, self.status_file)
+        except OSError as e:
+            print("Failed to write FR24 status:", e)
+
+
+class GuardedAPI:
+    """Wraps a FlightRadar24API so every request goes through a CircuitBreaker."""
+
+    def __init__(self, api, breaker):
+        self._api = api
+        self.breaker = breaker
+
+    def _call(self, fn, *args, **kwargs):
+        self.breaker.before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        self.breaker.record_success()
+        return result
+
+    def get_bounds(self, zone):
+        # Pure string formatting, no request
+        return self._api.get_bounds(zone)
+
+    def get_flights(self, *args, **kwargs):
+        return self._call(self._api.get_flights, *args, **kwargs)
+
+    def get_flight_details(self, flight):
+        return self._call(self._api.get_flight_details, flight)
+
+    def __getattr__(self, name):
+        return getattr(self._api, name)
+
+
+def read_status(path=STATUS_FILE):
+    """Last state written by the display process, or None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
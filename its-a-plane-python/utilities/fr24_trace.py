@@ -0,0 +1,210 @@
+"""
+Record and replay FlightRadar24 traffic.
+
+Recording: while flags/record_fr24_trace.on exists, Overhead wraps its API in
+RecordingAPI and every bounds listing and flight-details response is appended
+(with a timestamp) to traces/fr24-<date>.jsonl.gz, one JSON object per line:
+
+    {"t": 1718040000.1, "kind": "bounds", "bounds": "...", "body": {"<id>": [row...]}}
+    {"t": 1718040001.2, "kind": "details", "flight_id": "<id>", "body": {...}}
+
+Replay: ReplayAPI(path, speed) has the same get_bounds / get_flights /
+get_flight_details methods, so Overhead(api=ReplayAPI(...)) runs the normal
+_grab path on recorded data. speed=1 follows the recorded timing, speed=60
+plays an hour per minute, and speed=0 advances one listing per get_flights
+call (as fast as the caller can go).
+"""
+import gzip
+import json
+import os
+import time
+from bisect import bisect_right
+from datetime import datetime
+from threading import Lock
+
+from FlightRadar24.entities.flight import Flight
+
+from utilities import zone_tiles
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+FLAGS_DIR = os.path.join(BASE_DIR, "flags")
+TRACE_FLAG_FILE = os.path.join(FLAGS_DIR, "record_fr24_trace.on")
+TRACE_DIR = os.path.join(BASE_DIR, "traces")
+
+
+def recording_enabled() -> bool:
+    return os.path.exists(TRACE_FLAG_FILE)
+
+
+def flight_row(flight):
+    """Rebuild the feed.js row for a Flight (same index layout the client parses)."""
+    row = [None] * 19
+    row[0] = flight.icao_24bit
+    row[1] = flight.latitude
+    row[2] = flight.longitude
+    row[3] = flight.heading
+    row[4] = flight.altitude
+    row[5] = flight.ground_speed
+    row[6] = flight.squawk
+    row[8] = flight.aircraft_code
+    row[9] = flight.registration
+    row[10] = flight.time
+    row[11] = flight.origin_airport_iata
+    row[12] = flight.destination_airport_iata
+    row[13] = flight.number
+    row[14] = flight.on_ground
+    row[15] = flight.vertical_speed
+    row[16] = flight.callsign
+    row[18] = flight.airline_icao
+    return row
+
+
+class TraceRecorder:
+    """Append-only gzip JSONL writer; each record is flushed so a crash loses nothing."""
+
+    def __init__(self, path=None):
+        if path is None:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            path = os.path.join(TRACE_DIR, f"fr24-{datetime.now():%Y%m%d-%H%M%S}.jsonl.gz")
+        self.path = path
+        self._lock = Lock()
+        self._fh = gzip.open(path, "at", encoding="utf-8", compresslevel=6)
+
+    def record(self, kind, body, **meta):
+        line = {"t": round(time.time(), 3), "kind": kind}
+        line.update(meta)
+        line["body"] = body
+        text = json.dumps(line, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._fh is None:
+                return
+            self._fh.write(text + "\n")
+            self._fh.flush()
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+class RecordingAPI:
+    """Wraps a FlightRadar24API and records the responses Overhead uses."""
+
+    def __init__(self, api, recorder):
+        self._api = api
+        self.recorder = recorder
+
+    def get_bounds(self, zone):
+        return self._api.get_bounds(zone)
+
+    def get_flights(self, *args, **kwargs):
+        flights = self._api.get_flights(*args, **kwargs)
+        self.recorder.record(
+            "bounds",
+            {f.id: flight_row(f) for f in flights},
+            bounds=kwargs.get("bounds"),
+        )
+        return flights
+
+    def get_zone_flights(self, zone, limiter=None):
+        # Tiles are fetched from the real API and recorded as one merged listing per grab
+        flights = zone_tiles.fetch_tiles(self._api, zone, limiter)
+        self.recorder.record(
+            "bounds",
+            {f.id: flight_row(f) for f in flights},
+            bounds=self._api.get_bounds(zone),
+        )
+        return flights
+
+    def get_flight_details(self, flight):
+        details = self._api.get_flight_details(flight)
+        self.recorder.record("details", details, flight_id=flight.id)
+        return details
+
+    def __getattr__(self, name):
+        return getattr(self._api, name)
+
+
+def load_trace(path):
+    """Return (listings, details): listings = [(t, rows)], details = {flight_id: [(t, body)]}."""
+    listings = []
+    details = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                # A trace cut off mid-write ends with a partial line
+                continue
+            kind = rec.get("kind")
+            if kind == "bounds":
+                listings.append((rec["t"], rec.get("body") or {}))
+            elif kind == "details":
+                details.setdefault(rec.get("flight_id"), []).append((rec["t"], rec.get("body")))
+    listings.sort(key=lambda x: x[0])
+    for entries in details.values():
+        entries.sort(key=lambda x: x[0])
+    return listings, details
+
+
+class ReplayAPI:
+    """Feeds a recorded trace back to Overhead in place of FlightRadar24API."""
+
+    def __init__(self, path, speed=1.0):
+        self.speed = speed
+        self._listings, self._details = load_trace(path)
+        self._times = [t for t, _ in self._listings]
+        self._index = -1
+        self._started = None
+
+    @property
+    def finished(self) -> bool:
+        if not self._listings:
+            return True
+        if self.speed <= 0:
+            return self._index >= len(self._listings) - 1
+        return self._trace_now() >= self._times[-1]
+
+    def _trace_now(self):
+        if self.speed <= 0:
+            return self._times[max(self._index, 0)]
+        if self._started is None:
+            return self._times[0]
+        return self._times[0] + (time.monotonic() - self._started) * self.speed
+
+    @staticmethod
+    def get_bounds(zone):
+        return f"{zone['tl_y']},{zone['br_y']},{zone['tl_x']},{zone['br_x']}"
+
+    def get_flights(self, *args, **kwargs):
+        if not self._listings:
+            return []
+        if self.speed <= 0:
+            self._index = min(self._index + 1, len(self._listings) - 1)
+        else:
+            if self._started is None:
+                self._started = time.monotonic()
+            self._index = max(0, bisect_right(self._times, self._trace_now()) - 1)
+        _, rows = self._listings[self._index]
+        return [Flight(flight_id, row) for flight_id, row in rows.items()]
+
+    def get_zone_flights(self, zone, limiter=None):
+        # Each recorded listing already covers the whole zone
+        return self.get_flights()
+
+    def get_flight_details(self, flight):
+        entries = self._details.get(flight.id)
+        if not entries:
+            raise LookupError(f"no recorded details for {flight.id}")
+        now = self._trace_now()
+        # Latest response at or before the replay clock, else the first one recorded
+        best = entries[0][1]
+        for t, body in entries:
+            if t > now:
+                break
+            best = body
+        return best
@@ -0,0 +1,177 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+from setup import screen
+from utilities import bdf
+from utilities import sprites
+
+# The compositor (and anything else built on FrameBuffer) needs numpy
+AVAILABLE = np is not None
+
+
+def _bdf_for(font):
+    """Resolve the BdfFont behind an rgbmatrix (or virtual) font object."""
+    loaded = getattr(font, "bdf", None)
+    if loaded is not None:
+        return loaded
+    from setup import fonts
+    path = fonts.FONT_FILES.get(id(font))
+    if path is None:
+        return None
+    return bdf.load(path)
+
+
+def _glyph_arrays(glyph):
+    if glyph.xs is None:
+        pts = glyph.points
+        glyph.xs = np.array([p[0] for p in pts], dtype=np.int32)
+        glyph.ys = np.array([p[1] for p in pts], dtype=np.int32)
+    return glyph.xs, glyph.ys
+
+
+class FrameBuffer(object):
+    """
+    A width x height x 3 (uint8) RGB image that mirrors the canvas API used
+    by Display's draw helpers. Rectangles use EXCLUSIVE x1/y1, like draw_square.
+    """
+
+    def __init__(self, width=screen.WIDTH, height=screen.HEIGHT):
+        self.width = width
+        self.height = height
+        self.pixels = np.zeros((height, width, 3), dtype=np.uint8)
+
+    def clear(self):
+        self.pixels.fill(0)
+
+    def _clip(self, x0, y0, x1, y1):
+        x0 = max(0, min(self.width, int(x0)))
+        x1 = max(0, min(self.width, int(x1)))
+        y0 = max(0, min(self.height, int(y0)))
+        y1 = max(0, min(self.height, int(y1)))
+        return x0, y0, x1, y1
+
+    def fill(self, x0, y0, x1, y1, colour):
+        x0, y0, x1, y1 = self._clip(x0, y0, x1, y1)
+        if x1 <= x0 or y1 <= y0:
+            return
+        self.pixels[y0:y1, x0:x1] = (colour.red, colour.green, colour.blue)
+
+    def clear_region(self, x0, y0, x1, y1):
+        x0, y0, x1, y1 = self._clip(x0, y0, x1, y1)
+        self.pixels[y0:y1, x0:x1] = 0
+
+    def copy_region(self, other, region):
+        """Copy a rectangle (EXCLUSIVE x1/y1) from another buffer of the same size."""
+        x0, y0, x1, y1 = self._clip(*region)
+        self.pixels[y0:y1, x0:x1] = other.pixels[y0:y1, x0:x1]
+
+    def set_pixel(self, x, y, r, g, b):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y, x] = (r, g, b)
+
+    def line(self, x0, y0, x1, y1, colour):
+        """Inclusive line, same as graphics.DrawLine."""
+        rgb = (colour.red, colour.green, colour.blue)
+        if x0 == x1:
+            lo, hi = (y0, y1) if y0 <= y1 else (y1, y0)
+            if 0 <= x0 < self.width:
+                lo, hi = max(0, lo), min(self.height - 1, hi)
+                if lo <= hi:
+                    self.pixels[lo:hi + 1, x0] = rgb
+            return
+        if y0 == y1:
+            lo, hi = (x0, x1) if x0 <= x1 else (x1, x0)
+            if 0 <= y0 < self.height:
+                lo, hi = max(0, lo), min(self.width - 1, hi)
+                if lo <= hi:
+                    self.pixels[y0, lo:hi + 1] = rgb
+            return
+
+        # Bresenham for the (rare) diagonal case
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            if 0 <= x0 < self.width and 0 <= y0 < self.height:
+                self.pixels[y0, x0] = rgb
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def text(self, font, x, y, colour, text) -> int:
+        """Draw text at baseline y; returns the advance width like graphics.DrawText."""
+        face = _bdf_for(font)
+        if face is None or not text:
+            return 0
+
+        rgb = (colour.red, colour.green, colour.blue)
+        w, h = self.width, self.height
+        start = x
+        for ch in text:
+            glyph = face.glyph(ord(ch))
+            if glyph is None:
+                continue
+            if glyph.points and -glyph.dwidth < x < w:
+                xs, ys = _glyph_arrays(glyph)
+                px = xs + x
+                py = ys + y
+                keep = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+                self.pixels[py[keep], px[keep]] = rgb
+            x += glyph.dwidth
+        return x - start
+
+    def blit(self, pil_img, x=0, y=0, skip_black=False):
+        """
+        Copy a PIL image into the buffer (clipped), overwriting what is there.
+        With skip_black, black source pixels leave the buffer untouched.
+        """
+        sprite = sprites.sprite_for(pil_img)
+        self.blit_array(sprite.rgb, x, y, mask=sprite.mask if skip_black else None)
+
+    def blit_array(self, src, x=0, y=0, mask=None):
+        """Copy an (h, w, 3) array; if mask is given only True pixels are written."""
+        sh, sw = src.shape[0], src.shape[1]
+        x0, y0, x1, y1 = self._clip(x, y, x + sw, y + sh)
+        if x1 <= x0 or y1 <= y0:
+            return
+        sx0, sy0 = x0 - x, y0 - y
+        part = src[sy0:sy0 + (y1 - y0), sx0:sx0 + (x1 - x0)]
+        if mask is None:
+            self.pixels[y0:y1, x0:x1] = part
+        else:
+            m = mask[sy0:sy0 + (y1 - y0), sx0:sx0 + (x1 - x0)]
+            self.pixels[y0:y1, x0:x1][m] = part[m]
+
+    def copy_from(self, other):
+        np.copyto(self.pixels, other.pixels)
+
+    def same_as(self, other) -> bool:
+        return np.array_equal(self.pixels, other.pixels)
+
+    def diff_mask(self, other):
+        """(h, w) bool array of pixels that differ from other."""
+        return np.any(self.pixels != other.pixels, axis=2)
+
+    def region_image(self, x0, y0, x1, y1):
+        """PIL copy of a rectangle (EXCLUSIVE x1/y1), for a single SetImage call."""
+        part = np.ascontiguousarray(self.pixels[y0:y1, x0:x1])
+        return Image.frombuffer("RGB", (x1 - x0, y1 - y0), part, "raw", "RGB", 0, 1)
+
+    def to_image(self):
+        """Zero-copy PIL view of the buffer (valid until the buffer is written)."""
+        return Image.frombuffer("RGB", (self.width, self.height), self.pixels, "raw", "RGB", 0, 1)
@@ -0,0 +1,252 @@
+"""
+Batch geometry over arrays of positions (the whole get_flights listing at once).
+
+Haversine distance (miles, or km when metric), initial bearing in degrees,
+the point reached along a bearing (dead reckoning), closest point of approach
+to home, slant range including altitude, 8-point cardinal directions and
+point-in-polygon tests for the ZONE_POLYGONS geofences. With NumPy each call
+is a handful of array operations; without it the functions fall back to plain
+loops and return lists.
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EARTH_RADIUS_M = 3958.8
+KM_PER_MILE = 1.609
+FEET_PER_MILE = 5280.0
+MILES_PER_NM = 1.15078
+CARDINALS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+
+
+def flight_positions(flights):
+    """(lat, lon, altitude) arrays for a list of FR24 Flight objects."""
+    if np is None:
+        return (
+            [f.latitude for f in flights],
+            [f.longitude for f in flights],
+            [f.altitude for f in flights],
+        )
+    n = len(flights)
+    lat = np.fromiter((f.latitude for f in flights), dtype=np.float64, count=n)
+    lon = np.fromiter((f.longitude for f in flights), dtype=np.float64, count=n)
+    alt = np.fromiter((f.altitude for f in flights), dtype=np.float64, count=n)
+    return lat, lon, alt
+
+
+def flight_velocities(flights):
+    """(heading degrees, ground speed knots) arrays; missing values count as stationary."""
+    heading = [getattr(f, "heading", None) or 0 for f in flights]
+    speed = [getattr(f, "ground_speed", None) or 0 for f in flights]
+    if np is None:
+        return heading, speed
+    return np.asarray(heading, dtype=np.float64), np.asarray(speed, dtype=np.float64)
+
+
+def haversine(lat1, lon1, lat2, lon2, metric=False):
+    """Great-circle distance; any argument may be an array or a scalar."""
+    scale = EARTH_RADIUS_M * (KM_PER_MILE if metric else 1.0)
+    if np is None:
+        return [_haversine(a, b, c, d) * scale for a, b, c, d in _broadcast(lat1, lon1, lat2, lon2)]
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return scale * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def initial_bearing(lat1, lon1, lat2, lon2):
+    """Bearing in degrees [0, 360) from point 1 towards point 2."""
+    if np is None:
+        return [_bearing(a, b, c, d) for a, b, c, d in _broadcast(lat1, lon1, lat2, lon2)]
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    b = np.arctan2(
+        np.sin(lon2 - lon1) * np.cos(lat2),
+        np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(lon2 - lon1),
+    )
+    return (np.degrees(b) + 360) % 360
+
+
+def destination(lat, lon, bearing, distance, metric=False):
+    """(lat, lon) reached from a point travelling distance along an initial bearing (degrees)."""
+    radius = EARTH_RADIUS_M * (KM_PER_MILE if metric else 1.0)
+    if np is None:
+        return tuple(map(list, zip(*(
+            _destination(a, b, c, d / radius) for a, b, c, d in _broadcast(lat, lon, bearing, distance)
+        )))) or ([], [])
+    lat, lon, bearing = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat, lon, bearing))
+    delta = np.asarray(distance, dtype=np.float64) / radius
+    lat2 = np.arcsin(np.sin(lat) * np.cos(delta) + np.cos(lat) * np.sin(delta) * np.cos(bearing))
+    lon2 = lon + np.arctan2(np.sin(bearing) * np.sin(delta) * np.cos(lat),
+                            np.cos(delta) - np.sin(lat) * np.sin(lat2))
+    return np.degrees(lat2), (np.degrees(lon2) + 540) % 360 - 180
+
+
+def closest_approach(lat, lon, heading, speed_kts, home_lat, home_lon, horizon, metric=False):
+    """
+    Closest point of approach to home within the next horizon seconds, flying
+    straight at constant ground speed. Returns (miss distance, seconds until it);
+    an aircraft moving away has its closest point now (0 s).
+
+    Uses a flat east/north plane around home, which is plenty for a tracking zone.
+    """
+    radius = EARTH_RADIUS_M * (KM_PER_MILE if metric else 1.0)
+    per_second = MILES_PER_NM * (KM_PER_MILE if metric else 1.0) / 3600.0
+    if np is None:
+        return tuple(map(list, zip(*(
+            _closest_approach(a, b, c, d * per_second, home_lat, home_lon, horizon, radius)
+            for a, b, c, d in _broadcast(lat, lon, heading, speed_kts)
+        )))) or ([], [])
+    lat, lon, heading = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat, lon, heading))
+    speed = np.asarray(speed_kts, dtype=np.float64) * per_second
+    home_lat, home_lon = math.radians(home_lat), math.radians(home_lon)
+    east = (lon - home_lon) * math.cos(home_lat) * radius
+    north = (lat - home_lat) * radius
+    v_east, v_north = speed * np.sin(heading), speed * np.cos(heading)
+    v2 = v_east ** 2 + v_north ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(v2 > 0, -(east * v_east + north * v_north) / v2, 0.0)
+    t = np.clip(t, 0.0, max(0.0, horizon))
+    return np.hypot(east + v_east * t, north + v_north * t), t
+
+
+def slant_range(ground_distance, altitude_ft, metric=False):
+    """Line-of-sight distance to an aircraft from its ground distance and altitude (feet)."""
+    # Feet per mile, or per km
+    per_unit = FEET_PER_MILE / (KM_PER_MILE if metric else 1.0)
+    if np is None:
+        return [math.hypot(d, a / per_unit) for d, a in _broadcast(ground_distance, altitude_ft)]
+    return np.hypot(np.asarray(ground_distance, dtype=np.float64),
+                    np.asarray(altitude_ft, dtype=np.float64) / per_unit)
+
+
+def cardinal(degrees):
+    """8-point compass labels for an array of bearings (0-22.4 is N, 22.5 NE, ...)."""
+    if np is None:
+        return [CARDINALS[int((d + 22.5) / 45) % 8] for d, in _broadcast(degrees)]
+    idx = (np.floor((np.asarray(degrees, dtype=np.float64) + 22.5) / 45).astype(np.int64)) % 8
+    return np.asarray(CARDINALS)[idx]
+
+
+def in_range(values, low, high):
+    """Indices i with low < values[i] < high."""
+    if np is None:
+        return [i for i, v in enumerate(values) if low < v < high]
+    values = np.asarray(values)
+    return np.flatnonzero((values > low) & (values < high))
+
+
+def points_in_polygon(lat, lon, polygon):
+    """
+    Even-odd test of every point against one polygon ([[lat, lon], ...], open or closed ring).
+    Returns a boolean array (list without NumPy).
+    """
+    if np is None:
+        return [_point_in_polygon(y, x, polygon) for y, x in _broadcast(lat, lon)]
+    y = np.asarray(lat, dtype=np.float64)[:, None]
+    x = np.asarray(lon, dtype=np.float64)[:, None]
+    ring = np.asarray(polygon, dtype=np.float64)
+    yi, xi = ring[:, 0], ring[:, 1]
+    yj, xj = np.roll(yi, 1), np.roll(xi, 1)
+    # points x edges: does a ray east from the point cross the edge?
+    crosses = (yi > y) != (yj > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = (xj - xi) * (y - yi) / (yj - yi) + xi
+    return np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
+
+
+def in_polygons(lat, lon, polygons):
+    """Indices of the points inside any of the polygons."""
+    if np is None:
+        return [
+            i for i, (y, x) in enumerate(zip(lat, lon))
+            if any(_point_in_polygon(y, x, p) for p in polygons)
+        ]
+    inside = np.zeros(len(lat), dtype=bool)
+    for polygon in polygons:
+        inside |= points_in_polygon(lat, lon, polygon)
+    return np.flatnonzero(inside)
+
+
+def polygons_zone(polygons):
+    """Bounding box of the polygons as a ZONE_HOME-style dict."""
+    lats = [p[0] for polygon in polygons for p in polygon]
+    lons = [p[1] for polygon in polygons for p in polygon]
+    return {"tl_y": max(lats), "tl_x": min(lons), "br_y": min(lats), "br_x": max(lons)}
+
+
+def take(values, indices):
+    """values[indices] for arrays and plain lists alike."""
+    if np is None or not isinstance(values, np.ndarray):
+        return [values[i] for i in indices]
+    return values[indices]
+
+
+def nearest_k(distances, k):
+    """Indices of the k smallest distances, nearest first, without sorting the rest."""
+    n = len(distances)
+    k = min(k, n)
+    if k <= 0:
+        return []
+    if np is None:
+        return sorted(range(n), key=distances.__getitem__)[:k]
+    distances = np.asarray(distances)
+    if k < n:
+        idx = np.argpartition(distances, k - 1)[:k]
+    else:
+        idx = np.arange(n)
+    # Stable tie-break on index, like the old list.sort
+    return idx[np.lexsort((idx, distances[idx]))].tolist()
+
+
+def _broadcast(*values):
+    lists = [v if isinstance(v, (list, tuple)) else None for v in values]
+    n = max((len(v) for v in lists if v is not None), default=1)
+    return zip(*[v if v is not None else [values[i]] * n for i, v in enumerate(lists)])
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def _destination(lat, lon, bearing, delta):
+    lat, lon, bearing = map(math.radians, (lat, lon, bearing))
+    lat2 = math.asin(math.sin(lat) * math.cos(delta) + math.cos(lat) * math.sin(delta) * math.cos(bearing))
+    lon2 = lon + math.atan2(math.sin(bearing) * math.sin(delta) * math.cos(lat),
+                            math.cos(delta) - math.sin(lat) * math.sin(lat2))
+    return math.degrees(lat2), (math.degrees(lon2) + 540) % 360 - 180
+
+
+def _closest_approach(lat, lon, heading, speed, home_lat, home_lon, horizon, radius):
+    east = math.radians(lon - home_lon) * math.cos(math.radians(home_lat)) * radius
+    north = math.radians(lat - home_lat) * radius
+    v_east = speed * math.sin(math.radians(heading))
+    v_north = speed * math.cos(math.radians(heading))
+    v2 = v_east ** 2 + v_north ** 2
+    t = -(east * v_east + north * v_north) / v2 if v2 > 0 else 0.0
+    t = min(max(t, 0.0), max(0.0, horizon))
+    return math.hypot(east + v_east * t, north + v_north * t), t
+
+
+def _point_in_polygon(y, x, polygon):
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        yi, xi = polygon[i][0], polygon[i][1]
+        yj, xj = polygon[j][0], polygon[j][1]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _bearing(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    b = math.atan2(
+        math.sin(lon2 - lon1) * math.cos(lat2),
+        math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(lon2 - lon1),
+    )
+    return (math.degrees(b) + 360) % 360
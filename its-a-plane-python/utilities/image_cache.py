@@ -0,0 +1,131 @@
+"""
+Bounded cache for the small PIL images scenes draw (logos, forecast icons).
+
+One shared instance holds every scene's images under a single byte budget:
+
+    cache = image_cache.shared()
+    hit, img = cache.lookup(("logo", icao))
+    if not hit:
+        img = load(...)             # may be None
+        cache.put(("logo", icao), img)
+
+Least recently used images are evicted once IMAGE_CACHE_MAX_BYTES is
+exceeded. A None (file missing / unreadable) is cached as a negative entry
+that expires after IMAGE_CACHE_NEGATIVE_TTL seconds, so a logo downloaded
+later is picked up without a restart.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+
+# Optional config values
+try:
+    from config import IMAGE_CACHE_MAX_BYTES
+except (ImportError, ModuleNotFoundError, NameError):
+    IMAGE_CACHE_MAX_BYTES = 256 * 1024
+
+try:
+    from config import IMAGE_CACHE_NEGATIVE_TTL
+except (ImportError, ModuleNotFoundError, NameError):
+    IMAGE_CACHE_NEGATIVE_TTL = 600
+
+# Rough per-entry bookkeeping cost (key, OrderedDict node, PIL object)
+ENTRY_OVERHEAD = 200
+
+
+def image_bytes(img) -> int:
+    if img is None:
+        return ENTRY_OVERHEAD
+    w, h = img.size
+    return w * h * len(img.getbands()) + ENTRY_OVERHEAD
+
+
+class ImageCache:
+    def __init__(self, max_bytes=IMAGE_CACHE_MAX_BYTES, negative_ttl=IMAGE_CACHE_NEGATIVE_TTL):
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        # key -> (image or None, size, negative expiry or None)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key):
+        """Return (True, image_or_None) on a hit, (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            img, size, expires = entry
+            if expires is not None:
+                if time.monotonic() >= expires:
+                    self._remove(key)
+                    self.misses += 1
+                    return False, None
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            self._entries.move_to_end(key)
+            return True, img
+
+    def put(self, key, img):
+        """Cache img (None caches a negative entry) and evict down to the byte budget."""
+        size = image_bytes(img)
+        expires = time.monotonic() + self.negative_ttl if img is None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (img, size, expires)
+            self._bytes += size
+            # Never evict the entry just added, even if it alone is over budget
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                old_key = next(iter(self._entries))
+                self._remove(old_key)
+                self.evictions += 1
+        return img
+
+    def discard(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            negatives = sum(1 for _, _, expires in self._entries.values() if expires is not None)
+            return {
+                "entries": len(self._entries),
+                "negative_entries": negatives,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_shared = None
+_shared_lock = Lock()
+
+
+def shared() -> ImageCache:
+    """The process-wide cache all scenes share."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ImageCache()
+        return _shared
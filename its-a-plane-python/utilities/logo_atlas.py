@@ -0,0 +1,150 @@
+"""
+Packed atlas of the 16x16 display logos (built by scripts/build_logo_atlas.py).
+
+File layout (little endian):
+
+    header   "LGAT", u16 version, u16 tile size, u32 count
+    index    count x (8-byte ASCII code, u8 width, u8 height, 2 pad, u32 offset)
+    pixels   raw RGB bytes for each logo, width * height * 3 at its offset
+
+The reader memory-maps the file, so opening it costs one index scan and each
+logo is a zero-copy PIL view onto the mapped pages: no PNG decode at runtime.
+"""
+import mmap
+import os
+import struct
+import time
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+MAGIC = b"LGAT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+ENTRY = struct.Struct("<8sBBxxI")
+CODE_BYTES = 8
+
+ATLAS_NAME = "logo_atlas.bin"
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+# Same places the display and logo scripts look for logos/, CWD first
+ATLAS_CANDIDATES = [
+    os.path.join("logos", ATLAS_NAME),
+    os.path.abspath(os.path.join(BASE_DIR, "..", "logos", ATLAS_NAME)),
+    os.path.expanduser(os.path.join("~", "logos", ATLAS_NAME)),
+]
+
+# How often shared() checks whether the atlas file was rebuilt
+RECHECK_SECONDS = 60
+
+
+def write_atlas(path, logos, tile_size=16):
+    """
+    logos: {code: PIL image (RGB, at most tile_size square)}.
+    Writes atomically (temp file + rename) so a running display never maps a half-written file.
+    """
+    codes = sorted(c for c in logos if c and len(c.encode("ascii", "ignore")) <= CODE_BYTES)
+    data_start = HEADER.size + ENTRY.size * len(codes)
+
+    index = []
+    blobs = []
+    offset = data_start
+    for code in codes:
+        img = logos[code]
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        w, h = img.size
+        raw = img.tobytes()
+        index.append(ENTRY.pack(code.encode("ascii"), w, h, offset))
+        blobs.append(raw)
+        offset += len(raw)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, tile_size, len(codes)))
+        f.writelines(index)
+        f.writelines(blobs)
+    os.replace(tmp, path)
+    return len(codes)
+
+
+class LogoAtlas:
+    def __init__(self, path):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.tile_size, count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a logo atlas")
+
+        self._index = {}
+        pos = HEADER.size
+        for _ in range(count):
+            code, w, h, offset = ENTRY.unpack_from(self._mm, pos)
+            self._index[code.rstrip(b"\0").decode("ascii")] = (offset, w, h)
+            pos += ENTRY.size
+
+        self._view = memoryview(self._mm)
+        # code -> PIL view, so the same object (and its sprite cache entry) is reused
+        self._images = {}
+
+    def __contains__(self, code):
+        return code in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def codes(self):
+        return self._index.keys()
+
+    def get(self, code):
+        """PIL RGB image for code (a read-only view into the atlas), or None."""
+        img = self._images.get(code)
+        if img is not None:
+            return img
+        entry = self._index.get(code)
+        if entry is None or Image is None:
+            return None
+        offset, w, h = entry
+        img = Image.frombuffer("RGB", (w, h), self._view[offset:offset + w * h * 3], "raw", "RGB", 0, 1)
+        self._images[code] = img
+        return img
+
+
+_shared = None
+_shared_checked = 0.0
+
+
+def _find_atlas():
+    for path in ATLAS_CANDIDATES:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def shared():
+    """The process-wide atlas (reopened when the file is rebuilt), or None if there isn't one."""
+    global _shared, _shared_checked
+
+    now = time.monotonic()
+    if _shared_checked and now - _shared_checked < RECHECK_SECONDS:
+        return _shared
+    _shared_checked = now
+
+    path = _find_atlas()
+    if path is None:
+        _shared = None
+        return None
+    try:
+        if _shared is not None and _shared.path == path and os.path.getmtime(path) == _shared.mtime:
+            return _shared
+        # The old map is left to the GC: images already handed out still point into it
+        _shared = LogoAtlas(path)
+    except (OSError, ValueError, struct.error) as e:
+        print("Failed to open logo atlas:", e)
+        _shared = None
+    return _shared
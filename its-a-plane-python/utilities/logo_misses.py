@@ -0,0 +1,98 @@
+"""
+Persistent record of airline codes FlightAware has no logo for.
+
+Some operators never get a logo, and each attempt costs a request with a 10s
+timeout. Misses are saved to <logos>/logo_misses.json with a retry time that
+backs off exponentially per code (LOGO_MISS_RETRY_BASE doubling up to
+LOGO_MISS_RETRY_MAX), so known misses cost nothing across restarts but are
+still re-checked now and then. Network errors only get a short retry
+(LOGO_MISS_RETRY_TRANSIENT) and don't count towards the backoff.
+
+File format:
+
+    {"XYZ": {"misses": 3, "retry_at": 1718000000.0}, ...}
+"""
+import json
+import os
+import time
+from threading import Lock
+
+# Optional config values
+try:
+    from config import LOGO_MISS_RETRY_BASE
+except (ImportError, ModuleNotFoundError, NameError):
+    LOGO_MISS_RETRY_BASE = 6 * 3600
+
+try:
+    from config import LOGO_MISS_RETRY_MAX
+except (ImportError, ModuleNotFoundError, NameError):
+    LOGO_MISS_RETRY_MAX = 30 * 86400
+
+try:
+    from config import LOGO_MISS_RETRY_TRANSIENT
+except (ImportError, ModuleNotFoundError, NameError):
+    LOGO_MISS_RETRY_TRANSIENT = 300
+
+MISSES_NAME = "logo_misses.json"
+
+
+def retry_delay(misses: int) -> float:
+    """Seconds to wait after the given number of consecutive misses."""
+    if misses <= 0:
+        return 0.0
+    return float(min(LOGO_MISS_RETRY_MAX, LOGO_MISS_RETRY_BASE * (2 ** (misses - 1))))
+
+
+class LogoMissCache:
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {k: v for k, v in data.items() if isinstance(v, dict)}
+
+    def _save(self):
+        # Called with the lock held; temp file + rename so a crash can't truncate it
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=4, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print("Failed to save logo misses:", e)
+
+    def should_skip(self, code, now=None) -> bool:
+        """True while code is a known miss that isn't due for a retry yet."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(code)
+            return entry is not None and now < entry.get("retry_at", 0)
+
+    def record_miss(self, code, transient=False, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(code, {"misses": 0})
+            if transient:
+                entry["retry_at"] = now + LOGO_MISS_RETRY_TRANSIENT
+            else:
+                entry["misses"] = entry.get("misses", 0) + 1
+                entry["retry_at"] = now + retry_delay(entry["misses"])
+            self._entries[code] = entry
+            self._save()
+
+    def record_hit(self, code):
+        with self._lock:
+            if self._entries.pop(code, None) is not None:
+                self._save()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,164 @@
+"""
+Turns downloaded airline logos (<ICAO>--web.png) into the 16x16 display
+logos (<ICAO>.png) the matrix draws. Used by the tracker's logo prefetcher
+and scripts/cache_airline_logos.py.
+
+    build_display_logos([(web_path, display_path), ...], processes=None)
+
+Outputs that are newer than their source are skipped outright. Otherwise the
+source is hashed and compared with <logos>/logo_pipeline.json, so a re-download
+of identical bytes doesn't trigger a rebuild either. The remaining logos are
+processed on a process pool (processes=0 runs them inline).
+"""
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+try:
+    from PIL import Image, ImageEnhance, ImageOps
+except Exception:
+    Image = None
+
+DISPLAY_LOGO_SIZE = (16, 16)
+MANIFEST_NAME = "logo_pipeline.json"
+# Bump when render_display_logo changes so every logo is rebuilt once
+PIPELINE_VERSION = 1
+
+_manifest_lock = Lock()
+
+
+def _resample():
+    try:
+        return Image.Resampling.LANCZOS  # Pillow 10+
+    except AttributeError:
+        return Image.LANCZOS            # Pillow <10
+
+
+def render_display_logo(content: bytes):
+    """Resize to 16x16, flatten onto white and punch up contrast/colour. Returns a PIL RGB image."""
+    with Image.open(io.BytesIO(content)) as img:
+        img = img.convert("RGBA")
+        img = img.resize(DISPLAY_LOGO_SIZE, _resample())
+        background = Image.new("RGBA", DISPLAY_LOGO_SIZE, (255, 255, 255, 255))
+        background.paste(img, (0, 0), img)
+        flattened = background.convert("RGB")
+        flattened = ImageOps.autocontrast(flattened)
+        flattened = ImageEnhance.Contrast(flattened).enhance(1.4)
+        flattened = ImageEnhance.Color(flattened).enhance(1.2)
+        return flattened
+
+
+def write_display_logo(content: bytes, path: str):
+    """Render content and save it to path. Returns None, or an error message."""
+    if Image is None:
+        return "Pillow not available; skipping 16x16 logo."
+    try:
+        img = render_display_logo(content)
+        tmp = path + ".tmp"
+        img.save(tmp, format="PNG")
+        os.replace(tmp, path)
+    except Exception as e:
+        return f"display logo resize failed: {path} ({e})"
+    return None
+
+
+def _build_one(source_path: str, out_path: str):
+    # Runs in a worker process
+    try:
+        with open(source_path, "rb") as f:
+            content = f.read()
+    except OSError as e:
+        return f"cannot read {source_path} ({e})"
+    return write_display_logo(content, out_path)
+
+
+def source_hash(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {}
+
+
+def _save_manifest(path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _is_fresh(source_path, out_path):
+    try:
+        return os.path.getmtime(out_path) >= os.path.getmtime(source_path)
+    except OSError:
+        return False
+
+
+def build_display_logos(jobs, processes=None, force=False, manifest_path=None):
+    """
+    jobs: iterable of (source_path, out_path).
+    processes: pool size (None = CPU count, 0 = inline in this process).
+    manifest_path: defaults to logo_pipeline.json next to the first output.
+    Returns {"built": n, "skipped": n, "failed": n, "errors": [...]}.
+    """
+    jobs = [(s, o) for s, o in jobs if os.path.isfile(s)]
+    stats = {"built": 0, "skipped": 0, "failed": 0, "errors": []}
+    if not jobs:
+        return stats
+    if manifest_path is None:
+        manifest_path = os.path.join(os.path.dirname(jobs[0][1]), MANIFEST_NAME)
+
+    with _manifest_lock:
+        manifest = _load_manifest(manifest_path)
+
+    todo = []
+    for source_path, out_path in jobs:
+        key = os.path.basename(out_path)
+        known = manifest.get(key, {})
+        if not force and known.get("pipeline") == PIPELINE_VERSION and _is_fresh(source_path, out_path):
+            stats["skipped"] += 1
+            continue
+        digest = source_hash(source_path)
+        if (not force and known.get("source") == digest
+                and known.get("pipeline") == PIPELINE_VERSION and os.path.isfile(out_path)):
+            stats["skipped"] += 1
+            continue
+        todo.append((source_path, out_path, key, digest))
+
+    if processes == 0 or len(todo) <= 1:
+        results = [_build_one(s, o) for s, o, _, _ in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_build_one, [t[0] for t in todo], [t[1] for t in todo]))
+
+    updates = {}
+    for (source_path, out_path, key, digest), error in zip(todo, results):
+        if error:
+            stats["failed"] += 1
+            stats["errors"].append(error)
+            continue
+        stats["built"] += 1
+        updates[key] = {"source": digest, "pipeline": PIPELINE_VERSION}
+
+    if updates:
+        with _manifest_lock:
+            # Re-read so concurrent callers in this process don't drop each other's entries
+            manifest = _load_manifest(manifest_path)
+            manifest.update(updates)
+            try:
+                _save_manifest(manifest_path, manifest)
+            except OSError as e:
+                stats["errors"].append(f"cannot save {manifest_path} ({e})")
+    return stats
@@ -0,0 +1,82 @@
+"""
+Background airline logo fetching.
+
+Overhead._grab only details the closest few flights, but the get_flights
+listing already names the airline of every aircraft in the zone. Feeding
+those codes (and callsign prefixes) in here downloads and processes missing
+logos on a small thread pool, so a logo is usually on disk before its flight
+becomes the nearest one and the grab itself never waits on FlightAware.
+
+    prefetcher = LogoPrefetcher(fetch)     # fetch(codes) does the real work
+    prefetcher.submit(logo_candidates(f.airline_icao, f.callsign))
+
+Each code is handed to fetch at most once per process (success or not), the
+same as the old in-grab cache.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+# Optional config values
+try:
+    from config import LOGO_PREFETCH_WORKERS
+except (ImportError, ModuleNotFoundError, NameError):
+    LOGO_PREFETCH_WORKERS = 2
+
+BLANK_CODES = ("", "N/A", "NONE")
+
+
+def logo_candidates(owner_icao, callsign):
+    """Codes to try for a flight, best first: owner ICAO, then the callsign prefix."""
+    codes = []
+    if owner_icao and str(owner_icao).strip().upper() not in BLANK_CODES:
+        codes.append(str(owner_icao).strip().upper())
+    if callsign:
+        prefix = str(callsign).strip()[:3].upper()
+        if prefix and prefix not in BLANK_CODES and prefix not in codes:
+            codes.append(prefix)
+    return codes
+
+
+class LogoPrefetcher:
+    def __init__(self, fetch, workers=LOGO_PREFETCH_WORKERS):
+        # fetch(codes) is called on a pool thread with a list of new codes
+        self._fetch = fetch
+        self._workers = max(1, int(workers))
+        self._pool = None
+        self._lock = Lock()
+        self._seen = set()
+        self.submitted = 0
+        self.failed = 0
+
+    def submit(self, codes):
+        """Queue the codes not seen before; returns immediately."""
+        with self._lock:
+            new = [c for c in codes if c and c not in self._seen]
+            if not new:
+                return False
+            self._seen.update(new)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="logo-prefetch")
+            self.submitted += 1
+            pool = self._pool
+        pool.submit(self._run, new)
+        return True
+
+    def _run(self, codes):
+        try:
+            self._fetch(codes)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            print("Logo prefetch failed for", ",".join(codes), e)
+
+    def forget(self, code):
+        """Allow code to be fetched again."""
+        with self._lock:
+            self._seen.discard(code)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
@@ -0,0 +1,132 @@
+"""
+Dead reckoning for the flights on screen between grabs.
+
+A grab lands every 30 s or more, so the distance and direction shown by
+PlaneDetailsScene would otherwise be frozen for that long. MotionModel keeps
+the last reported position, heading, ground speed and vertical speed of each
+flight and, about once a second (MOTION_UPDATE_INTERVAL), extrapolates where it
+is now along a great circle and recomputes distance and direction from home.
+
+update() is called with every new Overhead result and snaps the tracks back to
+the reported positions. Extrapolation stops after MOTION_MAX_SECONDS so a
+stalled feed doesn't fly aircraft off across the map. The flight dicts
+themselves are never modified.
+"""
+import time
+from threading import Lock
+
+from config import DISTANCE_UNITS
+from utilities import geometry
+
+# Optional config values
+try:
+    from config import MOTION_UPDATE_INTERVAL
+except (ImportError, ModuleNotFoundError, NameError):
+    MOTION_UPDATE_INTERVAL = 1.0
+
+try:
+    from config import MOTION_MAX_SECONDS
+except (ImportError, ModuleNotFoundError, NameError):
+    MOTION_MAX_SECONDS = 90
+
+
+def _number(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value == value else None
+
+
+class MotionModel:
+    def __init__(self, home, metric=None, interval=MOTION_UPDATE_INTERVAL, max_seconds=MOTION_MAX_SECONDS):
+        self.home = (float(home[0]), float(home[1]))
+        self.metric = (str(DISTANCE_UNITS).lower() == "metric") if metric is None else metric
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self._tracks = {}
+        self._estimates = {}
+        self._estimated_at = None
+        self._lock = Lock()
+
+    def update(self, flights, now=None):
+        """Snap to the positions in a fresh Overhead result (a list of flight dicts)."""
+        now = time.time() if now is None else now
+        tracks = {}
+        for f in flights or []:
+            key = f.get("callsign")
+            lat = _number(f.get("plane_latitude"))
+            lon = _number(f.get("plane_longitude"))
+            heading = _number(f.get("heading"))
+            speed = _number(f.get("ground_speed"))
+            if not key or None in (lat, lon, heading, speed):
+                continue
+            # FR24's own position timestamp when it's sane, else assume it's current
+            fixed_at = _number(f.get("position_time"))
+            if fixed_at is None or not 0 <= now - fixed_at <= self.max_seconds:
+                fixed_at = now
+            tracks[key] = {
+                "latitude": lat,
+                "longitude": lon,
+                "heading": heading,
+                "ground_speed": speed,
+                "altitude": _number(f.get("altitude")),
+                "vertical_speed": _number(f.get("vertical_speed")) or 0.0,
+                "time": fixed_at,
+            }
+        with self._lock:
+            self._tracks = tracks
+            self._estimates = {}
+            self._estimated_at = None
+
+    def estimate(self, flight, now=None):
+        """
+        Current estimate for a flight dict: latitude, longitude, altitude,
+        distance, bearing and direction. None if it can't be dead-reckoned.
+        """
+        key = flight.get("callsign") if flight else None
+        if not key:
+            return None
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._estimated_at is None or not 0 <= now - self._estimated_at < self.interval:
+                self._estimates = self._extrapolate(now)
+                self._estimated_at = now
+            return self._estimates.get(key)
+
+    def _extrapolate(self, now):
+        if not self._tracks:
+            return {}
+        keys = list(self._tracks)
+        tracks = [self._tracks[k] for k in keys]
+        elapsed = [min(max(now - t["time"], 0.0), self.max_seconds) for t in tracks]
+        per_hour = geometry.MILES_PER_NM * (geometry.KM_PER_MILE if self.metric else 1.0)
+        travelled = [t["ground_speed"] * per_hour * s / 3600.0 for t, s in zip(tracks, elapsed)]
+
+        lat, lon = geometry.destination(
+            [t["latitude"] for t in tracks],
+            [t["longitude"] for t in tracks],
+            [t["heading"] for t in tracks],
+            travelled,
+            metric=self.metric,
+        )
+        home_lat, home_lon = self.home
+        distances = geometry.haversine(lat, lon, home_lat, home_lon, metric=self.metric)
+        bearings = geometry.initial_bearing(home_lat, home_lon, lat, lon)
+        directions = geometry.cardinal(bearings)
+
+        estimates = {}
+        for i, (key, t) in enumerate(zip(keys, tracks)):
+            altitude = t["altitude"]
+            if altitude is not None:
+                # vertical_speed is feet per minute
+                altitude = max(0.0, altitude + t["vertical_speed"] * elapsed[i] / 60.0)
+            estimates[key] = {
+                "latitude": float(lat[i]),
+                "longitude": float(lon[i]),
+                "altitude": altitude,
+                "distance": float(distances[i]),
+                "bearing": float(bearings[i]),
+                "direction": str(directions[i]),
+            }
+        return estimates
@@ -1,20 +1,13 @@
 import os
 import json
-import math
-from time import sleep
+from time import sleep, time
 from threading import Thread, Lock
 from datetime import datetime, timezone
 from urllib.request import urlopen, Request
 from urllib.error import HTTPError, URLError
-
-try:
-    from PIL import Image, ImageEnhance, ImageOps
-except Exception:
-    Image = None
 
 from FlightRadar24.api import FlightRadar24API
-from requests.exceptions import ConnectionError
-from urllib3.exceptions import NewConnectionError, MaxRetryError
+from FlightRadar24.core import Core
 
 from config import (
     DISTANCE_UNITS,
@@ -24,6 +17,15 @@ from config import (
 )
 
 from setup import email_alerts
+from utilities import fr24_trace
+from utilities import fr24_breaker
+from utilities import debug_capture
+from utilities import image_cache
+from utilities import logo_misses
+from utilities import logo_pipeline
+from utilities import geometry
+from utilities import zone_tiles
+from utilities.logo_prefetch import LogoPrefetcher, logo_candidates
 from web import map_generator, upload_helper
 
 # Optional config values
@@ -41,25 +43,45 @@ except (ImportError, ModuleNotFoundError, NameError):
                     "br_y": 41.851654, "br_x": -87.573027}
     LOCATION_DEFAULT = [41.882724, -87.623350]
 
+# Optional polygon geofences ([[lat, lon], ...] each); the zone fetched becomes their bounding box
+try:
+    from config import ZONE_POLYGONS
+except (ImportError, ModuleNotFoundError, NameError):
+    ZONE_POLYGONS = []
+ZONE_POLYGONS = [p for p in (ZONE_POLYGONS or []) if len(p) >= 3]
+if ZONE_POLYGONS:
+    ZONE_DEFAULT = geometry.polygons_zone(ZONE_POLYGONS)
+
 # New: max recent flights to track
 try:
     from config import MAX_RECENT_FLIGHTS
 except (ImportError, ModuleNotFoundError, NameError):
     MAX_RECENT_FLIGHTS = 20
 
+# Optional: send FR24 requests somewhere else (e.g. scripts/fr24_standin.py)
+try:
+    from config import FR24_BASE_URL
+except (ImportError, ModuleNotFoundError, NameError):
+    FR24_BASE_URL = None
+FR24_BASE_URL = os.environ.get("PLANE_TRACKER_FR24_URL") or FR24_BASE_URL
+
+# Optional: seconds ahead to predict each flight's closest approach when picking which to detail (0 = nearest now)
+try:
+    from config import CPA_HORIZON
+except (ImportError, ModuleNotFoundError, NameError):
+    CPA_HORIZON = 120
+
 # Constants
 RETRIES = 3
 RATE_LIMIT_DELAY = 1
 MAX_FLIGHT_LOOKUP = 5
 MAX_ALTITUDE = 100000
-EARTH_RADIUS_M = 3958.8
 BLANK_FIELDS = ["", "N/A", "NONE"]
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 LOG_FILE = os.path.join(BASE_DIR, "close.txt")
 LOG_FILE_FARTHEST = os.path.join(BASE_DIR, "farthest.txt")
 LOG_FILE_RECENT = os.path.join(BASE_DIR, "recent_flights.json")
-LOG_FILE_DEBUG = os.path.join(BASE_DIR, "debug_latest_flight.json")
 
 FLAGS_DIR = os.path.join(BASE_DIR, "flags")
 FIXTURE_FLAG_FILE = os.path.join(FLAGS_DIR, "force_fixture.on")
@@ -72,7 +94,6 @@ LOGO_DIR_CANDIDATES = [
 WEB_LOGO_EXTS = ("png", "jpg", "jpeg", "svg")
 FLIGHTAWARE_LOGO_URL = "https://www.flightaware.com/images/airline_logos/180px/{}.png"
 LOGO_USER_AGENT = "Mozilla/5.0"
-DISPLAY_LOGO_SIZE = (16, 16)
 
 # --- Utility Functions ---
 
@@ -112,44 +133,14 @@ def _web_logo_exists(icao: str, base: str):
             return True
     return False
 
-
-def _write_display_logo(content: bytes, path: str):
-    if Image is None:
-        return
-    try:
-        from io import BytesIO
-        with Image.open(BytesIO(content)) as img:
-            img = img.convert("RGBA")
-            img = img.resize(DISPLAY_LOGO_SIZE, Image.LANCZOS)
-            background = Image.new("RGBA", DISPLAY_LOGO_SIZE, (255, 255, 255, 255))
-            background.paste(img, (0, 0), img)
-            flattened = background.convert("RGB")
-            flattened = ImageOps.autocontrast(flattened)
-            flattened = ImageEnhance.Contrast(flattened).enhance(1.4)
-            flattened = ImageEnhance.Color(flattened).enhance(1.2)
-            flattened.save(path, format="PNG")
-    except Exception:
-        pass
 
 def ordinal(n: int):
     return f"{n}{'tsnrhtdd'[(n//10 % 10 != 1) * (n % 10 < 4) * n % 10::4]}"
 
 
 def haversine(lat1, lon1, lat2, lon2):
-    lat1, lon1 = map(math.radians, (lat1, lon1))
-    lat2, lon2 = map(math.radians, (lat2, lon2))
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = math.sin(dlat / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    miles = EARTH_RADIUS_M * c
-    return miles * 1.609 if DISTANCE_UNITS == "metric" else miles
-
-
-def degrees_to_cardinal(deg):
-    dirs = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
-    idx = int((deg + 22.5) / 45)
-    return dirs[idx % 8]
+    # One pair of points through the batch version (see utilities/geometry.py)
+    return float(geometry.haversine([lat1], [lon1], lat2, lon2, metric=DISTANCE_UNITS == "metric")[0])
 
 
 def _parse_recent_timestamp(value):
@@ -169,21 +160,6 @@ def _parse_recent_timestamp(value):
     return datetime.min
 
 
-def plane_bearing(flight, home=LOCATION_DEFAULT):
-    lat1, lon1 = map(math.radians, home)
-    lat2, lon2 = map(math.radians, (flight.latitude, flight.longitude))
-    b = math.atan2(
-        math.sin(lon2 - lon1) * math.cos(lat2),
-        math.cos(lat1) * math.sin(lat2)
-        - math.sin(lat1) * math.cos(lat2) * math.cos(lon2 - lon1)
-    )
-    return (math.degrees(b) + 360) % 360
-
-
-def distance_from_flight_to_home(flight):
-    return haversine(flight.latitude, flight.longitude, LOCATION_DEFAULT[0], LOCATION_DEFAULT[1])
-
-
 def distance_to_point(flight, lat, lon):
     return haversine(flight.latitude, flight.longitude, lat, lon)
 
@@ -350,40 +326,56 @@ def log_farthest_flight(entry: dict):
     except Exception as e:
         print("Failed to log farthest flight:", e)
 
-def write_debug_flight(raw_details, flight):
-    try:
-        debug = {
-            "timestamp": email_alerts.get_timestamp(),
-            "callsign": flight.callsign,
-            "flight_object": {
-                "latitude": flight.latitude,
-                "longitude": flight.longitude,
-                "altitude": flight.altitude,
-                "origin_iata": flight.origin_airport_iata,
-                "destination_iata": flight.destination_airport_iata,
-                "airline_iata": flight.airline_iata,
-                "airline_icao": flight.airline_icao,
-            },
-            "raw_api_response": raw_details
-        }
-
-        with open(LOG_FILE_DEBUG, "w", encoding="utf-8") as f:
-            json.dump(debug, f, indent=4)
+def debug_flight_summary(flight):
+    """The listing fields kept next to each raw details capture."""
+    return {
+        "latitude": flight.latitude,
+        "longitude": flight.longitude,
+        "altitude": flight.altitude,
+        "origin_iata": flight.origin_airport_iata,
+        "destination_iata": flight.destination_airport_iata,
+        "airline_iata": flight.airline_iata,
+        "airline_icao": flight.airline_icao,
+    }
 
-    except Exception as e:
-        print("Failed to write debug flight:", e)
+
+def _apply_fr24_base_url(base_url):
+    """Point the bounds listing and flight details requests at base_url."""
+    if not base_url:
+        return
+    base_url = base_url.rstrip("/")
+    Core.real_time_flight_tracker_data_url = base_url + "/zones/fcgi/feed.js"
+    Core.flight_data_url = base_url + "/clickhandler/?flight={}"
 
 
 # --- Overhead Class ---
 
 class Overhead:
-    def __init__(self):
-        self._api = FlightRadar24API()
+    def __init__(self, api=None, rate_limit_delay=RATE_LIMIT_DELAY, breaker=None):
+        _apply_fr24_base_url(FR24_BASE_URL)
+        # api may be injected (e.g. fr24_trace.ReplayAPI); default is the live client
+        # Every FR24 request goes through the circuit breaker (see utilities/fr24_breaker.py);
+        # breaker may be injected too, e.g. one that keeps its status out of the live fr24_status.json
+        self._breaker = breaker if breaker is not None else fr24_breaker.CircuitBreaker()
+        self._api = fr24_breaker.GuardedAPI(api if api is not None else FlightRadar24API(), self._breaker)
+        self._rate_limit_delay = rate_limit_delay
+        # Shared by zone tile fetches and detail lookups
+        self._limiter = zone_tiles.RateLimiter(rate_limit_delay)
+        self._recorder = None
+        self._debug = debug_capture.DebugCaptureStore()
         self._lock = Lock()
         self._data = []
         self._new_data = False
         self._processing = False
-        self._logo_cache = set()
+        # What the last grab saw, for the poll scheduler (see utilities/poll_scheduler.py)
+        self._traffic = {}
+        self._throttled_at = None
+        # Logos are downloaded on a background pool, fed from the whole listing
+        self._logo_prefetcher = LogoPrefetcher(self._fetch_airline_logos)
+        # Codes FlightAware has no logo for, persisted with a retry backoff
+        self._logo_misses = logo_misses.LogoMissCache(
+            os.path.join(_select_logo_dir(), logo_misses.MISSES_NAME)
+        )
 
     # Public method
     def grab_data(self):
@@ -427,26 +419,21 @@ class Overhead:
         return cur
 
 
-    def _cache_airline_logo(self, owner_iata: str, owner_icao: str, callsign: str):
-        icao_candidates = []
-        if owner_icao and str(owner_icao).upper() not in BLANK_FIELDS:
-            icao_candidates.append(str(owner_icao).upper())
-        if callsign:
-            prefix = str(callsign).strip()[:3].upper()
-            if prefix and prefix not in BLANK_FIELDS:
-                icao_candidates.append(prefix)
-
-        if not icao_candidates:
-            return
+    def _cache_airline_logo(self, owner_icao: str, callsign: str):
+        # Non-blocking: new codes are fetched by the prefetch pool
+        self._logo_prefetcher.submit(logo_candidates(owner_icao, callsign))
 
+    def _fetch_airline_logos(self, icao_candidates):
+        """Runs on a prefetch thread: download the first missing logo and build its 16x16 version."""
         logo_dir = _select_logo_dir()
         os.makedirs(logo_dir, exist_ok=True)
 
         for icao in icao_candidates:
-            if not icao or icao in self._logo_cache:
-                continue
             if _web_logo_exists(icao, logo_dir):
-                self._logo_cache.add(icao)
+                continue
+            if self._logo_misses.should_skip(icao):
+                # Let a later grab submit it again once the backoff is over
+                self._logo_prefetcher.forget(icao)
                 continue
 
             url = FLIGHTAWARE_LOGO_URL.format(icao)
@@ -454,25 +441,51 @@ class Overhead:
                 req = Request(url, headers={"User-Agent": LOGO_USER_AGENT})
                 with urlopen(req, timeout=10) as resp:
                     content = resp.read()
-            except (HTTPError, URLError):
-                self._logo_cache.add(icao)
+            except HTTPError as e:
+                # 404 and friends: FlightAware has no logo, back off; 5xx/429 retry soon
+                self._logo_misses.record_miss(icao, transient=e.code >= 500 or e.code == 429)
+                self._logo_prefetcher.forget(icao)
+                continue
+            except (URLError, OSError):
+                self._logo_misses.record_miss(icao, transient=True)
+                self._logo_prefetcher.forget(icao)
                 continue
 
             if not content:
-                self._logo_cache.add(icao)
+                self._logo_misses.record_miss(icao)
+                self._logo_prefetcher.forget(icao)
                 continue
 
             filename = f"{icao}--web.png"
             path = os.path.join(logo_dir, filename)
             try:
-                with open(path, "wb") as f:
+                # temp file + rename: the web app's logo index notices the change
+                with open(path + ".tmp", "wb") as f:
                     f.write(content)
-                _write_display_logo(content, os.path.join(logo_dir, f"{icao}.png"))
+                os.replace(path + ".tmp", path)
             except Exception:
-                self._logo_cache.add(icao)
+                continue
+            # Already on a prefetch thread, so no process pool for a single logo
+            logo_pipeline.build_display_logos(
+                [(path, os.path.join(logo_dir, f"{icao}.png"))], processes=0
+            )
+            self._logo_misses.record_hit(icao)
+            # Drop a cached "no logo" so the display shows it on first appearance
+            image_cache.shared().discard(("logo", icao))
             break
 
 
+    def _api_for_grab(self):
+        """The API to use this grab, wrapped in a trace recorder while the flag is on."""
+        if fr24_trace.recording_enabled():
+            if self._recorder is None:
+                self._recorder = fr24_trace.TraceRecorder()
+            return fr24_trace.RecordingAPI(self._api, self._recorder)
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+        return self._api
+
     # Core data grab
     def _grab(self):
         with self._lock:
@@ -501,20 +514,67 @@ class Overhead:
         data = []
 
         try:
-            bounds = self._api.get_bounds(ZONE_DEFAULT)
-            flights = self._api.get_flights(bounds=bounds)
-            flights = [f for f in flights if MIN_ALTITUDE < f.altitude < MAX_ALTITUDE]
-            flights.sort(key=lambda f: distance_from_flight_to_home(f))
-            flights = flights[:MAX_FLIGHT_LOOKUP]
-
+            api = self._api_for_grab()
+            # Large zones are fetched as tiles and merged (see utilities/zone_tiles.py)
+            flights = zone_tiles.get_zone_flights(api, ZONE_DEFAULT, limiter=self._limiter)
+
+            # Filter, distances and directions for the whole listing in one pass, then the nearest few
+            lat, lon, alt = geometry.flight_positions(flights)
+            airborne = geometry.in_range(alt, MIN_ALTITUDE, MAX_ALTITUDE)
+            flights = [flights[i] for i in airborne]
+            lat, lon, alt = (geometry.take(v, airborne) for v in (lat, lon, alt))
+            if ZONE_POLYGONS:
+                # The bounds query is the polygons' bounding box; keep only what's inside them
+                inside = geometry.in_polygons(lat, lon, ZONE_POLYGONS)
+                flights = [flights[i] for i in inside]
+                lat, lon, alt = (geometry.take(v, inside) for v in (lat, lon, alt))
+
+            # Warm logos for everything in the zone, not just the flights detailed below
             for f in flights:
+                self._cache_airline_logo(f.airline_icao, f.callsign)
+
+            home_lat, home_lon = LOCATION_DEFAULT[0], LOCATION_DEFAULT[1]
+            metric = DISTANCE_UNITS == "metric"
+            distances = geometry.haversine(lat, lon, home_lat, home_lon, metric=metric)
+            # Line of sight from home, altitude included
+            slant = geometry.slant_range(distances, alt, metric=metric)
+            # Rank by how close each flight will pass within CPA_HORIZON, so one about to
+            # fly overhead beats one that is near but heading away
+            heading, speed = geometry.flight_velocities(flights)
+            cpa_distances, cpa_times = geometry.closest_approach(
+                lat, lon, heading, speed, home_lat, home_lon, CPA_HORIZON, metric=metric
+            )
+            picked = geometry.nearest_k(cpa_distances if CPA_HORIZON > 0 else distances, MAX_FLIGHT_LOOKUP)
+            approaching = geometry.in_range(cpa_times, 0, float("inf"))
+            traffic = {
+                "time": time(),
+                "flights": len(flights),
+                "approaches": [(float(cpa_distances[i]), float(cpa_times[i])) for i in approaching],
+            }
+            directions = geometry.cardinal(geometry.initial_bearing(
+                home_lat, home_lon, geometry.take(lat, picked), geometry.take(lon, picked)
+            ))
+            nearest = [
+                (flights[i], float(distances[i]), float(slant[i]), str(direction),
+                 float(cpa_distances[i]), float(cpa_times[i]))
+                for i, direction in zip(picked, directions)
+            ]
+
+            for f, distance, slant_distance, direction, cpa_distance, cpa_time in nearest:
+                # FR24 is failing: don't spend the rest of the lookups finding that out again
+                if not self._breaker.allow():
+                    break
                 retries = RETRIES
                 while retries:
-                    sleep(RATE_LIMIT_DELAY)
+                    self._limiter.wait()
                     try:
-                        d = self._api.get_flight_details(f)
+                        d = api.get_flight_details(f)
 
-                        write_debug_flight(d, f)
+                        self._debug.add(
+                            "details", d,
+                            callsign=f.callsign,
+                            flight_object=debug_flight_summary(f),
+                        )
 
                         plane = self.safe_get(d, "aircraft", "model", "code", default="") or f.airline_icao or ""
                         airline = self.safe_get(d, "airline", "name", default="")
@@ -575,7 +635,8 @@ class Overhead:
                             "plane_latitude": f.latitude,
                             "plane_longitude": f.longitude,
                             "vertical_speed": f.vertical_speed,
-                            "direction": degrees_to_cardinal(plane_bearing(f)),
+                            "position_time": getattr(f, "time", None),
+                            "direction": direction,
                             "heading": (
                                 self.safe_get(d, "trail", 0, "hd")
                                 or getattr(f, "heading", None)
@@ -609,7 +670,10 @@ class Overhead:
                             # --- Distances ---
                             "distance_origin": dist_o,
                             "distance_destination": dist_d,
-                            "distance": distance_from_flight_to_home(f),
+                            "distance": distance,
+                            "slant_distance": slant_distance,
+                            "cpa_distance": cpa_distance,
+                            "cpa_seconds": cpa_time,
 
                             # --- Aircraft image (JetPhotos via FR24) ---
                             "aircraft_image": self.safe_get(
@@ -632,11 +696,7 @@ class Overhead:
                         entry["flightaware_history"] = urls["history"]
                         entry["flightaware_hint"] = urls["hint"]
 
-                        self._cache_airline_logo(
-                            entry.get("owner_iata"),
-                            entry.get("owner_icao"),
-                            entry.get("callsign"),
-                        )
+                        self._cache_airline_logo(entry.get("owner_icao"), entry.get("callsign"))
 
                         # Append to current data
                         data.append(entry)
@@ -655,8 +715,18 @@ class Overhead:
                         safe_write_json(LOG_FILE_RECENT, recent_flights)
 
                         break
-                    except Exception:
+                    except fr24_breaker.CircuitOpenError:
+                        break
+                    except Exception as e:
+                        if fr24_breaker.throttled(e):
+                            self._throttled_at = time()
                         retries -= 1
+                        # Only timeouts, connection errors and 5xx are worth another go
+                        if not retries or not fr24_breaker.retryable(e):
+                            break
+                        sleep(fr24_breaker.backoff(RETRIES - retries - 1))
+
+            self._debug.service()
 
             recent_flights = safe_load_json(LOG_FILE_RECENT)
             map_entries = [e for e in recent_flights if is_recent_map_compatible(e)]
@@ -667,11 +737,16 @@ class Overhead:
                 self._new_data = True
                 self._processing = False
                 self._data = data
+                self._traffic = traffic
 
-        except (ConnectionError, NewConnectionError, MaxRetryError):
+        except fr24_breaker.UNAVAILABLE_ERRORS as e:
+            if fr24_breaker.throttled(e):
+                self._throttled_at = time()
             with self._lock:
                 self._new_data = False
                 self._processing = False
+        finally:
+            self._breaker.write_status()
 
     # --- Properties ---
     @property
@@ -694,6 +769,25 @@ class Overhead:
     def data_is_empty(self):
         return len(self._data) == 0
 
+    @property
+    def traffic(self):
+        """Zone summary from the last grab: time, flights, approaches [(cpa distance, seconds)], throttled_at, retry_at."""
+        with self._lock:
+            return dict(
+                self._traffic,
+                throttled_at=self._throttled_at,
+                retry_at=self._breaker.open_until if self._breaker.down else None,
+            )
+
+    @property
+    def api_down(self):
+        """True while the FR24 circuit breaker is open or testing the water."""
+        return self._breaker.down
+
+    @property
+    def api_status(self):
+        return self._breaker.status()
+
 
 # --- Main ---
 if __name__ == "__main__":
@@ -0,0 +1,204 @@
+"""
+Adaptive interval between Overhead grabs.
+
+The display used to grab every 30 s whatever was going on. PollScheduler
+starts from POLL_INTERVAL and adjusts it, within POLL_INTERVAL_MIN and
+POLL_INTERVAL_MAX, from what the last grab saw and the state of the screen:
+
+- screen off: no grabs, as before; set POLL_INTERVAL_SCREEN_OFF to keep
+  grabbing at that interval while off (e.g. to keep the web pages current)
+- FR24 throttled us in the last POLL_THROTTLE_WINDOW seconds: 4x, never below POLL_INTERVAL
+- FR24 circuit breaker open: wait until it lets requests through again
+- night window (NIGHT_START..NIGHT_END): 2x
+- empty sky: 2x; POLL_BUSY_FLIGHTS or more in the zone: 0.5x
+- a flight predicted to pass within POLL_APPROACH_DISTANCE of home: poll
+  again around its closest approach if that is sooner
+
+Each decision and the reasons for it are written to poll_status.json (only
+when something changes, plus once per poll) for the web app's /api/poll.
+"""
+import json
+import os
+import time
+from threading import Lock
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+STATUS_FILE = os.path.join(BASE_DIR, "poll_status.json")
+
+# Optional config values
+try:
+    from config import POLL_INTERVAL
+except (ImportError, ModuleNotFoundError, NameError):
+    POLL_INTERVAL = 30
+
+try:
+    from config import POLL_INTERVAL_MIN
+except (ImportError, ModuleNotFoundError, NameError):
+    POLL_INTERVAL_MIN = 15
+
+try:
+    from config import POLL_INTERVAL_MAX
+except (ImportError, ModuleNotFoundError, NameError):
+    POLL_INTERVAL_MAX = 300
+
+try:
+    from config import POLL_INTERVAL_SCREEN_OFF
+except (ImportError, ModuleNotFoundError, NameError):
+    POLL_INTERVAL_SCREEN_OFF = 0
+
+try:
+    from config import POLL_BUSY_FLIGHTS
+except (ImportError, ModuleNotFoundError, NameError):
+    POLL_BUSY_FLIGHTS = 10
+
+try:
+    from config import POLL_APPROACH_DISTANCE
+except (ImportError, ModuleNotFoundError, NameError):
+    POLL_APPROACH_DISTANCE = 2.0
+
+try:
+    from config import POLL_THROTTLE_WINDOW
+except (ImportError, ModuleNotFoundError, NameError):
+    POLL_THROTTLE_WINDOW = 600
+
+
+class PollScheduler:
+    def __init__(
+        self,
+        interval=POLL_INTERVAL,
+        floor=POLL_INTERVAL_MIN,
+        ceiling=POLL_INTERVAL_MAX,
+        screen_off_interval=POLL_INTERVAL_SCREEN_OFF,
+        status_file=STATUS_FILE,
+    ):
+        self.base = float(interval)
+        self.floor = float(floor)
+        self.ceiling = max(float(ceiling), self.floor)
+        self.screen_off_interval = screen_off_interval
+        self.status_file = status_file
+
+        # None = don't poll until something changes
+        self.interval = self.base
+        self.reasons = []
+        self.last_poll = None
+        self.polls = 0
+        self._inputs = {}
+        self._lock = Lock()
+
+    def _decide(self, traffic, screen_on, night, now):
+        reasons = []
+        if not screen_on:
+            if not self.screen_off_interval:
+                return None, ["screen off: paused"]
+            return self._clamp(self.screen_off_interval), ["screen off"]
+
+        interval = self.base
+        throttled_at = traffic.get("throttled_at")
+        if throttled_at is not None and now - throttled_at < POLL_THROTTLE_WINDOW:
+            interval = max(interval * 4, self.base)
+            reasons.append("throttled x4")
+        if night:
+            interval *= 2
+            reasons.append("night x2")
+
+        flights = traffic.get("flights")
+        if flights == 0:
+            interval *= 2
+            reasons.append("empty sky x2")
+        elif flights is not None and flights >= POLL_BUSY_FLIGHTS:
+            interval *= 0.5
+            reasons.append(f"{flights} flights x0.5")
+
+        # Catch the next close pass near its closest point, if that comes sooner
+        fetched_at = traffic.get("time")
+        approaches = [
+            t for d, t in traffic.get("approaches") or [] if d <= POLL_APPROACH_DISTANCE
+        ]
+        if approaches and fetched_at is not None:
+            soonest = min(approaches)
+            since_poll = (fetched_at - self.last_poll) if self.last_poll is not None else 0.0
+            until = since_poll + soonest
+            if until < interval:
+                interval = until
+                reasons.append(f"approach in {soonest:.0f}s")
+
+        # No point grabbing while the FR24 circuit breaker would refuse the request
+        retry_at = traffic.get("retry_at")
+        if retry_at is not None and self.last_poll is not None and retry_at - self.last_poll > interval:
+            interval = retry_at - self.last_poll
+            reasons.append("FR24 circuit open")
+
+        interval = self._clamp(interval)
+        return interval, reasons or ["default"]
+
+    def _clamp(self, interval):
+        return min(max(float(interval), self.floor), self.ceiling)
+
+    def update(self, traffic, screen_on=True, night=False, now=None):
+        """Re-plan from the latest Overhead traffic summary and screen state; returns the interval."""
+        now = time.time() if now is None else now
+        traffic = traffic or {}
+        with self._lock:
+            interval, reasons = self._decide(traffic, screen_on, night, now)
+            changed = interval != self.interval or reasons != self.reasons
+            self.interval, self.reasons = interval, reasons
+            self._inputs = {
+                "screen_on": bool(screen_on),
+                "night": bool(night),
+                "flights": traffic.get("flights"),
+                "throttled_at": traffic.get("throttled_at"),
+                "retry_at": traffic.get("retry_at"),
+            }
+        if changed:
+            self.write_status()
+        return interval
+
+    def due(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            if self.interval is None:
+                return False
+            return self.last_poll is None or now - self.last_poll >= self.interval
+
+    def polled(self, now=None):
+        with self._lock:
+            self.last_poll = time.time() if now is None else now
+            self.polls += 1
+        self.write_status()
+
+    def status(self):
+        with self._lock:
+            next_poll = None
+            if self.interval is not None and self.last_poll is not None:
+                next_poll = self.last_poll + self.interval
+            return {
+                "interval": self.interval,
+                "reasons": list(self.reasons),
+                "floor": self.floor,
+                "ceiling": self.ceiling,
+                "last_poll": self.last_poll,
+                "next_poll": next_poll,
+                "polls": self.polls,
+                "inputs": dict(self._inputs),
+                "updated": time.time(),
+            }
+
+    def write_status(self):
+        if not self.status_file:
+            return
+        tmp = self.status_file + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.status(), f, indent=2)
+            os.replace(tmp, self.status_file)
+        except OSError as e:
+            print("Failed to write poll status:", e)
+
+
+def read_status(path=STATUS_FILE):
+    """Last decision written by the display process, or None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,73 @@
+from threading import Lock
+import weakref
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Sprite(object):
+    """
+    Pixels of a PIL image, converted once and reused on every redraw.
+
+    rgb   (h, w, 3) uint8 array (None without numpy)
+    mask  (h, w) bool array of non-black pixels (None without numpy)
+    lit   tuple of (dx, dy, r, g, b) for every non-black pixel, for canvases
+          that can only SetPixel
+    """
+
+    __slots__ = ("width", "height", "rgb", "mask", "lit")
+
+    def __init__(self, pil_img):
+        img = pil_img.convert("RGB")
+        self.width, self.height = img.size
+
+        if np is not None:
+            self.rgb = np.array(img, dtype=np.uint8)
+            self.mask = np.any(self.rgb != 0, axis=2)
+            ys, xs = np.nonzero(self.mask)
+            self.lit = tuple(
+                (int(dx), int(dy)) + tuple(int(v) for v in self.rgb[dy, dx])
+                for dy, dx in zip(ys, xs)
+            )
+            return
+
+        self.rgb = None
+        self.mask = None
+        pix = img.load()
+        lit = []
+        for dy in range(self.height):
+            for dx in range(self.width):
+                r, g, b = pix[dx, dy]
+                if r or g or b:
+                    lit.append((dx, dy, r, g, b))
+        self.lit = tuple(lit)
+
+
+# id(source image) -> (weakref to the image, Sprite). PIL images are unhashable,
+# so entries are keyed by id and dropped when the scene's own cache lets go.
+_sprites = {}
+_sprites_lock = Lock()
+
+
+def _forget(key):
+    with _sprites_lock:
+        _sprites.pop(key, None)
+
+
+def sprite_for(pil_img) -> Sprite:
+    """Return the cached Sprite for pil_img, converting it on first use."""
+    key = id(pil_img)
+    with _sprites_lock:
+        entry = _sprites.get(key)
+        if entry is not None and entry[0]() is pil_img:
+            sprite = entry[1]
+            if (sprite.width, sprite.height) == pil_img.size:
+                return sprite
+
+    sprite = Sprite(pil_img)
+    ref = weakref.ref(pil_img, lambda _ref, key=key: _forget(key))
+    with _sprites_lock:
+        _sprites[key] = (ref, sprite)
+    return sprite
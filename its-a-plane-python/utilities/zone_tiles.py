@@ -0,0 +1,113 @@
+"""
+Fetching large tracking zones as several smaller bounds queries.
+
+The FR24 feed truncates the listing for big boxes, so a zone widened to a
+whole metro area silently loses aircraft. get_zone_flights() splits the zone
+into tiles of at most ZONE_TILE_SPAN degrees a side, fetches them on a few
+threads (each request still goes through the shared RateLimiter), and merges
+the listings, keeping one entry per aircraft.
+
+A zone that fits in one tile is a single get_flights call, as before.
+"""
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+# Optional config values
+try:
+    from config import ZONE_TILE_SPAN
+except (ImportError, ModuleNotFoundError, NameError):
+    # ~17 x 12 miles: small enough that FR24 returns a busy hub's tile in full
+    ZONE_TILE_SPAN = 0.25
+
+try:
+    from config import ZONE_TILE_WORKERS
+except (ImportError, ModuleNotFoundError, NameError):
+    ZONE_TILE_WORKERS = 4
+
+
+class RateLimiter:
+    """Spaces calls at least interval seconds apart, across threads."""
+
+    def __init__(self, interval):
+        self.interval = max(0.0, float(interval))
+        self._next = 0.0
+        self._lock = Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def split_zone(zone, span=ZONE_TILE_SPAN):
+    """Split a {"tl_y", "tl_x", "br_y", "br_x"} zone into a grid of equal tiles no wider than span."""
+    height = zone["tl_y"] - zone["br_y"]
+    width = zone["br_x"] - zone["tl_x"]
+    if not span or span <= 0:
+        return [zone]
+    rows = max(1, math.ceil(height / span))
+    cols = max(1, math.ceil(width / span))
+
+    tiles = []
+    for r in range(rows):
+        top = zone["tl_y"] - height * r / rows
+        bottom = zone["tl_y"] - height * (r + 1) / rows
+        for c in range(cols):
+            tiles.append({
+                "tl_y": top,
+                "tl_x": zone["tl_x"] + width * c / cols,
+                "br_y": bottom,
+                "br_x": zone["tl_x"] + width * (c + 1) / cols,
+            })
+    return tiles
+
+
+def merge_flights(listings):
+    """One Flight per aircraft id across tile listings, keeping the most recent position."""
+    merged = {}
+    for flights in listings:
+        for f in flights:
+            seen = merged.get(f.id)
+            if seen is None or (getattr(f, "time", 0) or 0) > (getattr(seen, "time", 0) or 0):
+                merged[f.id] = f
+    return list(merged.values())
+
+
+def fetch_tiles(api, zone, limiter=None, span=ZONE_TILE_SPAN, workers=ZONE_TILE_WORKERS):
+    tiles = split_zone(zone, span)
+
+    def fetch(tile):
+        if limiter is not None:
+            limiter.wait()
+        return api.get_flights(bounds=api.get_bounds(tile))
+
+    if len(tiles) == 1:
+        return fetch(tiles[0])
+
+    listings = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tiles))), thread_name_prefix="zone-tile") as pool:
+        for future in [pool.submit(fetch, tile) for tile in tiles]:
+            try:
+                listings.append(future.result())
+            except Exception as e:
+                errors.append(e)
+
+    if errors:
+        if not listings:
+            raise errors[0]
+        print(f"Zone tiles: {len(errors)} of {len(tiles)} failed, using the rest:", errors[0])
+    return merge_flights(listings)
+
+
+def get_zone_flights(api, zone, limiter=None):
+    """Flights in zone; APIs that handle whole zones themselves (trace record/replay) are asked directly."""
+    own = getattr(api, "get_zone_flights", None)
+    if own is not None:
+        return own(zone, limiter=limiter)
+    return fetch_tiles(api, zone, limiter)
@@ -0,0 +1,142 @@
+"""
+Headless stand-in for the rgbmatrix bindings.
+
+Implements the parts of RGBMatrix / RGBMatrixOptions / FrameCanvas that the
+display uses, on top of a NumPy framebuffer, so the real Display class can
+run (and be profiled) on a machine without an LED HAT. Select it with
+MATRIX_BACKEND = "virtual" in config.py or PLANE_TRACKER_MATRIX=virtual.
+
+Frames can be dumped to PNG: set options.dump_dir (or the env var
+PLANE_TRACKER_MATRIX_DUMP) and optionally options.dump_every.
+"""
+import os
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+from utilities import framebuffer
+
+if not framebuffer.AVAILABLE:
+    raise ImportError("virtualmatrix needs numpy (pip install numpy)")
+
+
+class RGBMatrixOptions(object):
+    def __init__(self):
+        self.hardware_mapping = "regular"
+        self.rows = 32
+        self.cols = 32
+        self.chain_length = 1
+        self.parallel = 1
+        self.row_address_type = 0
+        self.multiplexing = 0
+        self.pwm_bits = 11
+        self.brightness = 100
+        self.pwm_lsb_nanoseconds = 130
+        self.led_rgb_sequence = "RGB"
+        self.pixel_mapper_config = ""
+        self.show_refresh_rate = 0
+        self.gpio_slowdown = 1
+        self.disable_hardware_pulsing = False
+        self.drop_privileges = True
+
+        # Virtual-only
+        self.dump_dir = os.environ.get("PLANE_TRACKER_MATRIX_DUMP") or None
+        self.dump_every = 1
+
+
+class FrameCanvas(object):
+    """An offscreen canvas: the pixels live in a FrameBuffer."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.brightness = 100
+        self.pwmBits = 11
+        self.buffer = framebuffer.FrameBuffer(width, height)
+
+    def Clear(self):
+        self.buffer.clear()
+
+    def Fill(self, red, green, blue):
+        self.buffer.pixels[:, :] = (red, green, blue)
+
+    def SetPixel(self, x, y, red, green, blue):
+        self.buffer.set_pixel(int(x), int(y), red, green, blue)
+
+    def SetImage(self, image, offset_x=0, offset_y=0, unsafe=True):
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        # Frames from the compositor are new image objects every time, so
+        # copy directly rather than going through the sprite cache.
+        self.buffer.blit_array(framebuffer.np.asarray(image), int(offset_x), int(offset_y))
+
+    def image(self):
+        """PIL copy of what this canvas holds."""
+        return Image.fromarray(self.buffer.pixels.copy(), "RGB")
+
+
+class RGBMatrix(object):
+    def __init__(self, rows=32, chains=1, parallel=1, options=None):
+        if options is None:
+            options = RGBMatrixOptions()
+            options.rows = rows
+            options.chain_length = chains
+            options.parallel = parallel
+        self.options = options
+        self.width = options.cols * options.chain_length
+        self.height = options.rows * options.parallel
+        self.brightness = options.brightness
+
+        self._front = FrameCanvas(self.width, self.height)
+        self.swaps = 0
+
+        self._dump_dir = options.dump_dir
+        self._dump_every = max(1, int(getattr(options, "dump_every", 1) or 1))
+        if self._dump_dir:
+            os.makedirs(self._dump_dir, exist_ok=True)
+
+    # The matrix itself draws straight onto the visible canvas
+    def Clear(self):
+        self._front.Clear()
+
+    def Fill(self, red, green, blue):
+        self._front.Fill(red, green, blue)
+
+    def SetPixel(self, x, y, red, green, blue):
+        self._front.SetPixel(x, y, red, green, blue)
+
+    def SetImage(self, image, offset_x=0, offset_y=0, unsafe=True):
+        self._front.SetImage(image, offset_x, offset_y, unsafe)
+
+    def SetBrightness(self, value):
+        self.brightness = value
+
+    def CreateFrameCanvas(self):
+        return FrameCanvas(self.width, self.height)
+
+    def SwapOnVSync(self, canvas, framerate_fraction=1):
+        """Show canvas and hand back the previously visible one, like the C++ matrix."""
+        previous = self._front
+        self._front = canvas
+        self.swaps += 1
+        if self._dump_dir and self.swaps % self._dump_every == 0:
+            self.dump_frame()
+        return previous
+
+    @property
+    def front(self):
+        """The visible FrameCanvas."""
+        return self._front
+
+    def dump_frame(self, path=None):
+        """Write the visible frame to a PNG (frame_<swap>.png in dump_dir by default)."""
+        if Image is None:
+            return None
+        if path is None:
+            if not self._dump_dir:
+                return None
+            path = os.path.join(self._dump_dir, f"frame_{self.swaps:06d}.png")
+        self._front.image().save(path)
+        return path
@@ -0,0 +1,65 @@
+"""Software versions of the rgbmatrix.graphics helpers the scenes use."""
+from utilities import bdf
+
+
+class Color(object):
+    def __init__(self, red=0, green=0, blue=0):
+        self.red = red
+        self.green = green
+        self.blue = blue
+
+
+class Font(object):
+    def __init__(self):
+        self.bdf = None
+
+    def LoadFont(self, file):
+        self.bdf = bdf.load(file)
+        return True
+
+    @property
+    def height(self):
+        return self.bdf.height if self.bdf is not None else -1
+
+    @property
+    def baseline(self):
+        return self.bdf.baseline if self.bdf is not None else 0
+
+    def CharacterWidth(self, char):
+        return self.bdf.character_width(char) if self.bdf is not None else -1
+
+
+def _buffer(canvas):
+    buffer = getattr(canvas, "buffer", None)
+    if buffer is None:
+        # RGBMatrix draws on whatever canvas is visible
+        buffer = canvas.front.buffer
+    return buffer
+
+
+def DrawText(canvas, font, x, y, color, text):
+    return _buffer(canvas).text(font, x, y, color, text)
+
+
+def DrawLine(canvas, x1, y1, x2, y2, color):
+    _buffer(canvas).line(x1, y1, x2, y2, color)
+
+
+def DrawCircle(canvas, x, y, r, color):
+    # Midpoint circle, same shape as the C++ helper
+    buffer = _buffer(canvas)
+    rgb = (color.red, color.green, color.blue)
+    dx, dy = r, 0
+    err = 1 - r
+    while dy <= dx:
+        for px, py in (
+            (x + dx, y + dy), (x - dx, y + dy), (x + dx, y - dy), (x - dx, y - dy),
+            (x + dy, y + dx), (x - dy, y + dx), (x + dy, y - dx), (x - dy, y - dx),
+        ):
+            buffer.set_pixel(px, py, *rgb)
+        dy += 1
+        if err < 0:
+            err += 2 * dy + 1
+        else:
+            dx -= 1
+            err += 2 * (dy - dx) + 1
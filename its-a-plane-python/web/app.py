@@ -1,10 +1,14 @@
 #!/usr/bin/python3
-from flask import Flask, render_template, jsonify, send_from_directory
+from flask import Flask, render_template, jsonify, send_from_directory, send_file, request, url_for
+from werkzeug.security import safe_join
 import json
+import mimetypes
 import os
 import subprocess
 import re
 import sys
+import threading
+import time
 
 # /web is the folder that this file lives in
 WEB_DIR = os.path.dirname(__file__)
@@ -12,6 +16,12 @@ BASE_DIR = os.path.abspath(os.path.join(WEB_DIR, ".."))
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
+from utilities import debug_capture
+from utilities import fr24_breaker
+from utilities import poll_scheduler
+from web.logo_index import LogoIndex
+from web import static_cache
+
 app = Flask(
     __name__,
     template_folder=os.path.join(WEB_DIR, "templates"),
@@ -27,6 +37,12 @@ LOGO_DIR_CANDIDATES = [
     os.path.abspath(os.path.join(BASE_DIR, "..", "logos")),
     os.path.expanduser(os.path.join("~", "logos")),
 ]
+logo_index = LogoIndex(LOGO_DIR_CANDIDATES)
+MAPS_DIR = os.path.join(WEB_DIR, "static", "maps")
+
+# ?v=<content hash> URLs never change content, so browsers may keep them for a year
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
 try:
     from config import DISTANCE_UNITS
 except Exception:
@@ -106,21 +122,7 @@ def time_ago(value):
 
 
 def _logo_path_for(icao):
-    if not icao:
-        return None
-    icao = str(icao).upper()
-    web_suffixes = ("png", "jpg", "jpeg", "svg")
-    base_filename = f"{icao}.png"
-    for base in LOGO_DIR_CANDIDATES:
-        for ext in web_suffixes:
-            web_filename = f"{icao}--web.{ext}"
-            web_path = os.path.join(base, web_filename)
-            if os.path.isfile(web_path):
-                return base, web_filename
-        base_path = os.path.join(base, base_filename)
-        if os.path.isfile(base_path):
-            return base, base_filename
-    return None
+    return logo_index.lookup(icao)
 
 
 def _callsign_prefix(flight):
@@ -138,12 +140,48 @@ def airline_logo_url(flight):
         found = _logo_path_for(_callsign_prefix(flight))
     if not found:
         return None
-    _, filename = found
-    return f"/logos/{filename}"
+    base, filename = found
+    version = logo_index.version(base, filename)
+    return f"/logos/{filename}?v={version}" if version else f"/logos/{filename}"
+
+
+def map_url(filename):
+    version = static_cache.asset_version(os.path.join(MAPS_DIR, filename))
+    if version:
+        return url_for("maps", filename=filename, v=version)
+    return url_for("maps", filename=filename)
+
+
+def _send_asset(directory, filename):
+    """
+    send_from_directory plus: the precompressed .gz when the client takes gzip,
+    immutable caching when ?v= matches the file as it is now, otherwise
+    revalidation (ETag/Last-Modified, 304s handled by send_file).
+    """
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        return ("", 404)
+
+    gz_path = static_cache.gzip_variant(path) if "gzip" in request.accept_encodings else None
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    resp = send_file(gz_path or path, mimetype=mimetype, conditional=True, etag=True)
+    if gz_path:
+        resp.headers["Content-Encoding"] = "gzip"
+    resp.vary.add("Accept-Encoding")
+
+    requested = request.args.get("v")
+    # Hashed from the file's current stat, not the one the ?v= URL was built from: a logo
+    # overwritten in place must not be cached for a year under its old version
+    if requested and requested == static_cache.asset_version(path):
+        resp.headers["Cache-Control"] = IMMUTABLE_CACHE
+    else:
+        resp.headers["Cache-Control"] = "no-cache"
+    return resp
 
 
 app.jinja_env.globals["time_ago"] = time_ago
 app.jinja_env.globals["airline_logo_url"] = airline_logo_url
+app.jinja_env.globals["map_url"] = map_url
 
 
 def is_flight_live(flight):
@@ -305,11 +343,10 @@ def get_screen():
 
 @app.get("/logos/<path:filename>")
 def logos(filename):
-    for base in LOGO_DIR_CANDIDATES:
-        path = os.path.join(base, filename)
-        if os.path.isfile(path):
-            return send_from_directory(base, filename)
-    return ("", 404)
+    base = logo_index.locate(filename)
+    if base is None:
+        return ("", 404)
+    return _send_asset(base, filename)
 
 
 @app.post("/screen/on")
@@ -335,8 +372,7 @@ def screen_toggle():
 # Serve PNG map snapshots from /web/static/maps/
 @app.get("/maps/<path:filename>")
 def maps(filename):
-    maps_dir = os.path.join(WEB_DIR, "static/maps")
-    return send_from_directory(maps_dir, filename)
+    return _send_asset(MAPS_DIR, filename)
 
 
 @app.get("/favicon.ico")
@@ -344,26 +380,85 @@ def favicon():
     return send_from_directory(os.path.join(WEB_DIR, "static/images"), "favicon.ico")
 
 
+# /api/network forks four commands and every open dashboard polls it, so
+# concurrent callers share one probe and reuse it for NETWORK_STATUS_TTL seconds
+NETWORK_STATUS_TTL = 5
+_network_status = {"at": 0.0, "data": None}
+_network_lock = threading.Lock()
+
+
+def network_status():
+    with _network_lock:
+        now = time.monotonic()
+        if _network_status["data"] is not None and now - _network_status["at"] < NETWORK_STATUS_TTL:
+            return _network_status["data"]
+
+        hostname = os.uname().nodename
+        ssid = get_wifi_ssid()
+        ip = get_wlan_ip()
+        gw = get_default_gateway()
+        dns = dns_ok()
+
+        data = {
+            "hostname": hostname,
+            "mdns": f"{hostname}.local",
+            "ssid": ssid,
+            "ip": ip,
+            "gateway": gw,
+            "dns_ok": dns,
+            "wifi_connected": ssid is not None,
+            "has_ip": ip is not None,
+            "has_gateway": gw is not None,
+        }
+        _network_status.update(at=time.monotonic(), data=data)
+        return data
+
+
 @app.get("/api/network")
 def api_network():
-    hostname = os.uname().nodename
-    ssid = get_wifi_ssid()
-    ip = get_wlan_ip()
-    gw = get_default_gateway()
-    dns = dns_ok()
+    return jsonify(network_status())
+
 
+# The display's current grab interval and why (see utilities/poll_scheduler.py)
+@app.get("/api/poll")
+def api_poll():
+    status = poll_scheduler.read_status()
+    if status is None:
+        return jsonify({"error": "no poll status yet"}), 404
+    return jsonify(status)
+
+
+# FR24 circuit breaker state and request counters (see utilities/fr24_breaker.py)
+@app.get("/api/fr24")
+def api_fr24():
+    status = fr24_breaker.read_status()
+    if status is None:
+        return jsonify({"error": "no FR24 status yet"}), 404
+    return jsonify(status)
+
+
+# Debug captures of raw FR24 responses (see utilities/debug_capture.py)
+@app.get("/debug/captures")
+def debug_capture_list():
     return jsonify({
-        "hostname": hostname,
-        "mdns": f"{hostname}.local",
-        "ssid": ssid,
-        "ip": ip,
-        "gateway": gw,
-        "dns_ok": dns,
-        "wifi_connected": ssid is not None,
-        "has_ip": ip is not None,
-        "has_gateway": gw is not None,
+        "enabled": debug_capture.capture_enabled(),
+        "dump_pending": debug_capture.dump_requested(),
+        "files": debug_capture.capture_files(),
     })
 
 
+@app.post("/debug/capture")
+def debug_capture_request():
+    # The tracker writes its in-memory captures on its next grab
+    debug_capture.request_dump()
+    return jsonify({"requested": True})
+
+
+@app.get("/debug/captures/<path:filename>")
+def debug_capture_file(filename):
+    return send_from_directory(debug_capture.CAPTURE_DIR, filename, as_attachment=True)
+
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8080, debug=False)
+    from web import server
+    server.run(app)
@@ -0,0 +1,112 @@
+"""
+In-memory index of the airline logo folders for the web app.
+
+airline_logo_url() runs for every flight card and used to stat up to ten
+candidate paths per code, then /logos/<file> stat'ed again. The index lists
+each logo directory once and is rebuilt only when a directory's mtime
+changes (a logo added, removed or replaced via rename, which is how the
+downloaders write them); the mtimes themselves are checked at most every
+CHECK_SECONDS.
+
+Lookup order matches the old per-request search: directories in the given
+order, and within one directory <ICAO>--web.{png,jpg,jpeg,svg} before the
+16x16 <ICAO>.png.
+"""
+import os
+import time
+from threading import Lock
+
+from web import static_cache
+
+WEB_SUFFIXES = ("png", "jpg", "jpeg", "svg")
+CHECK_SECONDS = 2.0
+
+
+def _dir_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class LogoIndex:
+    def __init__(self, dirs, check_seconds=CHECK_SECONDS):
+        self.dirs = list(dirs)
+        self.check_seconds = check_seconds
+        self._lock = Lock()
+        self._checked = 0.0
+        self._mtimes = None
+        # code -> (base, filename), filename -> base, (base, filename) -> stat
+        self._codes = {}
+        self._files = {}
+        self._stats = {}
+        self.scans = 0
+
+    def _refresh(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._mtimes is not None and now - self._checked < self.check_seconds:
+                return
+            self._checked = now
+            mtimes = [_dir_mtime(d) for d in self.dirs]
+            if mtimes == self._mtimes:
+                return
+            self._codes, self._files, self._stats = self._scan()
+            self._mtimes = mtimes
+            self.scans += 1
+
+    def _scan(self):
+        codes = {}
+        files = {}
+        stats = {}
+        for base in self.dirs:
+            try:
+                entries = list(os.scandir(base))
+            except OSError:
+                continue
+
+            ranked = {}
+            for entry in entries:
+                name = entry.name
+                try:
+                    stats[(base, name)] = entry.stat()
+                except OSError:
+                    continue
+                files.setdefault(name, base)
+                stem, ext = os.path.splitext(name)
+                ext = ext[1:]
+                if stem.endswith("--web") and ext in WEB_SUFFIXES:
+                    code, rank = stem[:-len("--web")], WEB_SUFFIXES.index(ext)
+                elif ext == "png" and "--" not in stem:
+                    code, rank = stem, len(WEB_SUFFIXES)
+                else:
+                    continue
+                if code not in ranked or rank < ranked[code][0]:
+                    ranked[code] = (rank, name)
+
+            # Earlier directories win, as with the old per-request search
+            for code, (_, name) in ranked.items():
+                codes.setdefault(code, (base, name))
+        return codes, files, stats
+
+    def lookup(self, icao):
+        """(base dir, filename) of the best logo for icao, or None."""
+        if not icao:
+            return None
+        self._refresh()
+        return self._codes.get(str(icao).upper())
+
+    def locate(self, filename):
+        """Directory holding filename, or None."""
+        self._refresh()
+        return self._files.get(filename)
+
+    def version(self, base, filename):
+        """
+        Content hash for ?v= URLs, using the stat taken at scan time (no per-request stat).
+        May lag a file overwritten in place; /logos/ checks the current one before caching.
+        """
+        st = self._stats.get((base, filename))
+        if st is None:
+            return None
+        return static_cache.asset_version(os.path.join(base, filename), st)
@@ -3,6 +3,8 @@ import os
 import math
 from config import LOCATION_HOME, DISTANCE_UNITS
 
+from web import static_cache
+
 
 WEB_DIR = os.path.dirname(__file__)
 MAPS_DIR = os.path.join(WEB_DIR, "static", "maps")
@@ -132,6 +134,7 @@ def generate_closest_map(entries, filename="closest.html"):
     # Save map
     filepath = os.path.join(MAPS_DIR, filename)
     m.save(filepath)
+    static_cache.write_gzip_variant(filepath)
     return filepath
 
 def generate_farthest_map(entries, filename="farthest.html"):
@@ -212,6 +215,7 @@ def generate_farthest_map(entries, filename="farthest.html"):
     # Save map
     filepath = os.path.join(MAPS_DIR, filename)
     m.save(filepath)
+    static_cache.write_gzip_variant(filepath)
     return filepath
 
 def generate_recent_map(entries, filename="recent.html"):
@@ -292,4 +296,5 @@ def generate_recent_map(entries, filename="recent.html"):
     # Save map
     filepath = os.path.join(MAPS_DIR, filename)
     m.save(filepath)
+    static_cache.write_gzip_variant(filepath)
     return filepath
\ No newline at end of file
@@ -0,0 +1,330 @@
+"""
+Serving mode for the web dashboard.
+
+web/app.py used to run Flask's development server, which starts an unbounded
+thread per connection, closes every connection after one response and has no
+timeouts. run(app) instead serves it with:
+
+- a fixed pool of WEB_THREADS worker threads; up to WEB_MAX_PENDING more
+  connections wait for a worker, anything beyond gets a quick 503,
+- HTTP/1.1 keep-alive: an idle connection is kept for WEB_KEEPALIVE_TIMEOUT
+  seconds, but only while no other connection is waiting for a worker, and
+  for at most WEB_THREADS - 1 connections, so idle ones can never hold every
+  worker while a new connection queues,
+- WEB_REQUEST_TIMEOUT as the socket timeout while a request is read or
+  written, so a slow client can only hold a worker that long,
+- graceful shutdown on SIGTERM/SIGINT: stop accepting, let in-flight
+  requests finish, close keep-alive connections after their current request.
+
+WEB_SERVER = "development" in config.py switches back to app.run().
+"""
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import InternalServerError
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from werkzeug.wsgi import LimitedStream
+
+# Optional config values
+try:
+    from config import WEB_SERVER
+except (ImportError, ModuleNotFoundError, NameError):
+    WEB_SERVER = "threaded"
+
+try:
+    from config import WEB_HOST
+except (ImportError, ModuleNotFoundError, NameError):
+    WEB_HOST = "0.0.0.0"
+
+try:
+    from config import WEB_PORT
+except (ImportError, ModuleNotFoundError, NameError):
+    WEB_PORT = 8080
+
+try:
+    from config import WEB_THREADS
+except (ImportError, ModuleNotFoundError, NameError):
+    WEB_THREADS = 8
+
+try:
+    from config import WEB_MAX_PENDING
+except (ImportError, ModuleNotFoundError, NameError):
+    WEB_MAX_PENDING = 32
+
+try:
+    from config import WEB_REQUEST_TIMEOUT
+except (ImportError, ModuleNotFoundError, NameError):
+    WEB_REQUEST_TIMEOUT = 15
+
+try:
+    from config import WEB_KEEPALIVE_TIMEOUT
+except (ImportError, ModuleNotFoundError, NameError):
+    WEB_KEEPALIVE_TIMEOUT = 5
+
+BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Length: 0\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n\r\n"
+)
+
+
+class PooledRequestHandler(WSGIRequestHandler):
+    """
+    werkzeug's handler always answers "Connection: close"; this one keeps
+    HTTP/1.1 connections open when the response has a known length and the
+    request body has been fully consumed.
+    """
+    protocol_version = "HTTP/1.1"
+    timeout = WEB_REQUEST_TIMEOUT
+
+    def setup(self):
+        super().setup()
+        self.requests_served = 0
+        self.idle = False
+
+    def handle_one_request(self):
+        if self.requests_served:
+            # Waiting for the next request on a kept-alive connection
+            self.idle = True
+            self.connection.settimeout(self.server.keepalive_timeout)
+            self.server.track_idle(self.connection, True)
+        try:
+            super().handle_one_request()
+        finally:
+            if self.requests_served:
+                self.server.track_idle(self.connection, False)
+        self.requests_served += 1
+        if self.server.stopping:
+            self.close_connection = True
+
+    def parse_request(self):
+        # The request line has arrived; the rest gets the full timeout
+        self.idle = False
+        self.connection.settimeout(self.timeout)
+        return super().parse_request()
+
+    def log_error(self, format, *args):
+        # An idle keep-alive connection timing out is routine, not an error
+        if self.idle and format.startswith("Request timed out"):
+            return
+        super().log_error(format, *args)
+
+    def _wants_close(self):
+        conn = self.headers.get("Connection", "").lower()
+        if self.request_version == "HTTP/1.0":
+            return "keep-alive" not in conn
+        return "close" in conn
+
+    def run_wsgi(self):
+        if self.headers.get("Expect", "").lower().strip(" \t") == "100-continue":
+            self.wfile.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+
+        self.environ = environ = self.make_environ()
+        body = None
+        if environ.get("wsgi.input_terminated"):
+            # Chunked request body: simplest to not reuse the connection
+            self.close_connection = True
+        else:
+            try:
+                length = int(environ.get("CONTENT_LENGTH") or 0)
+            except ValueError:
+                length = 0
+            body = LimitedStream(self.rfile, max(0, length))
+            environ["wsgi.input"] = body
+
+        state = {"status": None, "headers": None, "sent": False, "chunked": False}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info:
+                try:
+                    if state["sent"]:
+                        raise exc_info[1].with_traceback(exc_info[2])
+                finally:
+                    exc_info = None
+            elif state["status"] is not None:
+                raise AssertionError("Headers already set")
+            state["status"], state["headers"] = status, headers
+            return write
+
+        def write(data):
+            if not state["sent"]:
+                state["sent"] = True
+                code_str, _, msg = state["status"].partition(" ")
+                code = int(code_str)
+                self.send_response(code, msg)
+                keys = set()
+                for key, value in state["headers"]:
+                    if key.lower() == "connection":
+                        continue
+                    self.send_header(key, value)
+                    keys.add(key.lower())
+                bodyless = self.command == "HEAD" or 100 <= code < 200 or code in (204, 304)
+                if "content-length" not in keys and not bodyless:
+                    state["chunked"] = True
+                    self.send_header("Transfer-Encoding", "chunked")
+                # Give the worker back if other connections are queued for one
+                if (
+                    self._wants_close()
+                    or self.server.stopping
+                    or self.server.waiting
+                    or not self.server.keep_alive(self.connection)
+                ):
+                    self.close_connection = True
+                self.send_header("Connection", "close" if self.close_connection else "keep-alive")
+                self.end_headers()
+
+            if data and self.command != "HEAD":
+                if state["chunked"]:
+                    self.wfile.write(f"{len(data):x}\r\n".encode("ascii"))
+                    self.wfile.write(data)
+                    self.wfile.write(b"\r\n")
+                else:
+                    self.wfile.write(data)
+
+        def execute(app):
+            app_iter = app(environ, start_response)
+            try:
+                for data in app_iter:
+                    write(data)
+                if not state["sent"]:
+                    write(b"")
+                if state["chunked"] and self.command != "HEAD":
+                    self.wfile.write(b"0\r\n\r\n")
+            finally:
+                if hasattr(app_iter, "close"):
+                    app_iter.close()
+
+        try:
+            execute(self.server.app)
+            # Skip whatever the app didn't read so the next request line is where we expect it
+            if body is not None and not body.is_exhausted:
+                body.exhaust()
+        except (ConnectionError, TimeoutError) as e:
+            self.close_connection = True
+            self.connection_dropped(e, environ)
+        except Exception as e:
+            self.close_connection = True
+            if self.server.passthrough_errors:
+                raise
+            if not state["sent"]:
+                state["status"] = state["headers"] = None
+                try:
+                    execute(InternalServerError())
+                except Exception:
+                    pass
+            self.server.log("error", f"Error on request {self.path}: {e!r}")
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    multithread = True
+
+    def __init__(self, host, port, app, threads=WEB_THREADS, max_pending=WEB_MAX_PENDING,
+                 timeout=WEB_REQUEST_TIMEOUT, keepalive_timeout=WEB_KEEPALIVE_TIMEOUT):
+        self.threads = max(1, int(threads))
+        self.keepalive_timeout = keepalive_timeout
+        self.stopping = False
+        self.rejected = 0
+        # Set up before binding: a failed bind calls server_close()
+        self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="web")
+        # One slot per connection that is being served or waiting for a worker
+        self._slots = threading.BoundedSemaphore(self.threads + max(0, int(max_pending)))
+        self._waiting = 0
+        self._waiting_lock = threading.Lock()
+        # Connections told "keep-alive"; one worker always stays free of them
+        self.max_keepalive = self.threads - 1
+        self._kept = set()
+        # Kept-alive connections blocked waiting for their next request
+        self._idle = set()
+        handler = type("RequestHandler", (PooledRequestHandler,), {"timeout": timeout})
+        super().__init__(host, port, app, handler=handler)
+
+    @property
+    def waiting(self):
+        """Connections accepted but not yet picked up by a worker."""
+        return self._waiting
+
+    def keep_alive(self, connection):
+        """May this connection stay open after its response?"""
+        with self._waiting_lock:
+            if connection in self._kept:
+                return True
+            if len(self._kept) < self.max_keepalive:
+                self._kept.add(connection)
+                return True
+            return False
+
+    def track_idle(self, connection, idle):
+        with self._waiting_lock:
+            if idle:
+                self._idle.add(connection)
+            else:
+                self._idle.discard(connection)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            try:
+                request.sendall(BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        with self._waiting_lock:
+            self._waiting += 1
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        with self._waiting_lock:
+            self._waiting -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._waiting_lock:
+                self._kept.discard(request)
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def stop(self):
+        """Stop accepting and wait for the requests being served (safe from a signal handler)."""
+        if self.stopping:
+            return
+        self.stopping = True
+        # Wake idle keep-alive connections so their workers exit now, not after the timeout
+        with self._waiting_lock:
+            for connection in self._idle:
+                try:
+                    connection.shutdown(socket.SHUT_RD)
+                except OSError:
+                    pass
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def server_close(self):
+        self.stopping = True
+        super().server_close()
+        # Connections still queued are dropped; running ones finish
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def make_server(app, host=WEB_HOST, port=WEB_PORT, **kwargs):
+    return PooledWSGIServer(host, port, app, **kwargs)
+
+
+def run(app, host=WEB_HOST, port=WEB_PORT):
+    if WEB_SERVER == "development":
+        app.run(host=host, port=port, debug=False)
+        return
+
+    server = make_server(app, host, port)
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda signum, frame: server.stop())
+
+    print(f"Serving on http://{host}:{server.port} ({server.threads} threads)")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
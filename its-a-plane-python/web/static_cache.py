@@ -0,0 +1,76 @@
+"""
+Helpers for serving the maps and logos cheaply to phones and tablets.
+
+- write_gzip_variant(path) stores <path>.gz next to a file when it is written
+  (map_generator does this for every folium map), so the web app never
+  compresses on the fly.
+- asset_version(path) is a short content hash used in ?v= URLs. A response
+  whose ?v= matches the file on disk can be cached as immutable; the URL
+  changes when the file does.
+"""
+import gzip
+import hashlib
+import os
+import shutil
+from threading import Lock
+
+GZIP_SUFFIX = ".gz"
+# Files smaller than this aren't worth a compressed copy
+GZIP_MIN_BYTES = 1024
+VERSION_LENGTH = 12
+
+_versions = {}
+_versions_lock = Lock()
+
+
+def write_gzip_variant(path):
+    """Write <path>.gz (atomically); returns its path, or None if skipped/failed."""
+    try:
+        if os.path.getsize(path) < GZIP_MIN_BYTES:
+            return None
+        gz_path = path + GZIP_SUFFIX
+        tmp = gz_path + ".tmp"
+        with open(path, "rb") as src, open(tmp, "wb") as raw:
+            # mtime=0 so identical content gives identical bytes
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as gz:
+                shutil.copyfileobj(src, gz)
+        os.replace(tmp, gz_path)
+        return gz_path
+    except OSError as e:
+        print("Failed to write gzip variant:", e)
+        return None
+
+
+def gzip_variant(path):
+    """<path>.gz if it exists and is at least as new as path, else None."""
+    gz_path = path + GZIP_SUFFIX
+    try:
+        if os.stat(gz_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            return gz_path
+    except OSError:
+        pass
+    return None
+
+
+def asset_version(path, st=None):
+    """Short content hash of path (cached until its mtime/size change), or None if missing."""
+    try:
+        if st is None:
+            st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        with _versions_lock:
+            cached = _versions.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                h.update(chunk)
+        digest = h.hexdigest()[:VERSION_LENGTH]
+    except OSError:
+        return None
+
+    with _versions_lock:
+        _versions[path] = (key, digest)
+    return digest